@@ -0,0 +1,274 @@
+import time
+import logging
+import numpy as np
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from analyzers.matchday_predictor import MatchdayPredictor
+from analyzers.scoring_engine import FORM_WINDOW_MATCHES
+from database.models import KICKOFF_LOOKBACK_DAYS
+
+logger = logging.getLogger(__name__)
+
+NEWS_WINDOW_DAYS = 7
+CALIBRATION_BINS = 10
+FORM_COLUMNS = ('player_id', 'starts_last5', 'minutes_share_last5', 'last_start_date', 'injury_return_date')
+INJURY_STATUS_TYPES = ('injury', 'illness')
+
+class SeasonHistory:
+    """One league's replayable season, indexed so predictor inputs can be rebuilt as of any kickoff"""
+    def __init__(self, history):
+        self.matches = [dict(match) for match in history['matches']]
+        self.team_matches = defaultdict(list)
+        for match in self.matches:
+            self.team_matches[match['home_team_id']].append(match)
+            self.team_matches[match['away_team_id']].append(match)
+
+        self.appearances = defaultdict(list)
+        for appearance in history['appearances']:
+            self.appearances[(appearance['match_id'], appearance['team_id'])].append(dict(appearance))
+
+        self.player_rows = {player['id']: dict(player) for player in history['players']}
+        self.players = defaultdict(list)  # current squads
+        for player in self.player_rows.values():
+            self.players[player['team_id']].append(player)
+
+        # (kickoff, team) of every appearance per player, in date order, and everyone who ever played for a team
+        match_dates = {match['id']: match['match_date'] for match in self.matches}
+        self.career = defaultdict(list)
+        self.team_players = defaultdict(set)
+        for appearance in history['appearances']:
+            self.career[appearance['player_id']].append((match_dates[appearance['match_id']], appearance['team_id']))
+            self.team_players[appearance['team_id']].add(appearance['player_id'])
+        for career in self.career.values():
+            career.sort()
+
+        self.statuses = defaultdict(list)
+        for status in sorted(history['statuses'], key=lambda status: status['created_at']):
+            self.statuses[status['player_id']].append(dict(status))
+
+        self.news = defaultdict(list)
+        for mention in sorted(history['news'], key=lambda mention: mention['published_at']):
+            self.news[mention['team_id']].append(dict(mention))
+
+    def matchday_numbers(self):
+        """Matchdays that have at least one ingested match, in order"""
+        return sorted({match['matchday'] for match in self.matches})
+
+    def matchday_matches(self, matchday):
+        """Ingested matches of one matchday"""
+        return [match for match in self.matches if match['matchday'] == matchday]
+
+    def actual_lineup(self, match, team_id):
+        """Players who started and the formation fielded by a team in a played match"""
+        starters = {a['player_id'] for a in self.appearances[(match['id'], team_id)] if a['started']}
+        formation = match['home_formation'] if team_id == match['home_team_id'] else match['away_formation']
+        return starters, formation
+
+    def squad_before(self, team_id, kickoff):
+        """Players of a team as of kickoff: those whose last appearance before it was for the team, plus
+        current squad members without an appearance before it (no earlier club to tell from)"""
+        squad = []
+        for player_id in sorted(self.team_players[team_id] | {player['id'] for player in self.players[team_id]}):
+            if player_id not in self.player_rows:
+                continue
+            career = self.career[player_id]
+            played = bisect_left(career, (kickoff,))
+            if played:
+                if career[played - 1][1] != team_id:
+                    continue
+            elif self.player_rows[player_id]['team_id'] != team_id:
+                continue
+            squad.append(dict(self.player_rows[player_id], team_id=team_id))
+        return squad
+
+    def inputs_before(self, team_id, kickoff):
+        """Squad rows (see squad_before), news mentions and feature store rows for a team, using only data dated before kickoff"""
+        previous = [match for match in self.team_matches[team_id] if match['match_date'] < kickoff]
+        window_ids = {match['id'] for match in previous[-FORM_WINDOW_MATCHES:]}
+
+        games_started, minutes, window_starts, window_minutes = defaultdict(int), defaultdict(int), defaultdict(int), defaultdict(int)
+        last_start = {}
+        for match in previous:
+            for appearance in self.appearances[(match['id'], team_id)]:
+                player_id = appearance['player_id']
+                minutes[player_id] += appearance['minutes_played']
+                if match['id'] in window_ids:
+                    window_minutes[player_id] += appearance['minutes_played']
+                if appearance['started']:
+                    games_started[player_id] += 1
+                    last_start[player_id] = match['match_date'].date()
+                    if match['id'] in window_ids:
+                        window_starts[player_id] += 1
+
+        # as get_availability_at_kickoff and the feature store saw them: reported before kickoff and not yet
+        # superseded, and for the squad only where the unavailable range reaches the days before kickoff
+        kickoff_date = kickoff.date()
+        lookback_date = kickoff_date - timedelta(days=KICKOFF_LOOKBACK_DAYS)
+        squad, form_rows = [], []
+        for player in self.squad_before(team_id, kickoff):
+            known_statuses = [
+                status for status in self.statuses[player['id']]
+                if status['created_at'] < kickoff and (status.get('superseded_at') is None or status['superseded_at'] >= kickoff)
+            ]
+            active_statuses = [
+                status for status in known_statuses
+                if (status['start_date'] is None or status['start_date'] <= kickoff_date)
+                and (status['expected_return_date'] is None or status['expected_return_date'] > lookback_date)
+            ]
+            injury_returns = [
+                status['expected_return_date'] for status in known_statuses
+                if status['status_type'] in INJURY_STATUS_TYPES and status['expected_return_date']
+            ]
+
+            squad.append(dict(
+                player,
+                games_started=games_started[player['id']],
+                minutes_played=minutes[player['id']],
+                current_status=[
+                    {key: status[key] for key in ('status_type', 'description', 'severity', 'start_date', 'expected_return_date')}
+                    for status in active_statuses
+                ]
+            ))
+            form_rows.append((
+                player['id'],
+                window_starts[player['id']],
+                window_minutes[player['id']] / max(90.0 * len(window_ids), 1),
+                last_start.get(player['id']),
+                max(injury_returns, default=None)
+            ))
+
+        news = [
+            mention for mention in self.news[team_id]
+            if kickoff - timedelta(days=NEWS_WINDOW_DAYS) <= mention['published_at'] < kickoff
+        ]
+        return squad, news, form_rows
+
+def replay_matchday(season, matchday):
+    """Predict every team of one matchday from pre-kickoff data and score it against the actual line-ups"""
+    start_time = time.perf_counter()
+    pairs, squads, news, form_rows, actual = [], {}, {}, [], {}
+
+    for match in season.matchday_matches(matchday):
+        for team_id in (match['home_team_id'], match['away_team_id']):
+            starters, formation = season.actual_lineup(match, team_id)
+            if not starters:
+                continue
+            squads[team_id], news[team_id], team_form = season.inputs_before(team_id, match['match_date'])
+            form_rows.extend(team_form)
+            actual[(match['id'], team_id)] = (starters, formation)
+            pairs.append({'match_id': match['id'], 'team_id': team_id, 'match_date': match['match_date']})
+
+    form_rows.sort()
+    form = {column: [row[i] for row in form_rows] for i, column in enumerate(FORM_COLUMNS)} if form_rows else {}
+    predictions = MatchdayPredictor(db_manager=None).predict_pairs(pairs, squads, news, form, include_probabilities=True)
+
+    records = []
+    for prediction in predictions:
+        starters, formation = actual[(prediction['match_id'], prediction['team_id'])]
+        predicted = {player['player_id'] for player in prediction['starting_xi']}
+        probabilities = prediction['start_probabilities']
+        records.append({
+            'match_id': prediction['match_id'],
+            'team_id': prediction['team_id'],
+            'xi_overlap': len(predicted & starters) / len(starters),
+            'formation_hit': None if not formation else prediction['formation'] == formation,
+            'confidence': prediction['confidence_score'],
+            'probabilities': list(probabilities.values()),
+            'outcomes': [player_id in starters for player_id in probabilities]
+        })
+
+    return {
+        'matchday': matchday,
+        'teams': len(pairs),
+        'records': records,
+        'seconds': time.perf_counter() - start_time
+    }
+
+_worker_season = None
+
+def _init_worker(season):
+    """Process pool initializer: keep the season in a module global so tasks only ship matchday numbers"""
+    global _worker_season
+    _worker_season = season
+
+def _replay_in_worker(matchday):
+    return replay_matchday(_worker_season, matchday)
+
+def calibration_table(probabilities, outcomes, bins=CALIBRATION_BINS):
+    """Reliability bins of predicted start probability vs observed start rate"""
+    probabilities = np.asarray(probabilities, dtype=float)
+    outcomes = np.asarray(outcomes, dtype=float)
+    index = np.minimum((probabilities * bins).astype(int), bins - 1)
+    table = []
+    for b in range(bins):
+        members = index == b
+        if members.any():
+            table.append({
+                'bin': f"{b / bins:.1f}-{(b + 1) / bins:.1f}",
+                'count': int(members.sum()),
+                'predicted': float(probabilities[members].mean()),
+                'observed': float(outcomes[members].mean())
+            })
+    return table
+
+def summarize(results, wall_time):
+    """Aggregate per-matchday replays into accuracy, calibration and throughput figures"""
+    records = [record for result in results for record in result['records']]
+    teams = sum(result['teams'] for result in results)
+    serial_time = sum(result['seconds'] for result in results)
+    probabilities = [p for record in records for p in record['probabilities']]
+    outcomes = [o for record in records for o in record['outcomes']]
+    formation_hits = [record['formation_hit'] for record in records if record['formation_hit'] is not None]
+
+    calibration = calibration_table(probabilities, outcomes)
+    total = max(1, len(probabilities))
+    return {
+        'matchdays': len(results),
+        'teams': teams,
+        'predicted': len(records),
+        'xi_overlap': float(np.mean([r['xi_overlap'] for r in records])) if records else None,
+        'xi_exact_rate': float(np.mean([r['xi_overlap'] == 1.0 for r in records])) if records else None,
+        'formation_hit_rate': float(np.mean(formation_hits)) if formation_hits else None,
+        'mean_confidence': float(np.mean([r['confidence'] for r in records])) if records else None,
+        'brier_score': float(np.mean((np.asarray(probabilities) - np.asarray(outcomes)) ** 2)) if probabilities else None,
+        'calibration_error': sum(row['count'] / total * abs(row['predicted'] - row['observed']) for row in calibration),
+        'calibration': calibration,
+        'wall_time': wall_time,
+        'serial_time': serial_time,
+        'teams_per_second': teams / wall_time if wall_time else None,
+        'parallel_speedup': serial_time / wall_time if wall_time else None
+    }
+
+def run_backtest(history, max_workers=None, matchdays=None):
+    """Replay a season matchday by matchday across a process pool and report accuracy and throughput.
+
+    history is the dict returned by DatabaseManager.get_backtest_history. With
+    max_workers=1 the replay runs in-process, which is handy for profiling.
+    """
+    season = SeasonHistory(history)
+    matchdays = matchdays or season.matchday_numbers()
+
+    start_time = time.perf_counter()
+    if max_workers == 1:
+        results = [replay_matchday(season, matchday) for matchday in matchdays]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(season,)) as pool:
+            results = list(pool.map(_replay_in_worker, matchdays))
+    return summarize(results, time.perf_counter() - start_time)
+
+def log_backtest_report(name, report):
+    """Log a backtest report in the scheduler's emoji style"""
+    def fmt(value, pattern="{:.3f}"):
+        return "n/a" if value is None else pattern.format(value)
+
+    logger.info(f"📊 Backtest {name}: {report['predicted']}/{report['teams']} team lineups over {report['matchdays']} matchdays")
+    logger.info(f"   🎯 XI overlap {fmt(report['xi_overlap'])}, exact XI {fmt(report['xi_exact_rate'])}, formation hit {fmt(report['formation_hit_rate'])}")
+    logger.info(f"   📐 Brier {fmt(report['brier_score'])}, calibration error {fmt(report['calibration_error'])}, mean confidence {fmt(report['mean_confidence'])}")
+    for row in report['calibration']:
+        logger.info(f"      {row['bin']}: predicted {row['predicted']:.2f} vs observed {row['observed']:.2f} ({row['count']})")
+    logger.info(
+        f"   ⏱️ {fmt(report['wall_time'], '{:.2f}')}s wall, {fmt(report['serial_time'], '{:.2f}')}s serial "
+        f"(x{fmt(report['parallel_speedup'], '{:.1f}')}), {fmt(report['teams_per_second'], '{:.1f}')} teams/s"
+    )
@@ -0,0 +1,84 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from analyzers.positions import FORMATION_TEMPLATES, POSITION_ORDER
+
+# Penalty for playing a player (inner key) in a formation slot (outer key).
+# Natural positions cost nothing; pairs not listed are not allowed.
+COMPATIBILITY_PENALTIES = {
+    'GK': {},
+    'CB': {'DM': 0.30, 'LB': 0.35, 'RB': 0.35},
+    'LB': {'LM': 0.25, 'CB': 0.30, 'RB': 0.30, 'LW': 0.45},
+    'RB': {'RM': 0.25, 'CB': 0.30, 'LB': 0.30, 'RW': 0.45},
+    'DM': {'CM': 0.10, 'CB': 0.30},
+    'CM': {'DM': 0.10, 'AM': 0.15, 'LM': 0.25, 'RM': 0.25},
+    'AM': {'CM': 0.15, 'SS': 0.15, 'LW': 0.25, 'RW': 0.25},
+    'LM': {'LW': 0.10, 'RM': 0.20, 'CM': 0.25, 'LB': 0.30},
+    'RM': {'RW': 0.10, 'LM': 0.20, 'CM': 0.25, 'RB': 0.30},
+    'LW': {'LM': 0.10, 'RW': 0.15, 'AM': 0.25, 'SS': 0.30, 'CF': 0.35},
+    'RW': {'RM': 0.10, 'LW': 0.15, 'AM': 0.25, 'SS': 0.30, 'CF': 0.35},
+    'CF': {'SS': 0.10, 'LW': 0.35, 'RW': 0.35, 'AM': 0.40},
+    'SS': {'CF': 0.10, 'AM': 0.15, 'LW': 0.30, 'RW': 0.30}
+}
+
+INFEASIBLE_COST = 1e6
+
+def _penalty_matrix():
+    """Penalty table indexed [player position, slot position] over POSITION_ORDER"""
+    size = len(POSITION_ORDER)
+    matrix = np.full((size, size), INFEASIBLE_COST)
+    for slot, penalties in COMPATIBILITY_PENALTIES.items():
+        slot_index = POSITION_ORDER.index(slot)
+        matrix[slot_index, slot_index] = 0.0
+        for player_position, penalty in penalties.items():
+            matrix[POSITION_ORDER.index(player_position), slot_index] = penalty
+    return matrix
+
+PENALTY_MATRIX = _penalty_matrix()
+
+def solve_formations(position_codes, scores, templates=None):
+    """Pick the best XI for every formation template by optimal assignment.
+
+    position_codes and scores describe the available players (same order).
+    The costs for all templates are built in one indexing step as a
+    players x templates x slots array, and each template is solved with
+    linear_sum_assignment. Returns None when no template can be filled,
+    otherwise a dict with the best formation, its slots and player indices
+    (slot order), its score, and every feasible formation's score, best first.
+    """
+    templates = templates or FORMATION_TEMPLATES
+    names = list(templates)
+    if len(position_codes) < 11:
+        return None
+
+    player_positions = np.array([POSITION_ORDER.index(code) for code in position_codes])
+    slot_positions = np.array([[POSITION_ORDER.index(slot) for slot in templates[name]] for name in names])
+    scores = np.asarray(scores, dtype=float)
+
+    penalties = PENALTY_MATRIX[player_positions[:, None, None], slot_positions[None, :, :]]
+    costs = penalties - scores[:, None, None]
+
+    results = []
+    for t, name in enumerate(names):
+        rows, cols = linear_sum_assignment(costs[:, t, :])
+        if penalties[rows, t, cols].max() >= INFEASIBLE_COST:
+            continue
+        order = np.argsort(cols)
+        results.append({
+            'formation': name,
+            'slots': [templates[name][c] for c in cols[order]],
+            'players': [int(r) for r in rows[order]],
+            'score': float(-costs[rows, t, cols].sum())
+        })
+
+    if not results:
+        return None
+
+    results.sort(key=lambda result: -result['score'])
+    best = results[0]
+    return {
+        'formation': best['formation'],
+        'slots': best['slots'],
+        'players': best['players'],
+        'score': best['score'],
+        'formation_scores': [{'formation': r['formation'], 'score': round(r['score'], 3)} for r in results]
+    }
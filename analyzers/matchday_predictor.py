@@ -0,0 +1,310 @@
+import math
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime, date
+from analyzers.positions import POSITION_GROUPS, position_code
+from analyzers.formation_solver import solve_formations
+from analyzers.monte_carlo import availability_probability, assignment_quotas, simulate_start_probabilities
+from analyzers.scoring_engine import (
+    SCORE_WEIGHTS, build_matchday_features, score_candidates, form_rows, form_score,
+    mention_tokens, mention_weight, player_surname
+)
+
+logger = logging.getLogger(__name__)
+
+UNAVAILABLE_STATUS_TYPES = {'injury', 'suspension', 'illness', 'personal'}
+
+class MatchdayPredictor:
+    """Predict every lineup of a league's next matchday from a handful of set-based queries"""
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def predict_matchday(self, league_id, force=False):
+        """Predict all (match, team) pairs of the next matchday and save them with one bulk write.
+
+        Only pairs whose inputs changed since their last prediction (or failed
+        attempt) are rebuilt unless force is set. Returns the list of prediction
+        payloads that were saved.
+        """
+        start_time = time.time()
+
+        matches = self.db.get_next_matchday_matches(league_id)
+        if not matches:
+            return []
+
+        pairs = self.db.get_dirty_prediction_pairs([m['id'] for m in matches], include_current=force)
+        if not pairs:
+            logger.info(f"League {league_id}: all {len(matches) * 2} predictions are up to date")
+            return []
+
+        team_ids = sorted({pair['team_id'] for pair in pairs})
+        statuses = self.db.get_availability_at_kickoff({pair['team_id']: self._kickoff_date(pair['match_date']) for pair in pairs})
+        squads = defaultdict(list)
+        for player in self.db.get_squads_for_teams(team_ids):
+            squads[player['team_id']].append(dict(player, current_status=statuses.get(player['id'], [])))
+        news = defaultdict(dict)
+        for mention in self.db.get_player_evidence([player['id'] for squad in squads.values() for player in squad]):
+            news[mention['team_id']].setdefault(mention['id'], mention)
+        news = {
+            team_id: sorted(mentions.values(), key=lambda mention: mention['published_at'], reverse=True)
+            for team_id, mentions in news.items()
+        }
+        form = self.db.get_player_features(team_ids)
+
+        saved = self.predict_pairs(pairs, squads, news, form)
+        self.db.save_lineup_predictions_bulk(saved)
+        predicted = {(prediction['match_id'], prediction['team_id']) for prediction in saved}
+        failed = [pair for pair in pairs if (pair['match_id'], pair['team_id']) not in predicted]
+        self.db.record_prediction_failures(failed)
+
+        logger.info(
+            f"League {league_id}: predicted {len(saved)}/{len(pairs)} lineups for "
+            f"{len(matches)} matches in {time.time() - start_time:.2f}s"
+            + (f", {len(failed)} left until their inputs change" if failed else "")
+        )
+        return saved
+
+    def predict_pairs(self, pairs, squads, news, form=None, include_probabilities=False):
+        """Predict (match, team) pairs from inputs already in memory, without touching the database.
+
+        pairs carry match_id, team_id, match_date and input_version; squads and news
+        map team_id to rows and form is the columnar feature store read. With
+        include_probabilities each prediction also gets 'start_probabilities' for
+        every squad player with a known position.
+        """
+        team_ids = sorted({pair['team_id'] for pair in pairs})
+        team_scores = self.score_matchday(
+            {team_id: squads[team_id] for team_id in team_ids},
+            news,
+            {pair['team_id']: pair['match_date'] for pair in pairs},
+            form=form
+        )
+        
+        predictions, simulation_inputs = [], []
+        for pair in pairs:
+            try:
+                prediction, simulation_input = self._build_prediction(
+                    squads[pair['team_id']], news.get(pair['team_id'], []), pair['match_date'],
+                    scores=team_scores[pair['team_id']]
+                )
+                if prediction.get('error'):
+                    continue
+                prediction.update({
+                    'match_id': pair['match_id'],
+                    'team_id': pair['team_id'],
+                    'input_version': pair.get('input_version')
+                })
+                predictions.append(prediction)
+                simulation_inputs.append(simulation_input)
+            except Exception as e:
+                logger.error(f"Error predicting team {pair['team_id']} in match {pair['match_id']}: {e}")
+                continue
+
+        simulations = simulate_start_probabilities(simulation_inputs) if simulation_inputs else []
+        for prediction, simulation_input, simulation in zip(predictions, simulation_inputs, simulations):
+            self._apply_simulation(prediction, simulation_input, simulation)
+            if include_probabilities:
+                prediction['start_probabilities'] = {
+                    player['id']: float(probability)
+                    for player, probability in zip(simulation_input['players'], simulation['start_probability'])
+                }
+        return predictions
+
+    def score_matchday(self, squads, news, kickoffs, form=None):
+        """Score every candidate of a matchday in one vectorised pass, returning {team_id: {player_id: score}}"""
+        available_ids = set()
+        kickoff_dates = {}
+        for team_id, players in squads.items():
+            kickoff_dates[team_id] = self._kickoff_date(kickoffs.get(team_id))
+            available_ids.update(p['id'] for p in players if not self._unavailability_reason(p, kickoff_dates[team_id]))
+
+        features = build_matchday_features(squads, news, available_ids, form, kickoff_dates)
+        return features.scores_by_team(score_candidates(features))
+
+    def predict_team(self, players, news, kickoff, scores=None, form=None):
+        """Predict one team's lineup from already loaded squad rows and news mentions.
+
+        scores may carry precomputed player scores from score_matchday; without them
+        the players are scored row by row, using form (the columnar feature store
+        read) when given.
+        """
+        prediction, simulation_input = self._build_prediction(players, news, kickoff, scores, form)
+        if not prediction.get('error'):
+            self._apply_simulation(prediction, simulation_input, simulate_start_probabilities([simulation_input])[0])
+        return prediction
+
+    def _build_prediction(self, players, news, kickoff, scores=None, form=None):
+        """Pick the formation and XI, returning the prediction and the Monte Carlo input for its squad"""
+        if not players:
+            return {'error': True, 'reasoning': 'Team squad is still being populated.'}, None
+
+        kickoff_date = self._kickoff_date(kickoff)
+
+        known, available, unavailable = [], [], []
+        for player in players:
+            if not position_code(player['position']):
+                continue
+            known.append(player)
+            reason = self._unavailability_reason(player, kickoff_date)
+            if reason:
+                unavailable.append({'player_id': player['id'], 'name': player['name'], 'reason': reason})
+            else:
+                available.append(player)
+
+        if scores is None:
+            scores = self._score_players(
+                known, self._news_signals(players, news), {p['id'] for p in available},
+                self._form_scores(known, form, kickoff_date)
+            )
+
+        solution = self._select_formation(available, scores)
+        if not solution:
+            return {
+                'error': True,
+                'reasoning': f"Only {len(available)} available players with known positions - squad data incomplete."
+            }, None
+        formation = solution['formation']
+        selected = [available[index] for index in solution['players']]
+        selected_ids = {player['id'] for player in selected}
+
+        prediction = {
+            'formation': formation,
+            'starting_xi': [self._player_entry(player, slot) for player, slot in zip(selected, solution['slots'])],
+            'unavailable_players': unavailable,
+            'formation_scores': solution['formation_scores'],
+            'reasoning': self._reasoning(formation, available, unavailable, news, solution['formation_scores']),
+            'sources': self._sources(news)
+        }
+        simulation_input = {
+            'players': known,
+            'formation': formation,
+            'scores': [scores[player['id']] for player in known],
+            'availability': [availability_probability(player.get('current_status'), kickoff_date) for player in known],
+            'groups': [POSITION_GROUPS[position_code(player['position'])] for player in known],
+            'predicted': [player['id'] in selected_ids for player in known]
+        }
+        simulation_input['quotas'] = assignment_quotas(simulation_input['groups'], simulation_input['predicted'])
+        return prediction, simulation_input
+
+    def _apply_simulation(self, prediction, simulation_input, simulation):
+        """Fill start probabilities, alternatives and XI confidence from a Monte Carlo result"""
+        probabilities = {
+            player['id']: float(probability)
+            for player, probability in zip(simulation_input['players'], simulation['start_probability'])
+        }
+        for entry in prediction['starting_xi']:
+            entry['start_probability'] = round(probabilities[entry['player_id']], 3)
+
+        excluded = {entry['player_id'] for entry in prediction['starting_xi']}
+        excluded.update(player['player_id'] for player in prediction['unavailable_players'])
+        bench = sorted(
+            (player for player in simulation_input['players'] if player['id'] not in excluded),
+            key=lambda player: -probabilities[player['id']]
+        )
+        prediction['alternatives'] = [{
+            'player_id': player['id'],
+            'name': player['name'],
+            'position': player['position'],
+            'probability': round(probabilities[player['id']], 3)
+        } for player in bench[:5]]
+        prediction['confidence_score'] = round(simulation['xi_confidence'], 3)
+
+    def _kickoff_date(self, kickoff):
+        """Kickoff as a date, defaulting to today when unknown"""
+        if isinstance(kickoff, datetime):
+            return kickoff.date()
+        return kickoff or date.today()
+
+    def _unavailability_reason(self, player, kickoff_date):
+        """Return the status type keeping a player out at kickoff, or None if available"""
+        for status in player.get('current_status') or []:
+            if status.get('status_type') not in UNAVAILABLE_STATUS_TYPES:
+                continue
+            expected_return = status.get('expected_return_date')
+            if isinstance(expected_return, str):
+                expected_return = date.fromisoformat(expected_return[:10])
+            if expected_return is None or expected_return > kickoff_date:
+                return status['status_type']
+        return None
+
+    def _news_signals(self, players, news):
+        """Net news sentiment per player in [-1, 1], from linked or name-matching mentions"""
+        tokenized = [(mention, mention_tokens(mention.get('content'))) for mention in news]
+        signals = {}
+        for player in players:
+            surname = player_surname(player)
+            signal = 0.0
+            for mention, tokens in tokenized:
+                if mention.get('player_id') == player['id'] or (surname and surname in tokens):
+                    signal += mention_weight(mention)
+            signals[player['id']] = max(-1.0, min(1.0, signal))
+        return signals
+
+    def _form_scores(self, players, form, kickoff_date):
+        """Recent-form score per player from the feature store (0 for players without a row)"""
+        rows = form_rows(form or {})
+        return {
+            player['id']: form_score(
+                rows[player['id']]['starts_last5'], rows[player['id']]['minutes_share_last5'],
+                rows[player['id']]['last_start_date'], rows[player['id']]['injury_return_date'], kickoff_date
+            )
+            for player in players if player['id'] in rows
+        }
+
+    def _score_players(self, players, news_signals, available_ids, form_scores=None):
+        """Score players on starts, minutes, market value and recent form relative to the available squad"""
+        form_scores = form_scores or {}
+        reference = [p for p in players if p['id'] in available_ids]
+        max_starts = max((p.get('games_started') or 0 for p in reference), default=0) or 1
+        max_minutes = max((p.get('minutes_played') or 0 for p in reference), default=0) or 1
+        max_value = max((math.log1p(p.get('market_value') or 0) for p in reference), default=0) or 1
+
+        starts_weight, minutes_weight, value_weight, news_weight, form_weight = SCORE_WEIGHTS.tolist()
+        scores = {}
+        for player in players:
+            scores[player['id']] = (
+                starts_weight * (player.get('games_started') or 0) / max_starts
+                + minutes_weight * (player.get('minutes_played') or 0) / max_minutes
+                + value_weight * math.log1p(player.get('market_value') or 0) / max_value
+                + news_weight * news_signals.get(player['id'], 0.0)
+                + form_weight * form_scores.get(player['id'], 0.0)
+            )
+        return scores
+
+    def _select_formation(self, players, scores):
+        """Solve the optimal XI for every formation template and keep the best"""
+        return solve_formations(
+            [position_code(player['position']) for player in players],
+            [scores[player['id']] for player in players]
+        )
+
+    def _player_entry(self, player, slot):
+        """Starting XI entry in the shape the bot renders, with the formation slot it fills"""
+        return {
+            'player_id': player['id'],
+            'name': player['name'],
+            'position': player['position'],
+            'slot': slot,
+            'jersey_number': player.get('jersey_number')
+        }
+
+    def _reasoning(self, formation, available, unavailable, news, formation_scores):
+        """Short human-readable explanation of the prediction"""
+        parts = [f"{formation} picked from {len(available)} available players."]
+        if len(formation_scores) > 1:
+            runner_up = formation_scores[1]
+            parts.append(f"Next best shape: {runner_up['formation']} ({runner_up['score'] - formation_scores[0]['score']:+.2f}).")
+        if unavailable:
+            names = ", ".join(player['name'] for player in unavailable[:3])
+            parts.append(f"{len(unavailable)} unavailable ({names}{'...' if len(unavailable) > 3 else ''}).")
+        if news:
+            parts.append(f"{len(news)} recent news mentions considered.")
+        return " ".join(parts)
+
+    def _sources(self, news):
+        """Source links of the most recent news mentions"""
+        return [
+            {'type': mention.get('source_type') or 'news', 'url': mention['source_url']}
+            for mention in news[:3] if mention.get('source_url')
+        ]
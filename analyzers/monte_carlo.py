@@ -0,0 +1,120 @@
+import numpy as np
+from datetime import date
+from analyzers.positions import FORMATION_TEMPLATES, POSITION_GROUPS
+
+GROUPS = ['GK', 'DEF', 'MID', 'FWD']
+
+DEFAULT_DRAWS = 2000
+DEFAULT_SEED = 20251
+MANAGER_NOISE = 0.12  # std-dev of per-draw selection noise, in score units
+DRAW_CHUNK = 500
+
+BASELINE_AVAILABILITY = 0.98
+SEVERITY_AVAILABILITY = {'minor': 0.35, 'moderate': 0.10, 'major': 0.02}
+UNKNOWN_SEVERITY_AVAILABILITY = 0.10
+
+def availability_probability(statuses, kickoff_date):
+    """Probability that a player is fit and eligible at kickoff, given their active statuses"""
+    probability = BASELINE_AVAILABILITY
+    for status in statuses or []:
+        expected_return = status.get('expected_return_date')
+        if isinstance(expected_return, str):
+            expected_return = date.fromisoformat(expected_return[:10])
+
+        if status.get('status_type') == 'suspension':
+            p = BASELINE_AVAILABILITY if expected_return and expected_return <= kickoff_date else 0.0
+        elif expected_return is None:
+            p = SEVERITY_AVAILABILITY.get(status.get('severity'), UNKNOWN_SEVERITY_AVAILABILITY)
+        else:
+            days_late = (expected_return - kickoff_date).days
+            if days_late > 0:
+                p = max(0.02, 0.25 - 0.05 * days_late)
+            elif days_late > -3:
+                p = 0.6  # due back just before kickoff: fitness doubt
+            else:
+                p = 0.9
+        probability = min(probability, p)
+    return probability
+
+def formation_quotas(formation):
+    """Number of GK/DEF/MID/FWD slots in a formation template"""
+    quotas = [0] * len(GROUPS)
+    for slot in FORMATION_TEMPLATES[formation]:
+        quotas[GROUPS.index(POSITION_GROUPS[slot])] += 1
+    return quotas
+
+def assignment_quotas(groups, predicted):
+    """Number of GK/DEF/MID/FWD players in a predicted XI, by each player's own group.
+
+    The solver may field a player outside their group (a winger in a wide
+    midfield slot), so these can differ from the formation's quotas.
+    """
+    quotas = [0] * len(GROUPS)
+    for group, starts in zip(groups, predicted):
+        if starts:
+            quotas[GROUPS.index(group)] += 1
+    return quotas
+
+def simulate_start_probabilities(teams, draws=DEFAULT_DRAWS, noise=MANAGER_NOISE, seed=DEFAULT_SEED):
+    """Estimate start probabilities for every player of many teams at once.
+
+    Each team is a dict of equal-length sequences 'scores', 'availability',
+    'groups' (position group names) and 'predicted' (in the predicted XI),
+    plus 'formation' and optionally 'quotas' (see assignment_quotas; the
+    formation's own quotas otherwise). In every draw each player is present
+    with their availability probability, Gaussian manager-choice noise is
+    added to their score, and the best present players fill the GK/DEF/MID/FWD
+    quotas. Teams are padded into one [draws, teams, players] block per
+    position group so a whole matchday is simulated with a few array ops.
+
+    Returns one dict per team with 'start_probability' (array aligned with
+    the team's players) and 'xi_confidence', the expected share of the
+    predicted XI that actually starts.
+    """
+    rng = np.random.default_rng(seed)
+    team_count = len(teams)
+    starts = [np.zeros(len(team['scores'])) for team in teams]
+    overlap = np.zeros(team_count)
+
+    blocks = []
+    for g, group in enumerate(GROUPS):
+        members = [[i for i, name in enumerate(team['groups']) if name == group] for team in teams]
+        width = max((len(m) for m in members), default=0)
+        if width == 0:
+            continue
+        scores = np.full((team_count, width), -np.inf, dtype=np.float32)
+        availability = np.zeros((team_count, width), dtype=np.float32)
+        predicted = np.zeros((team_count, width), dtype=bool)
+        for t, (team, indices) in enumerate(zip(teams, members)):
+            scores[t, :len(indices)] = np.asarray(team['scores'], dtype=np.float32)[indices]
+            availability[t, :len(indices)] = np.asarray(team['availability'], dtype=np.float32)[indices]
+            predicted[t, :len(indices)] = np.asarray(team['predicted'], dtype=bool)[indices]
+        quotas = np.array([(team.get('quotas') or formation_quotas(team['formation']))[g] for team in teams])
+        blocks.append((members, scores, availability, predicted, quotas, np.zeros((team_count, width))))
+
+    team_range = np.arange(team_count)
+    for chunk_start in range(0, draws, DRAW_CHUNK):
+        chunk = min(DRAW_CHUNK, draws - chunk_start)
+        for members, scores, availability, predicted, quotas, counts in blocks:
+            present = rng.random((chunk,) + scores.shape, dtype=np.float32) < availability
+            noisy = scores + noise * rng.standard_normal((chunk,) + scores.shape, dtype=np.float32)
+            noisy = np.where(present, noisy, -np.inf)
+
+            ranked = -np.sort(-noisy, axis=-1)
+            threshold = ranked[:, team_range, np.maximum(quotas - 1, 0)]
+            selected = (noisy >= threshold[..., None]) & np.isfinite(noisy) & (quotas > 0)[:, None]
+
+            counts += selected.sum(axis=0)
+            overlap += (selected & predicted).sum(axis=(0, 2))
+
+    for members, scores, availability, predicted, quotas, counts in blocks:
+        for t, indices in enumerate(members):
+            starts[t][indices] = counts[t, :len(indices)]
+
+    return [
+        {
+            'start_probability': starts[t] / draws,
+            'xi_confidence': float(overlap[t] / (draws * max(1, int(np.sum(team['predicted'])))))
+        }
+        for t, team in enumerate(teams)
+    ]
@@ -0,0 +1,130 @@
+import re
+import unicodedata
+import numpy as np
+
+# Availability vocabulary per text search config (see SEARCH_CONFIGS_BY_LANGUAGE); a trailing * matches any word
+# starting with the stem. Words are folded like mention text, so accents may be written or left out.
+NEWS_LEXICON = {
+    'english': {
+        'injury': ['injur*', 'hamstring*', 'knock', 'knocks', 'strain*', 'sprain*', 'fractur*', 'ligament*', 'surgery',
+                   'sidelined', 'setback', 'concussion', 'illness', 'sick'],
+        'doubt': ['doubt*', 'uncertain*', 'questionable', 'fitness', 'assessed', 'assessment', 'unclear'],
+        'suspension': ['suspen*', 'ban', 'banned', 'bans'],
+        'return': ['return*', 'recover*', 'fit', 'available', 'comeback', 'cleared', 'boost']
+    },
+    'spanish': {
+        'injury': ['lesión*', 'lesion*', 'rotura', 'molestia*', 'esguince', 'operado', 'quirófano', 'baja'],
+        'doubt': ['duda*', 'dudoso', 'incierto', 'incierta'],
+        'suspension': ['sanción*', 'sancion*', 'suspendido', 'expulsado', 'expulsión'],
+        'return': ['vuelve', 'vuelta', 'regresa', 'regreso', 'recuperad*', 'alta', 'disponible*']
+    },
+    'italian': {
+        'injury': ['infortun*', 'lesione', 'stiramento', 'distorsione', 'frattura', 'risentimento', 'ko'],
+        'doubt': ['dubbio', 'dubbi', 'incerto', 'acciaccato'],
+        'suspension': ['squalific*', 'espulso'],
+        'return': ['rientr*', 'recuperat*', 'disponibil*', 'torna', 'ritorno']
+    },
+    'german': {
+        'injury': ['verletz*', 'ausfall*', 'muskel*', 'zerrung', 'kreuzband*', 'operation', 'krank*'],
+        'doubt': ['fraglich*', 'angeschlagen', 'wackelt', 'unsicher'],
+        'suspension': ['gesperrt', 'sperre', 'rotsperre'],
+        'return': ['comeback', 'rückkehr', 'zurück', 'fit', 'einsatzbereit', 'genesen']
+    },
+    'french': {
+        'injury': ['bless*', 'lésion', 'claquage', 'entorse', 'fracture', 'forfait', 'malade'],
+        'doubt': ['incertain*', 'doute*', 'incertitude'],
+        'suspension': ['suspendu*', 'suspension', 'expulsé'],
+        'return': ['retour', 'apte', 'disponible', 'rétabli', 'revient']
+    },
+    'russian': {
+        'injury': ['травм*', 'повреждени*', 'растяжени*', 'перелом*', 'выбыл', 'пропустит'],
+        'doubt': ['вопросом', 'сомнени*', 'неясн*'],
+        'suspension': ['дисквалифи*', 'удален*'],
+        'return': ['вернулся', 'вернётся', 'возвращ*', 'восстановил*', 'готов']
+    }
+}
+
+# Sign and strength of each category in the net sentiment: unavailability terms are negative, and a return
+# outweighs the injury it is reported with ("back from his hamstring injury")
+CATEGORY_POLARITY = {'injury': -1.0, 'doubt': -0.5, 'suspension': -1.0, 'return': 2.0}
+CATEGORIES = tuple(CATEGORY_POLARITY)
+POLARITY = np.array([0.0] + [CATEGORY_POLARITY[category] for category in CATEGORIES])  # term 0: no match
+
+MIN_STEM_LENGTH = 3
+NO_HIT_RELEVANCE = 0.25  # floor for mentions without terms: still evidence when linked or naming a player, just weaker
+
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+def fold_words(text):
+    """Lower-case words with accents folded, in any script (unlike name_tokens, Cyrillic is kept)"""
+    text = unicodedata.normalize('NFKD', (text or '').casefold())
+    return WORD_PATTERN.findall(COMBINING_MARKS.sub('', text))
+
+class _TermLookup(dict):
+    """Word -> category number (0 for none) for one language, resolving each distinct word once"""
+    def __init__(self, exact, stems):
+        super().__init__()
+        self.exact = exact
+        self.stems = stems
+
+    def __missing__(self, word):
+        term = self.exact.get(word, 0)
+        for length in range(len(word), MIN_STEM_LENGTH - 1, -1):
+            if term:
+                break
+            term = self.stems.get(word[:length], 0)
+        self[word] = term
+        return term
+
+class NewsScorer:
+    """Lexicon sentiment and relevance of news mentions, scored a batch at a time.
+
+    Each mention's words are looked up in the availability vocabulary of its
+    text search config ('simple' uses every language). Per-word lookups are
+    memoised, and hit counts and polarity are summed per mention with one
+    bincount over the whole batch.
+    """
+    def __init__(self, lexicon=None):
+        self.lexicon = lexicon or NEWS_LEXICON
+        self._lookups = {}
+        for config, categories in self.lexicon.items():
+            self._lookups[config] = self._build_lookup([categories])
+        self._lookups['simple'] = self._build_lookup(list(self.lexicon.values()))
+
+    def _build_lookup(self, lexicons):
+        exact, stems = {}, {}
+        for categories in lexicons:
+            for category, words in categories.items():
+                term = CATEGORIES.index(category) + 1
+                for word in words:
+                    target = stems if word.endswith('*') else exact
+                    for folded in fold_words(word.rstrip('*')):
+                        target[folded] = term
+        return _TermLookup(exact, stems)
+
+    def score(self, mentions):
+        """Score mention dicts with content and search_config.
+
+        Returns one (sentiment, relevance_score) pair per mention: sentiment is
+        'negative', 'positive' or 'neutral' from the net polarity of the matched
+        terms, and relevance_score grows from NO_HIT_RELEVANCE towards 1 with
+        their number. It is never 0, so it can weight evidence ranks as is.
+        """
+        if not mentions:
+            return []
+        terms, lengths = [], []
+        for mention in mentions:
+            lookup = self._lookups.get(mention.get('search_config'), self._lookups['simple'])
+            words = fold_words(mention.get('content'))
+            terms.extend([lookup[word] for word in words])
+            lengths.append(len(words))
+
+        terms = np.array(terms, dtype=np.int64)
+        rows = np.repeat(np.arange(len(mentions)), lengths)
+        polarity = np.bincount(rows, weights=POLARITY[terms], minlength=len(mentions))
+        hits = np.bincount(rows, weights=(terms > 0).astype(float), minlength=len(mentions))
+
+        sentiment = np.where(polarity < 0, 'negative', np.where(polarity > 0, 'positive', 'neutral'))
+        relevance = np.round(np.maximum(1 - 0.5 ** hits, NO_HIT_RELEVANCE), 3)
+        return list(zip(sentiment.tolist(), relevance.tolist()))
@@ -0,0 +1,52 @@
+POSITION_CODES = {
+    'goalkeeper': 'GK',
+    'centre-back': 'CB',
+    'left-back': 'LB',
+    'right-back': 'RB',
+    'defender': 'CB',
+    'defensive midfield': 'DM',
+    'central midfield': 'CM',
+    'attacking midfield': 'AM',
+    'left midfield': 'LM',
+    'right midfield': 'RM',
+    'midfield': 'CM',
+    'midfielder': 'CM',
+    'left winger': 'LW',
+    'right winger': 'RW',
+    'centre-forward': 'CF',
+    'second striker': 'SS',
+    'striker': 'CF',
+    'forward': 'CF',
+    'attack': 'CF'
+}
+
+POSITION_GROUPS = {
+    'GK': 'GK',
+    'CB': 'DEF', 'LB': 'DEF', 'RB': 'DEF',
+    'DM': 'MID', 'CM': 'MID', 'AM': 'MID', 'LM': 'MID', 'RM': 'MID',
+    'LW': 'FWD', 'RW': 'FWD', 'CF': 'FWD', 'SS': 'FWD'
+}
+
+POSITION_ORDER = ['GK', 'LB', 'CB', 'RB', 'DM', 'CM', 'LM', 'RM', 'AM', 'LW', 'RW', 'SS', 'CF']
+
+FORMATION_TEMPLATES = {
+    '4-3-3': ['GK', 'LB', 'CB', 'CB', 'RB', 'DM', 'CM', 'CM', 'LW', 'CF', 'RW'],
+    '4-2-3-1': ['GK', 'LB', 'CB', 'CB', 'RB', 'DM', 'DM', 'LW', 'AM', 'RW', 'CF'],
+    '4-4-2': ['GK', 'LB', 'CB', 'CB', 'RB', 'LM', 'CM', 'CM', 'RM', 'CF', 'CF'],
+    '3-5-2': ['GK', 'CB', 'CB', 'CB', 'LM', 'DM', 'CM', 'CM', 'RM', 'CF', 'CF'],
+    '3-4-3': ['GK', 'CB', 'CB', 'CB', 'LM', 'CM', 'CM', 'RM', 'LW', 'CF', 'RW'],
+    '5-3-2': ['GK', 'LB', 'CB', 'CB', 'CB', 'RB', 'DM', 'CM', 'CM', 'CF', 'CF']
+}
+
+def position_code(position_text):
+    """Map a Transfermarkt position label (e.g. 'Centre-Back', 'Defender - Left-Back') to a short code"""
+    if not position_text:
+        return None
+    label = position_text.lower().strip()
+    if ' - ' in label:
+        label = label.split(' - ')[-1].strip()
+    return POSITION_CODES.get(label)
+
+def position_group(position_text):
+    """Map a Transfermarkt position label to GK/DEF/MID/FWD"""
+    return POSITION_GROUPS.get(position_code(position_text))
@@ -0,0 +1,207 @@
+import re
+import numpy as np
+from analyzers.positions import POSITION_ORDER, position_code
+
+SCORE_WEIGHTS = np.array([
+    0.45,  # games_started, relative to the squad's most-used player
+    0.25,  # minutes_played, relative to the squad maximum
+    0.30,  # log market value, relative to the squad maximum
+    0.15,  # net news signal in [-1, 1]
+    0.20   # recent form from the player feature store, see form_score
+])
+
+FORM_WINDOW_MATCHES = 5
+FORM_RECENCY_DAYS = 60  # a start this long before kickoff no longer counts as recent
+RETURN_WINDOW_DAYS = 14  # back from injury this recently: short of match fitness
+RETURN_PENALTY = 0.3
+
+MIN_SURNAME_LENGTH = 4
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def mention_tokens(content):
+    """Lower-cased word set of a news mention, used to spot player surnames"""
+    return set(WORD_PATTERN.findall((content or '').lower()))
+
+def mention_weight(mention):
+    """Signed contribution of one mention to a player's news signal"""
+    weight = mention.get('relevance_score')
+    if weight is None:
+        weight = 1.0  # not scored yet, as in get_news_evidence
+    if mention.get('sentiment') == 'negative':
+        return -weight
+    if mention.get('sentiment') == 'positive':
+        return 0.5 * weight
+    return 0.0
+
+def player_surname(player):
+    """Surname key used to match a player in free text, or None if too short to be reliable"""
+    if not player.get('name'):
+        return None
+    surname = player['name'].split()[-1].lower()
+    return surname if len(surname) >= MIN_SURNAME_LENGTH else None
+
+def form_score(starts_last5, minutes_share_last5, last_start_date, injury_return_date, kickoff_date):
+    """Recent-form score of one player: recent starts and minutes, how lately they started, and a fresh-return penalty"""
+    recency = 0.0
+    if last_start_date is not None:
+        recency = min(1.0, max(0.0, 1 - (kickoff_date - last_start_date).days / FORM_RECENCY_DAYS))
+    returned = injury_return_date is not None and 0 <= (kickoff_date - injury_return_date).days <= RETURN_WINDOW_DAYS
+    return (
+        0.5 * starts_last5 / FORM_WINDOW_MATCHES
+        + 0.3 * minutes_share_last5
+        + 0.2 * recency
+        - RETURN_PENALTY * returned
+    )
+
+def form_rows(form):
+    """Turn the columnar feature store read into {player_id: {column: value}}"""
+    columns = [column for column in form if column != 'player_id']
+    return {
+        player_id: dict(zip(columns, values))
+        for player_id, *values in zip(form.get('player_id', []), *(form[column] for column in columns))
+    }
+
+def form_scores(form, player_ids, kickoff_dates):
+    """Vectorised form_score for every player row; players missing from the store score 0.
+
+    form is the columnar read from get_player_features (sorted by player_id) and
+    kickoff_dates holds each row's kickoff as datetime64[D].
+    """
+    result = np.zeros(len(player_ids))
+    if not form or not len(player_ids):
+        return result
+
+    store_ids = np.asarray(form['player_id'], dtype=np.int64)
+    index = np.minimum(np.searchsorted(store_ids, player_ids), len(store_ids) - 1)
+    found = store_ids[index] == player_ids
+
+    starts = np.asarray(form['starts_last5'], dtype=float)[index]
+    share = np.asarray(form['minutes_share_last5'], dtype=float)[index]
+    last_start = np.array(form['last_start_date'], dtype='datetime64[D]')[index]
+    injury_return = np.array(form['injury_return_date'], dtype='datetime64[D]')[index]
+
+    days_since_start = (kickoff_dates - last_start).astype(np.int64)
+    recency = np.where(np.isnat(last_start), 0.0, np.clip(1 - days_since_start / FORM_RECENCY_DAYS, 0.0, 1.0))
+    days_since_return = (kickoff_dates - injury_return).astype(np.int64)
+    returned = ~np.isnat(injury_return) & (days_since_return >= 0) & (days_since_return <= RETURN_WINDOW_DAYS)
+
+    score = 0.5 * starts / FORM_WINDOW_MATCHES + 0.3 * share + 0.2 * recency - RETURN_PENALTY * returned
+    result[found] = score[found]
+    return result
+
+class MatchdayFeatures:
+    """Candidate feature columns for every player of a matchday, one row per player"""
+    def __init__(self, team_ids, team_index, player_ids, position_onehot, minutes, starts, market_value, available, candidate, news_signal, form):
+        self.team_ids = team_ids
+        self.team_index = team_index
+        self.player_ids = player_ids
+        self.position_onehot = position_onehot
+        self.minutes = minutes
+        self.starts = starts
+        self.market_value = market_value
+        self.available = available
+        self.candidate = candidate
+        self.news_signal = news_signal
+        self.form = form
+
+    def scores_by_team(self, scores):
+        """Split a score vector into {team_id: {player_id: score}} for every player with a known position"""
+        result = {team_id: {} for team_id in self.team_ids}
+        for row in np.flatnonzero(self.candidate):
+            result[self.team_ids[self.team_index[row]]][int(self.player_ids[row])] = float(scores[row])
+        return result
+
+def build_matchday_features(squads, news, available_ids, form=None, kickoff_dates=None):
+    """Build feature columns for all teams of a matchday.
+
+    squads maps team_id to squad rows (as returned by get_squads_for_teams), news maps
+    team_id to mention rows, and available_ids is the set of player ids fit to play.
+    form is the columnar feature store read and kickoff_dates maps team_id to the
+    kickoff date its form is measured against. Every player with a known position
+    is a candidate and gets a score; squad maxima used for normalisation only
+    consider available players.
+    """
+    team_ids = list(squads)
+    team_index, player_ids, position_columns = [], [], []
+    minutes, starts, market_value, available, candidate = [], [], [], [], []
+    surname_rows = {}
+
+    for t, team_id in enumerate(team_ids):
+        surnames = surname_rows.setdefault(team_id, {})
+        for player in squads[team_id]:
+            row = len(player_ids)
+            code = position_code(player['position'])
+            team_index.append(t)
+            player_ids.append(player['id'])
+            position_columns.append(POSITION_ORDER.index(code) if code else -1)
+            minutes.append(player.get('minutes_played') or 0)
+            starts.append(player.get('games_started') or 0)
+            market_value.append(player.get('market_value') or 0)
+            available.append(player['id'] in available_ids)
+            candidate.append(code is not None)
+            surname = player_surname(player)
+            if surname:
+                surnames.setdefault(surname, []).append(row)
+
+    player_ids = np.array(player_ids, dtype=np.int64)
+    row_of_player = {int(player_id): row for row, player_id in enumerate(player_ids)}
+
+    signal_rows, signal_weights = [], []
+    for team_id in team_ids:
+        surnames = surname_rows[team_id]
+        for mention in news.get(team_id, []):
+            weight = mention_weight(mention)
+            if not weight:
+                continue
+            rows = {row for token in mention_tokens(mention.get('content')) for row in surnames.get(token, ())}
+            linked_row = row_of_player.get(mention.get('player_id'))
+            if linked_row is not None:
+                rows.add(linked_row)
+            signal_rows.extend(rows)
+            signal_weights.extend([weight] * len(rows))
+
+    news_signal = np.zeros(len(player_ids))
+    np.add.at(news_signal, np.array(signal_rows, dtype=np.int64), np.array(signal_weights, dtype=float))
+
+    position_columns = np.array(position_columns, dtype=np.int64)
+    position_onehot = np.zeros((len(player_ids), len(POSITION_ORDER)), dtype=np.int8)
+    known = position_columns >= 0
+    position_onehot[np.flatnonzero(known), position_columns[known]] = 1
+
+    team_index = np.array(team_index, dtype=np.int64)
+    team_kickoffs = np.array([(kickoff_dates or {}).get(team_id) for team_id in team_ids], dtype='datetime64[D]')
+
+    return MatchdayFeatures(
+        team_ids=team_ids,
+        team_index=team_index,
+        player_ids=player_ids,
+        position_onehot=position_onehot,
+        minutes=np.array(minutes, dtype=float),
+        starts=np.array(starts, dtype=float),
+        market_value=np.log1p(np.array(market_value, dtype=float)),
+        available=np.array(available, dtype=bool),
+        candidate=np.array(candidate, dtype=bool),
+        news_signal=np.clip(news_signal, -1.0, 1.0),
+        form=form_scores(form, player_ids, team_kickoffs[team_index])
+    )
+
+def _squad_relative(values, features):
+    """Divide each value by the maximum among its team's available candidates (1 when that maximum is 0)"""
+    team_max = np.zeros(len(features.team_ids))
+    np.maximum.at(team_max, features.team_index, np.where(features.candidate & features.available, values, 0.0))
+    team_max[team_max == 0] = 1.0
+    return values / team_max[features.team_index]
+
+def score_candidates(features):
+    """Score every player of the matchday at once; players without a known position get -inf"""
+    matrix = np.column_stack([
+        _squad_relative(features.starts, features),
+        _squad_relative(features.minutes, features),
+        _squad_relative(features.market_value, features),
+        features.news_signal,
+        features.form
+    ])
+    scores = matrix @ SCORE_WEIGHTS
+    scores[~features.candidate] = -np.inf
+    return scores
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import json
+import logging
+from database.models import DatabaseManager
+from analyzers.backtest import run_backtest, log_backtest_report
+from config import LEAGUES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backtest_leagues(league_keys, max_workers=None):
+    """Replay each league's ingested season through the matchday predictor"""
+    db = DatabaseManager()
+    reports = {}
+
+    for league_key in league_keys:
+        league_info = LEAGUES[league_key]
+        league_db = db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            logger.error(f"League not found: {league_info['name']}")
+            continue
+
+        history = db.get_backtest_history(league_db['id'])
+        if not history['matches']:
+            logger.warning(f"⚠️ No ingested line-ups for {league_info['name']} yet")
+            continue
+
+        reports[league_key] = run_backtest(history, max_workers=max_workers)
+        log_backtest_report(league_info['name'], reports[league_key])
+
+    return reports
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay past matchdays and measure prediction accuracy and throughput")
+    parser.add_argument('--league', choices=list(LEAGUES), action='append', dest='leagues', help="League to replay (repeatable, default all)")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size (default: CPU count, 1 runs in-process)")
+    parser.add_argument('--json', dest='json_path', help="Also write the reports to this file")
+    args = parser.parse_args()
+
+    reports = backtest_leagues(args.leagues or list(LEAGUES), max_workers=args.workers)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(reports, f, indent=2)
+        logger.info(f"💾 Reports written to {args.json_path}")
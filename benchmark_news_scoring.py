@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import time
+import logging
+from analyzers.news_scorer import NewsScorer, NEWS_LEXICON, CATEGORY_POLARITY, MIN_STEM_LENGTH, fold_words
+from config import NEWS_SCORING_BATCH, NEWS_FEEDS, TRUSTED_JOURNALISTS, UPDATE_INTERVAL_HOURS, JOURNALIST_POLL_MINUTES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FILLER = {
+    'english': "the manager said on friday that the squad trained well ahead of the weekend fixture",
+    'spanish': "el entrenador dijo el viernes que la plantilla entrenó bien antes del partido del fin de semana",
+    'italian': "l'allenatore ha detto venerdì che la squadra si è allenata bene prima della partita",
+    'german': "der trainer sagte am freitag dass die mannschaft vor dem spiel am wochenende gut trainiert hat",
+    'french': "l'entraîneur a déclaré vendredi que le groupe s'est bien entraîné avant le match du week-end",
+    'russian': "тренер заявил в пятницу что команда хорошо потренировалась перед матчем выходного дня"
+}
+
+def build_backlog(size=50000, seed=11):
+    """Synthetic mentions in every supported language: filler text with a few availability terms mixed in"""
+    rng = random.Random(seed)
+    mentions = []
+    for mention_id in range(size):
+        config = rng.choice(list(FILLER))
+        words = FILLER[config].split()
+        for _ in range(rng.randint(0, 3)):
+            category = rng.choice(list(NEWS_LEXICON[config]))
+            words.insert(rng.randrange(len(words)), rng.choice(NEWS_LEXICON[config][category]).rstrip('*') + 'a' * rng.randint(0, 1))
+        mentions.append({'id': mention_id, 'content': f"Player{mention_id} " + ' '.join(words), 'search_config': config})
+    return mentions
+
+def score_one_by_one(mentions):
+    """Reference path: every word of every mention checked against the stem and word lists"""
+    lexicons = {}
+    for config, categories in NEWS_LEXICON.items():
+        exact, stems = {}, {}
+        for category, words in categories.items():
+            for word in words:
+                for folded in fold_words(word.rstrip('*')):
+                    (stems if word.endswith('*') else exact)[folded] = category
+        lexicons[config] = (exact, stems)
+
+    results = []
+    for mention in mentions:
+        exact, stems = lexicons[mention['search_config']]
+        polarity, hits = 0.0, 0
+        for word in fold_words(mention['content']):
+            category = exact.get(word) or next(
+                (stems[word[:length]] for length in range(len(word), MIN_STEM_LENGTH - 1, -1) if word[:length] in stems), None
+            )
+            if category:
+                polarity += CATEGORY_POLARITY[category]
+                hits += 1
+        sentiment = 'negative' if polarity < 0 else 'positive' if polarity > 0 else 'neutral'
+        results.append((sentiment, round(1 - 0.5 ** hits, 3)))
+    return results
+
+def score_in_chunks(scorer, chunks):
+    """Batched path as the scheduler runs it: one scorer, one score call per chunk"""
+    return [score for chunk in chunks for score in scorer.score(chunk)]
+
+def run_benchmark(repeats=3):
+    """Time batch scoring against the reference path and against the rate mentions arrive at"""
+    mentions = build_backlog()
+    chunks = [mentions[i:i + NEWS_SCORING_BATCH] for i in range(0, len(mentions), NEWS_SCORING_BATCH)]
+
+    timings, results = {}, {}
+    for name, scorer in [
+        ('one-by-one', score_one_by_one),
+        ('batched', lambda backlog: score_in_chunks(NewsScorer(), chunks))
+    ]:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results[name] = scorer(mentions)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    assert results['batched'] == results['one-by-one']
+
+    # Generous ingestion ceiling: every feed item and every journalist post routed to three teams
+    per_hour = 3 * (len(NEWS_FEEDS) * 100 / UPDATE_INTERVAL_HOURS + len(TRUSTED_JOURNALISTS) * 20 * 60 / JOURNALIST_POLL_MINUTES)
+    rate = len(mentions) / timings['batched']
+
+    logger.info(f"📊 {len(mentions)} mentions in {len(chunks)} chunks of {NEWS_SCORING_BATCH}, {len(NEWS_LEXICON)} languages")
+    for name, seconds in timings.items():
+        logger.info(f"   {name:>10}: {seconds * 1000:8.1f} ms ({len(mentions) / seconds:,.0f} mentions/s)")
+    logger.info(f"   speedup x{timings['one-by-one'] / timings['batched']:.1f}, scores identical")
+    logger.info(f"   ingestion ceiling ~{per_hour:,.0f} mentions/h: one core scores an hour of it in {per_hour / rate * 1000:.0f} ms")
+    return timings
+
+if __name__ == "__main__":
+    run_benchmark()
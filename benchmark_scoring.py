@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import time
+import logging
+from datetime import datetime, timedelta
+from analyzers.matchday_predictor import MatchdayPredictor
+from config import LEAGUES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORM_COLUMNS = ('player_id', 'starts_last5', 'minutes_share_last5', 'last_start_date', 'injury_return_date')
+
+POSITIONS = (
+    ['Goalkeeper'] * 3 + ['Centre-Back'] * 5 + ['Left-Back', 'Right-Back'] * 2 +
+    ['Defensive Midfield'] * 2 + ['Central Midfield'] * 4 + ['Attacking Midfield'] * 2 +
+    ['Left Winger', 'Right Winger'] * 2 + ['Centre-Forward'] * 3 + ['Left Midfield', 'Right Midfield']
+)
+
+def build_matchday(teams_per_league=20, mentions_per_team=40, seed=7):
+    """Synthetic six-league matchday: squads with statuses, a week of news and feature store rows per team"""
+    rng = random.Random(seed)
+    kickoff = datetime.now() + timedelta(days=2)
+    squads, news, kickoffs = {}, {}, {}
+    team_forms = {}
+    player_id = 0
+
+    for league_index in range(len(LEAGUES)):
+        for team_number in range(teams_per_league):
+            team_id = league_index * 100 + team_number
+            squad = []
+            form = team_forms[team_id] = {column: [] for column in FORM_COLUMNS}
+            for position in POSITIONS:
+                player_id += 1
+                status = []
+                if rng.random() < 0.08:
+                    status = [{'status_type': 'injury', 'expected_return_date': (kickoff + timedelta(days=rng.randint(-5, 20))).date().isoformat()}]
+                squad.append({
+                    'id': player_id,
+                    'team_id': team_id,
+                    'name': f"Player Surname{player_id}",
+                    'position': position,
+                    'jersey_number': len(squad) + 1,
+                    'market_value': rng.randint(1, 120) * 1000000,
+                    'minutes_played': rng.randint(0, 2700),
+                    'games_started': rng.randint(0, 30),
+                    'current_status': status
+                })
+                if rng.random() < 0.9:
+                    form['player_id'].append(player_id)
+                    form['starts_last5'].append(rng.randint(0, 5))
+                    form['minutes_share_last5'].append(rng.random())
+                    form['last_start_date'].append((kickoff - timedelta(days=rng.randint(3, 90))).date() if rng.random() < 0.8 else None)
+                    form['injury_return_date'].append((kickoff - timedelta(days=rng.randint(-10, 40))).date() if rng.random() < 0.2 else None)
+            squads[team_id] = squad
+            kickoffs[team_id] = kickoff
+            news[team_id] = [{
+                'team_id': team_id,
+                'player_id': rng.choice(squad)['id'] if rng.random() < 0.3 else None,
+                'content': f"Surname{rng.choice(squad)['id']} is a doubt for the weekend after training",
+                'sentiment': rng.choice(['negative', 'positive', 'neutral', None]),
+                'relevance_score': rng.random()
+            } for _ in range(mentions_per_team)]
+
+    return squads, news, kickoffs, team_forms
+
+def merge_forms(team_forms):
+    """Matchday-wide columnar feature read, as get_player_features returns it"""
+    return {column: [value for form in team_forms.values() for value in form[column]] for column in FORM_COLUMNS}
+
+def score_row_by_row(predictor, squads, news, kickoffs, team_forms):
+    """Reference path: per team, per player Python loops over dict rows"""
+    team_scores = {}
+    for team_id, players in squads.items():
+        kickoff_date = predictor._kickoff_date(kickoffs[team_id])
+        available_ids = {
+            p['id'] for p in players
+            if not predictor._unavailability_reason(p, kickoff_date)
+        }
+        team_scores[team_id] = predictor._score_players(
+            players, predictor._news_signals(players, news[team_id]), available_ids,
+            predictor._form_scores(players, team_forms[team_id], kickoff_date)
+        )
+    return team_scores
+
+def run_benchmark(repeats=5):
+    """Time both scoring paths on the same matchday and check they agree"""
+    predictor = MatchdayPredictor(db_manager=None)
+    squads, news, kickoffs, team_forms = build_matchday()
+    form = merge_forms(team_forms)
+    player_count = sum(len(players) for players in squads.values())
+
+    timings = {}
+    results = {}
+    for name, scorer, form_input in [
+        ('row-by-row', score_row_by_row, team_forms),
+        ('vectorised', lambda p, s, n, k, f: p.score_matchday(s, n, k, f), form)
+    ]:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results[name] = scorer(predictor, squads, news, kickoffs, form_input)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    max_diff = max(
+        abs(score - results['vectorised'][team_id][player_id])
+        for team_id, scores in results['row-by-row'].items()
+        for player_id, score in scores.items()
+    )
+
+    logger.info(f"📊 {len(squads)} teams, {player_count} players, {sum(len(m) for m in news.values())} news mentions")
+    for name, seconds in timings.items():
+        logger.info(f"   {name:>11}: {seconds * 1000:8.1f} ms ({player_count / seconds:,.0f} players/s)")
+    logger.info(f"   speedup x{timings['row-by-row'] / timings['vectorised']:.1f}, max score difference {max_diff:.2e}")
+    return timings
+
+if __name__ == "__main__":
+    run_benchmark()
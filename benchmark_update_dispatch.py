@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+import random
+import asyncio
+import logging
+import argparse
+from telegram import Update, CallbackQuery, User
+from telegram.ext import Application, ExtBot, TypeHandler
+from utils.update_processor import PerUserUpdateProcessor, BackpressureQueue
+from config import UPDATE_WORKERS, UPDATE_BACKLOG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+logging.getLogger('telegram.ext.Application').setLevel(logging.WARNING)
+
+NAVIGATION_SECONDS = 0.010  # a tap answered from cache: one Telegram call
+PREDICTION_SECONDS = 0.200  # a tap that waits on a prediction
+PREDICTION_SHARE = 0.15
+DOUBLE_TAP_SHARE = 0.10
+
+class OfflineBot(ExtBot):
+    """Bot that knows itself without calling getMe, so the application starts offline"""
+    async def get_me(self, *args, **kwargs):
+        self._bot_user = User(999, 'Lineup Bot', True, username='lineup_bot')
+        return self._bot_user
+
+async def run_load(mode, users, taps_per_user, think_seconds, seed=3):
+    """Tap latencies (from the tap being queued until its handler finished) and whether every user's taps ran in order"""
+    builder = Application.builder().bot(OfflineBot('123456:BENCHMARK')).updater(None)
+    if mode == 'per-user':
+        builder = builder.update_queue(BackpressureQueue(UPDATE_BACKLOG)).concurrent_updates(PerUserUpdateProcessor(UPDATE_WORKERS, UPDATE_BACKLOG))
+    application = builder.build()
+
+    tapped_at, latencies, handled = {}, [], {}
+    rng = random.Random(seed)
+    work = {}
+
+    async def handle(update, context):
+        await asyncio.sleep(work[update.update_id])
+        latencies.append(time.perf_counter() - tapped_at[update.update_id])
+        handled.setdefault(update.effective_user.id, []).append(update.update_id)
+
+    application.add_handler(TypeHandler(Update, handle))
+    await application.initialize()
+    await application.start()
+
+    update_ids = iter(range(1, users * taps_per_user * 2 + 1))
+
+    async def send(user):
+        update_id = next(update_ids)
+        work[update_id] = PREDICTION_SECONDS if rng.random() < PREDICTION_SHARE else NAVIGATION_SECONDS
+        tapped_at[update_id] = time.perf_counter()
+        await application.update_queue.put(
+            Update(update_id, callback_query=CallbackQuery(str(update_id), user, 'chat', data='tap'))
+        )
+
+    async def simulate_user(user_id):
+        user = User(user_id, f"User{user_id}", False)
+        for _ in range(taps_per_user):
+            await asyncio.sleep(rng.expovariate(1 / think_seconds))
+            await send(user)
+            if rng.random() < DOUBLE_TAP_SHARE:
+                await send(user)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[simulate_user(user_id) for user_id in range(1, users + 1)])
+    while len(latencies) < len(tapped_at):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    await application.stop()
+    await application.shutdown()
+    in_order = all(ids == sorted(ids) for ids in handled.values())
+    return sorted(latencies), in_order, elapsed
+
+def summary(latencies):
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return f"p50 {percentile(0.5):7.1f} ms  p95 {percentile(0.95):7.1f} ms  p99 {percentile(0.99):7.1f} ms"
+
+async def main():
+    parser = argparse.ArgumentParser(description="Tap latency under concurrent users: one update at a time vs per-user ordered dispatch")
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--taps', type=int, default=5, help="taps per user")
+    parser.add_argument('--think', type=float, default=2.0, help="mean seconds between a user's taps")
+    args = parser.parse_args()
+
+    logger.info(
+        f"📦 {args.users} users x {args.taps} taps, {args.think:.1f}s mean think time, "
+        f"{PREDICTION_SHARE:.0%} taps waiting {PREDICTION_SECONDS * 1000:.0f} ms, {DOUBLE_TAP_SHARE:.0%} double taps"
+    )
+    for mode in ('sequential', 'per-user'):
+        latencies, in_order, elapsed = await run_load(mode, args.users, args.taps, args.think)
+        logger.info(f"⏱️ {mode:10s} {len(latencies)} taps in {elapsed:5.1f}s  {summary(latencies)}  per-user order kept: {in_order}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import time
+import queue
+import random
+import asyncio
+import logging
+import argparse
+import threading
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+from utils.webhook_server import WebhookServer, SECRET_HEADER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+TOKEN = '123456:BENCHMARK'
+SECRET = 'benchmark-secret'
+DELIVERY_CONNECTIONS = 4  # parallel webhook connections the stand-in opens, like Telegram's max_connections
+
+class BotApiStandIn:
+    """Local stand-in for the Bot API: getMe, long-polling getUpdates and webhook delivery.
+
+    Every request to it and every delivery from it pays half of the simulated
+    round trip each way, as they would over the network to Telegram.
+    """
+    def __init__(self, rtt):
+        self.half_rtt = rtt / 2
+        self.pending = []
+        self.injected_at = {}
+        self.webhook_port = None
+        self.condition = threading.Condition()
+        self.deliveries = None
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.server.handle_error = lambda request, client_address: None  # long polls cut off at shutdown
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def inject(self, update_id):
+        """A user taps a button: the update reaches Telegram now"""
+        update = {
+            'update_id': update_id,
+            'message': {
+                'message_id': update_id, 'date': int(time.time()), 'text': '/start',
+                'chat': {'id': 1000 + update_id % 200, 'type': 'private'},
+                'from': {'id': 1000 + update_id % 200, 'is_bot': False, 'first_name': 'User'}
+            }
+        }
+        self.injected_at[update_id] = time.perf_counter()
+        if self.webhook_port:
+            self.deliveries.put_nowait(update)
+            return
+        with self.condition:
+            self.pending.append(update)
+            self.condition.notify_all()
+
+    def get_updates(self, offset, timeout):
+        with self.condition:
+            self.pending = [update for update in self.pending if update['update_id'] >= offset]
+            if not self.pending:
+                self.condition.wait(timeout)
+            return list(self.pending)
+
+    def start_webhook_delivery(self, port):
+        self.webhook_port = port
+        self.deliveries = queue.Queue()
+        for _ in range(DELIVERY_CONNECTIONS):
+            threading.Thread(target=self._deliver, daemon=True).start()
+
+    def _deliver(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.webhook_port)
+        while True:
+            update = self.deliveries.get()
+            body = json.dumps(update).encode()
+            time.sleep(self.half_rtt)
+            connection.request('POST', '/telegram', body, {'Content-Type': 'application/json', SECRET_HEADER: SECRET})
+            connection.getresponse().read()
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+            def do_POST(self):
+                time.sleep(stand_in.half_rtt)
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.headers.get('Content-Type', '').startswith('application/json'):
+                    params = json.loads(body or b'{}')
+                else:
+                    params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+                method = self.path.rsplit('/', 1)[-1]
+                if method == 'getMe':
+                    result = {'id': 999, 'is_bot': True, 'first_name': 'Lineup Bot', 'username': 'lineup_bot'}
+                elif method == 'getUpdates':
+                    result = stand_in.get_updates(int(params.get('offset', 0)), float(params.get('timeout', 0)))
+                else:
+                    result = True
+                payload = json.dumps({'ok': True, 'result': result}).encode()
+                time.sleep(stand_in.half_rtt)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+async def measure(mode, updates, rate, rtt, seed=5):
+    """Seconds from each update reaching the stand-in until its handler runs"""
+    stand_in = BotApiStandIn(rtt)
+    application = Application.builder().token(TOKEN).base_url(f"http://127.0.0.1:{stand_in.port}/bot").build()
+    latencies = []
+    done = asyncio.Event()
+
+    async def record(update, context):
+        latencies.append(time.perf_counter() - stand_in.injected_at[update.update_id])
+        if len(latencies) == updates:
+            done.set()
+
+    application.add_handler(TypeHandler(Update, record))
+    await application.initialize()
+    await application.start()
+    server = None
+    if mode == 'webhook':
+        server = WebhookServer(application.bot, application.update_queue, listen='127.0.0.1', port=0, secret_token=SECRET)
+        await server.start()
+        stand_in.start_webhook_delivery(server.port)
+    else:
+        await application.updater.start_polling(poll_interval=0.0, timeout=10)
+    await asyncio.sleep(0.5)
+
+    rng = random.Random(seed)
+    for update_id in range(1, updates + 1):
+        stand_in.inject(update_id)
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.wait_for(done.wait(), 30)
+
+    if server:
+        await server.stop()
+    else:
+        await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    stand_in.server.shutdown()
+    return sorted(latencies)
+
+def summary(latencies):
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return f"p50 {percentile(0.5):6.1f} ms  p95 {percentile(0.95):6.1f} ms  p99 {percentile(0.99):6.1f} ms  max {latencies[-1] * 1000:6.1f} ms"
+
+async def main():
+    parser = argparse.ArgumentParser(description="Update delivery latency, long polling vs webhook, against a local Bot API stand-in")
+    parser.add_argument('--updates', type=int, default=300)
+    parser.add_argument('--rate', type=float, default=25.0, help="updates per second (Poisson arrivals)")
+    parser.add_argument('--rtt-ms', type=float, default=40.0, help="simulated round trip to the Bot API")
+    args = parser.parse_args()
+
+    logger.info(f"📦 {args.updates} updates at {args.rate:.0f}/s, {args.rtt_ms:.0f} ms simulated round trip")
+    for mode in ('polling', 'webhook'):
+        latencies = await measure(mode, args.updates, args.rate, args.rtt_ms / 1000)
+        logger.info(f"⏱️ {mode:8s} {summary(latencies)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
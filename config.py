@@ -1,52 +1,61 @@
 import os
+import hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN') or os.getenv('Telegram_Token')
+CALLBACK_SECRET = os.getenv('CALLBACK_SECRET') or TELEGRAM_BOT_TOKEN or ''  # signs button payloads; shared by every replica
 DATABASE_URL = os.getenv('DATABASE_URL')
 TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
 TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
 TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
 TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
 TWITTER_ACCESS_TOKEN_SECRET = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+TWITTER_API_BASE_URL = os.getenv('TWITTER_API_BASE_URL', 'https://api.twitter.com')
 
 LEAGUES = {
     'EPL': {
         'name': 'Premier League',
         'emoji': '🏴󠁧󠁢󠁥󠁮󠁧󠁿',
         'transfermarkt_id': 'GB1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'english'  # text search config for its news
     },
     'La Liga': {
         'name': 'La Liga',
         'emoji': '🇪🇸',
         'transfermarkt_id': 'ES1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'spanish'
     },
     'Serie A': {
         'name': 'Serie A',
         'emoji': '🇮🇹',
         'transfermarkt_id': 'IT1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'italian'
     },
     'Bundesliga': {
         'name': 'Bundesliga',
         'emoji': '🇩🇪',
         'transfermarkt_id': 'L1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'german'
     },
     'Ligue 1': {
         'name': 'Ligue 1',
         'emoji': '🇫🇷',
         'transfermarkt_id': 'FR1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'french'
     },
     'RPL': {
         'name': 'Russian Premier League',
         'emoji': '🇷🇺',
         'transfermarkt_id': 'RU1',
-        'season': '2025'
+        'season': '2025',
+        'language': 'russian'
     }
 }
 
@@ -66,3 +75,36 @@ TRUSTED_JOURNALISTS = [
 ]
 
 UPDATE_INTERVAL_HOURS = 10
+JOURNALIST_POLL_MINUTES = int(os.getenv('JOURNALIST_POLL_MINUTES', '30'))
+SOCIAL_QUERY_MAX_LENGTH = int(os.getenv('SOCIAL_QUERY_MAX_LENGTH', '512'))  # recent-search query length limit
+
+PIPELINE_MAX_WORKERS = int(os.getenv('PIPELINE_MAX_WORKERS', '6'))
+BROWSER_SLOTS = int(os.getenv('BROWSER_SLOTS', '2'))
+HTTP_SLOTS = int(os.getenv('HTTP_SLOTS', '4'))
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '14'))  # keep above PIPELINE_MAX_WORKERS + PREDICTION_WORKERS + scheduler + DB_LOOP_CONNECTIONS
+DB_LOOP_CONNECTIONS = int(os.getenv('DB_LOOP_CONNECTIONS', '2'))  # of those, reserved for the bot's event loop so taps never wait on workers
+LINEUP_INGEST_BATCH = int(os.getenv('LINEUP_INGEST_BATCH', '40'))
+LINEUP_RETRY_HOURS = int(os.getenv('LINEUP_RETRY_HOURS', '3'))  # wait before retrying a match without line-ups, doubled per failure
+LINEUP_MAX_ATTEMPTS = int(os.getenv('LINEUP_MAX_ATTEMPTS', '6'))  # failed line-up fetches before a match is given up
+PREDICTION_WORKERS = int(os.getenv('PREDICTION_WORKERS', '4'))  # on-demand predictions computed at once for bot users
+EDIT_PLACEHOLDER_BUDGET_MS = int(os.getenv('EDIT_PLACEHOLDER_BUDGET_MS', '300'))  # results ready sooner skip the "Generating..." edit
+RENDER_CACHE_SIZE = int(os.getenv('RENDER_CACHE_SIZE', '2000'))  # rendered lineup messages kept in memory
+NEWS_SCORING_BATCH = int(os.getenv('NEWS_SCORING_BATCH', '5000'))  # mentions scored and written back per chunk
+UPDATE_WORKERS = int(os.getenv('UPDATE_WORKERS', '16'))  # updates from different users handled at once
+UPDATE_BACKLOG = int(os.getenv('UPDATE_BACKLOG', '500'))  # updates queued or in progress before ingress is held back
+
+# Update ingress: long polling unless WEBHOOK_URL (the public https base URL Telegram should call) is set
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '').rstrip('/')
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/telegram')
+WEBHOOK_HEALTH_PATH = os.getenv('WEBHOOK_HEALTH_PATH', '/healthz')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET') or hashlib.sha256(f"webhook:{TELEGRAM_BOT_TOKEN or ''}".encode()).hexdigest()  # sent back by Telegram in X-Telegram-Bot-Api-Secret-Token
+
+# Football news feeds, fetched once per update cycle and routed to every team and player they mention
+NEWS_FEEDS = {
+    'bbc': 'https://feeds.bbci.co.uk/sport/football/rss.xml',
+    'guardian': 'https://www.theguardian.com/football/rss',
+    'skysports': 'https://www.skysports.com/rss/12040',
+    'espn': 'https://www.espn.com/espn/rss/soccer/news'
+}
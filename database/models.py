@@ -1,18 +1,122 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import json
+import asyncio
 import logging
-from datetime import datetime
-from config import DATABASE_URL
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date
+from config import DATABASE_URL, DB_MAX_CONNECTIONS, DB_LOOP_CONNECTIONS, LEAGUES, LINEUP_MAX_ATTEMPTS, LINEUP_RETRY_HOURS
+from utils.player_identity import player_name_key
+from analyzers.news_scorer import NO_HIT_RELEVANCE
 
 logger = logging.getLogger(__name__)
 
+# [start, expected return) as a daterange; a start on or after the return date is dropped rather than rejected
+AVAILABILITY_RANGE_SQL = "daterange(CASE WHEN {end} IS NULL OR {start} < {end} THEN {start} END, {end}, '[)')"
+
+# Legacy rows scraped from the injury list keep that source so the next injury sync can close them
+LEGACY_SOURCE_SQL = "CASE WHEN source_url LIKE '%/verletztenliste/%' THEN 'transfermarkt_injuries' ELSE 'manual' END"
+
+# Same story from the same URL: case, punctuation and whitespace differences do not count
+NEWS_CONTENT_HASH_SQL = "md5(btrim(regexp_replace(lower({content}), '[^[:alnum:]]+', ' ', 'g')) || '|' || COALESCE({url}, ''))"
+
+# Text search config of a mention: its source's declared language (ISO 639-1), else its team's league language
+SEARCH_CONFIGS_BY_LANGUAGE = {'en': 'english', 'es': 'spanish', 'it': 'italian', 'de': 'german', 'fr': 'french', 'ru': 'russian'}
+LEAGUE_SEARCH_CONFIG_SQL = "CASE {transfermarkt_id} " + " ".join(
+    f"WHEN '{league['transfermarkt_id']}' THEN '{league['language']}'" for league in LEAGUES.values()
+) + " ELSE 'simple' END"
+
+# A surname is searched under every config in use, so it matches whichever one indexed the mention
+SEARCH_CONFIGS = sorted(set(SEARCH_CONFIGS_BY_LANGUAGE.values()) | {league['language'] for league in LEAGUES.values()} | {'simple'})
+SURNAME_TSQUERY_SQL = " || ".join(f"plainto_tsquery('{config}', {{surname}})" for config in SEARCH_CONFIGS)
+NEWS_EVIDENCE_LIMIT = 5  # mentions per player
+
+# Statuses this many days before kickoff still matter: players just back are fitness doubts
+KICKOFF_LOOKBACK_DAYS = 3
+INJURY_STATUS_TYPES = ('injury', 'illness')  # statuses that feed the feature store's injury_return_date
+
+class _NestedConnection:
+    """Connection handed to a nested get_connection call, scoped by a savepoint.
+
+    commit and rollback only settle the nested scope's own work; the
+    outermost call still decides whether the transaction commits.
+    """
+    def __init__(self, conn, savepoint):
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def _run(self, *statements):
+        with self._conn.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def commit(self):
+        self._run(f"RELEASE SAVEPOINT {self._savepoint}", f"SAVEPOINT {self._savepoint}")
+
+    def rollback(self):
+        self._run(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
 class DatabaseManager:
     def __init__(self):
         self.connection_string = DATABASE_URL
+        loop_slots = max(1, min(DB_LOOP_CONNECTIONS, DB_MAX_CONNECTIONS - 1))
+        self._connection_slots = threading.BoundedSemaphore(DB_MAX_CONNECTIONS - loop_slots)
+        self._loop_slots = threading.BoundedSemaphore(loop_slots)
+        self._thread_connections = threading.local()
+        self.prediction_listeners = []  # called with the (match_id, team_id) pairs whose prediction was just saved
         
+    def _slots_for_thread(self):
+        """Slots of the calling thread: the event loop's reserved ones, or those shared by worker threads"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._connection_slots
+        return self._loop_slots
+    
+    @contextmanager
     def get_connection(self):
-        return psycopg2.connect(self.connection_string, cursor_factory=RealDictCursor)
+        """Open a connection, bounded by DB_MAX_CONNECTIONS across all threads.
+
+        An event loop thread (the bot's handlers) draws from DB_LOOP_CONNECTIONS
+        slots of its own, so a busy worker pool can never block it. Nested calls
+        from a thread that already holds a connection get that same connection
+        inside a savepoint: they neither take another slot nor commit the
+        caller's work, and an error in them only undoes their own.
+        """
+        conn = getattr(self._thread_connections, 'conn', None)
+        if conn is not None:
+            depth = self._thread_connections.depth = self._thread_connections.depth + 1
+            nested = _NestedConnection(conn, f"nested_{depth}")
+            nested._run(f"SAVEPOINT nested_{depth}")
+            try:
+                yield nested
+            except BaseException:
+                if not conn.closed:
+                    nested.rollback()
+                raise
+            else:
+                nested._run(f"RELEASE SAVEPOINT nested_{depth}")
+            finally:
+                self._thread_connections.depth = depth - 1
+            return
+        slots = self._slots_for_thread()
+        slots.acquire()
+        try:
+            conn = psycopg2.connect(self.connection_string, cursor_factory=RealDictCursor)
+            self._thread_connections.conn = conn
+            self._thread_connections.depth = 0
+            try:
+                with conn:
+                    yield conn
+            finally:
+                self._thread_connections.conn = None
+                conn.close()
+        finally:
+            slots.release()
     
     def init_database(self):
         """Initialize database tables"""
@@ -164,6 +268,210 @@ class DatabaseManager:
                     )
                 """)
                 
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS team_input_versions (
+                        team_id INTEGER PRIMARY KEY REFERENCES teams(id),
+                        version BIGINT NOT NULL DEFAULT 1, -- bumped whenever squad, status, news or fixture inputs change
+                        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE lineup_predictions ADD COLUMN IF NOT EXISTS input_version BIGINT
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE lineup_predictions ADD COLUMN IF NOT EXISTS unavailable_players JSONB
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS prediction_failures (
+                        match_id INTEGER REFERENCES matches(id),
+                        team_id INTEGER REFERENCES teams(id),
+                        input_version BIGINT NOT NULL, -- not retried until the team's inputs move past this
+                        failed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (match_id, team_id)
+                    )
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS player_appearances (
+                        id SERIAL PRIMARY KEY,
+                        match_id INTEGER REFERENCES matches(id),
+                        player_id INTEGER REFERENCES players(id),
+                        team_id INTEGER REFERENCES teams(id),
+                        started BOOLEAN NOT NULL,
+                        minute_on INTEGER, -- 0 for starters
+                        minute_off INTEGER, -- 90 unless substituted or sent off
+                        minutes_played INTEGER NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(match_id, player_id)
+                    )
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE matches ADD COLUMN IF NOT EXISTS lineups_ingested_at TIMESTAMP
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE matches ADD COLUMN IF NOT EXISTS lineup_attempts INTEGER NOT NULL DEFAULT 0
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE matches ADD COLUMN IF NOT EXISTS lineup_attempted_at TIMESTAMP
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE matches ADD COLUMN IF NOT EXISTS home_formation VARCHAR(10)
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE matches ADD COLUMN IF NOT EXISTS away_formation VARCHAR(10)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_player_appearances_player ON player_appearances(player_id)
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE players ADD COLUMN IF NOT EXISTS season_stats_synced_at TIMESTAMP
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE players ADD COLUMN IF NOT EXISTS name_key VARCHAR(200) -- see player_name_key
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_players_team_name_key ON players(team_id, name_key)
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS player_features (
+                        player_id INTEGER PRIMARY KEY REFERENCES players(id),
+                        team_id INTEGER REFERENCES teams(id),
+                        starts_last5 INTEGER NOT NULL DEFAULT 0, -- starts in the team's last 5 ingested matches
+                        minutes_last5 INTEGER NOT NULL DEFAULT 0,
+                        minutes_share_last5 FLOAT NOT NULL DEFAULT 0, -- minutes_last5 / (90 * team matches in window)
+                        last_start_date DATE,
+                        last_appearance_date DATE,
+                        injury_return_date DATE, -- latest expected return from an injury or illness
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_player_features_team ON player_features(team_id)
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE news_mentions ADD COLUMN IF NOT EXISTS content_hash CHAR(32) -- see NEWS_CONTENT_HASH_SQL
+                """)
+                
+                cursor.execute("""
+                    DROP INDEX IF EXISTS idx_news_mentions_source_url
+                """)
+                
+                cursor.execute("SELECT to_regclass('idx_news_mentions_team_content') IS NULL AS missing")
+                if cursor.fetchone()['missing']:
+                    self._compact_news_mentions(cursor)
+                
+                cursor.execute("""
+                    ALTER TABLE news_mentions ADD COLUMN IF NOT EXISTS search_config REGCONFIG -- see SEARCH_CONFIGS_BY_LANGUAGE
+                """)
+                
+                cursor.execute(f"""
+                    UPDATE news_mentions nm SET search_config = COALESCE((
+                        SELECT {LEAGUE_SEARCH_CONFIG_SQL.format(transfermarkt_id='l.transfermarkt_id')}
+                        FROM teams t JOIN leagues l ON l.id = t.league_id
+                        WHERE t.id = nm.team_id
+                    ), 'simple')::regconfig
+                    WHERE search_config IS NULL
+                """)
+                
+                cursor.execute("""
+                    ALTER TABLE news_mentions ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+                    GENERATED ALWAYS AS (to_tsvector(COALESCE(search_config, 'simple'::regconfig), content)) STORED
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_news_mentions_search ON news_mentions USING GIN (search_vector)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_news_mentions_team_published ON news_mentions(team_id, published_at)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_news_mentions_unscored ON news_mentions(id) WHERE sentiment IS NULL
+                """)
+                
+                # mentions scored before the relevance floor existed would rank as no evidence at all
+                cursor.execute("""
+                    UPDATE news_mentions SET relevance_score = %s WHERE relevance_score = 0
+                """, (NO_HIT_RELEVANCE,))
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS journalist_cursors (
+                        handle VARCHAR(50) PRIMARY KEY,
+                        since_id VARCHAR(30), -- newest post already ingested
+                        last_post_at TIMESTAMP,
+                        last_polled_at TIMESTAMP
+                    )
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS player_availability (
+                        id SERIAL PRIMARY KEY,
+                        player_id INTEGER REFERENCES players(id),
+                        status_type VARCHAR(20) NOT NULL, -- 'injury', 'suspension', 'illness', 'personal'
+                        description TEXT,
+                        severity VARCHAR(20),
+                        unavailable DATERANGE NOT NULL, -- [start, expected return); unbounded ends when unknown
+                        source VARCHAR(50),
+                        source_url TEXT,
+                        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        superseded_at TIMESTAMP -- set when a later report replaces this one
+                    )
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_player_availability_current_range 
+                    ON player_availability USING GIST (unavailable) WHERE superseded_at IS NULL
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_player_availability_current_player 
+                    ON player_availability(player_id) WHERE superseded_at IS NULL
+                """)
+                
+                # the same absence may be in both legacy tables: only the newest open row per player, type and
+                # source stays current, as _record_availability keeps one current event per key
+                cursor.execute(f"""
+                    INSERT INTO player_availability (player_id, status_type, description, severity, unavailable, 
+                                                     source, source_url, recorded_at, superseded_at)
+                    SELECT legacy.player_id, legacy.status_type, legacy.description, legacy.severity, legacy.unavailable,
+                           legacy.source, legacy.source_url, legacy.recorded_at,
+                           CASE WHEN legacy.superseded_at IS NOT NULL THEN legacy.superseded_at
+                                WHEN ROW_NUMBER() OVER (
+                                    PARTITION BY legacy.player_id, legacy.status_type, legacy.source, legacy.superseded_at IS NULL
+                                    ORDER BY legacy.recorded_at DESC
+                                ) > 1 THEN CURRENT_TIMESTAMP
+                           END
+                    FROM (
+                        SELECT player_id, status_type, description, severity, 
+                               {AVAILABILITY_RANGE_SQL.format(start='start_date', end='expected_return_date')} AS unavailable,
+                               {LEGACY_SOURCE_SQL} AS source, source_url, created_at AS recorded_at,
+                               CASE WHEN is_active THEN NULL ELSE updated_at END AS superseded_at
+                        FROM player_status
+                        UNION ALL
+                        SELECT player_id, COALESCE(injury_type, 'injury'), injury_name, severity,
+                               {AVAILABILITY_RANGE_SQL.format(start='injury_start_date', end='expected_return_date')},
+                               {LEGACY_SOURCE_SQL}, source_url, created_at, CASE WHEN is_active THEN NULL ELSE updated_at END
+                        FROM injuries
+                    ) legacy
+                    WHERE NOT EXISTS (SELECT 1 FROM player_availability)
+                """)
+                
                 conn.commit()
     
     def insert_league(self, name, transfermarkt_id, season):
@@ -271,18 +579,42 @@ class DatabaseManager:
                     """, (alias_name,))
                 return cursor.fetchone()
     
+    def get_name_entries(self, league_id=None):
+        """Every team name, club alias and player name of one league (or all leagues), for NameResolver"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT 'team' AS kind, t.id, t.id AS team_id, t.name
+                    FROM teams t
+                    WHERE %(league_id)s::int IS NULL OR t.league_id = %(league_id)s
+                    UNION ALL
+                    SELECT 'team', t.id, t.id, ca.alias_name
+                    FROM club_aliases ca
+                    JOIN teams t ON t.id = ca.team_id
+                    WHERE %(league_id)s::int IS NULL OR t.league_id = %(league_id)s
+                    UNION ALL
+                    SELECT 'player', p.id, p.team_id, p.name
+                    FROM players p
+                    JOIN teams t ON t.id = p.team_id
+                    WHERE %(league_id)s::int IS NULL OR t.league_id = %(league_id)s
+                """, {'league_id': league_id})
+                return cursor.fetchall()
+    
     def insert_match(self, home_team_id, away_team_id, league_id, match_date, matchday, transfermarkt_id):
         """Insert or update a match (preserve existing data as requested)"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT id FROM matches 
+                    SELECT id, match_date FROM matches 
                     WHERE home_team_id = %s AND away_team_id = %s 
                     AND league_id = %s AND matchday = %s
                 """, (home_team_id, away_team_id, league_id, matchday))
                 
                 existing_match = cursor.fetchone()
                 
+                if not existing_match or existing_match['match_date'] != match_date:
+                    self._mark_teams_dirty(cursor, [home_team_id, away_team_id])
+                
                 if existing_match:
                     cursor.execute("""
                         UPDATE matches 
@@ -304,6 +636,316 @@ class DatabaseManager:
                 conn.commit()
                 return result['id'] if result else None
     
+    def get_matches_awaiting_lineups(self, league_id, limit=40):
+        """Get finished matches of a league whose line-ups have not been ingested yet.
+
+        A match that has failed before waits LINEUP_RETRY_HOURS, doubled after
+        each failed attempt, and is given up after LINEUP_MAX_ATTEMPTS; matches
+        never tried come first, then the oldest.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, home_team_id, away_team_id, transfermarkt_id, match_date, lineup_attempts
+                    FROM matches
+                    WHERE league_id = %s
+                    AND lineups_ingested_at IS NULL
+                    AND transfermarkt_id IS NOT NULL AND transfermarkt_id <> ''
+                    AND match_date < NOW() - INTERVAL '3 hours'
+                    AND lineup_attempts < %s
+                    AND (lineup_attempted_at IS NULL
+                         OR lineup_attempted_at < NOW() - make_interval(hours => %s * (1 << LEAST(GREATEST(lineup_attempts - 1, 0), 16))))
+                    ORDER BY lineup_attempts, match_date, id
+                    LIMIT %s
+                """, (league_id, LINEUP_MAX_ATTEMPTS, LINEUP_RETRY_HOURS, limit))
+                return cursor.fetchall()
+    
+    def record_lineup_attempts(self, match_ids):
+        """Count a failed line-up ingestion attempt for each match, which backs off its next try"""
+        if not match_ids:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE matches
+                    SET lineup_attempts = lineup_attempts + 1, lineup_attempted_at = CURRENT_TIMESTAMP
+                    WHERE id = ANY(%s)
+                    RETURNING id, lineup_attempts
+                """, (list(match_ids),))
+                given_up = [row['id'] for row in cursor.fetchall() if row['lineup_attempts'] >= LINEUP_MAX_ATTEMPTS]
+                conn.commit()
+        if given_up:
+            logger.warning(f"⚠️ Giving up on line-ups of matches {given_up} after {LINEUP_MAX_ATTEMPTS} attempts")
+    
+    def save_match_appearances(self, match_ids, appearances, formations=None):
+        """Record appearances for finished matches and add them to players' minutes and starts.
+
+        appearances are dicts with match_id, team_id, transfermarkt_id, started,
+        minute_on, minute_off and minutes. Rows are matched to squad players by
+        Transfermarkt id; each (match, player) is counted once, so re-ingesting a
+        match never double counts, and matches played before a player's last
+        season stats import are already in their totals. The matches are stamped
+        as ingested, with the fielded formations from formations
+        ({match_id: {'home': ..., 'away': ...}}), except those with appearances
+        of players not in the squad yet (a new signing, a youth call-up): they
+        count a failed attempt and are retried once the squad has caught up,
+        until LINEUP_MAX_ATTEMPTS. Returns the number of new appearance rows.
+        """
+        if not match_ids:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                rows = []
+                if appearances:
+                    rows = execute_values(cursor, """
+                        WITH resolved AS (
+                            SELECT v.*, p.id AS player_id
+                            FROM (VALUES %s) AS v(match_id, team_id, transfermarkt_id, started, minute_on, minute_off, minutes)
+                            LEFT JOIN players p ON p.team_id = v.team_id AND p.transfermarkt_id = v.transfermarkt_id
+                        ), new_appearances AS (
+                            INSERT INTO player_appearances (match_id, player_id, team_id, started, minute_on, minute_off, minutes_played)
+                            SELECT match_id, player_id, team_id, started, minute_on, minute_off, minutes
+                            FROM resolved
+                            WHERE player_id IS NOT NULL
+                            ON CONFLICT (match_id, player_id) DO NOTHING
+                            RETURNING match_id, player_id, team_id, started, minutes_played
+                        ), totals AS (
+                            SELECT na.player_id, MIN(na.team_id) AS team_id,
+                                   SUM(na.minutes_played) AS minutes, COUNT(*) FILTER (WHERE na.started) AS starts
+                            FROM new_appearances na
+                            JOIN matches m ON m.id = na.match_id
+                            JOIN players sp ON sp.id = na.player_id
+                            WHERE sp.season_stats_synced_at IS NULL OR m.match_date > sp.season_stats_synced_at
+                            GROUP BY na.player_id
+                        ), counters AS (
+                            UPDATE players p
+                            SET minutes_played = COALESCE(p.minutes_played, 0) + t.minutes,
+                                games_started = COALESCE(p.games_started, 0) + t.starts,
+                                updated_at = CURRENT_TIMESTAMP
+                            FROM totals t
+                            WHERE p.id = t.player_id
+                        )
+                        SELECT 'inserted' AS kind, team_id AS id, COUNT(*) AS appearances
+                        FROM new_appearances
+                        GROUP BY team_id
+                        UNION ALL
+                        SELECT 'unresolved', match_id, COUNT(*)
+                        FROM resolved
+                        WHERE player_id IS NULL
+                        GROUP BY match_id
+                    """, [(
+                        a['match_id'], a['team_id'], str(a['transfermarkt_id']), a['started'],
+                        a.get('minute_on'), a.get('minute_off'), a['minutes']
+                    ) for a in appearances], template="(%s::int, %s::int, %s, %s::boolean, %s::int, %s::int, %s::int)",
+                       page_size=1000, fetch=True)
+                
+                unresolved = {}
+                for row in rows:
+                    if row['kind'] == 'unresolved':
+                        unresolved[row['id']] = unresolved.get(row['id'], 0) + row['appearances']
+                retry_ids = set()
+                if unresolved:
+                    cursor.execute("""
+                        UPDATE matches
+                        SET lineup_attempts = lineup_attempts + 1, lineup_attempted_at = CURRENT_TIMESTAMP
+                        WHERE id = ANY(%s) AND lineup_attempts + 1 < %s
+                        RETURNING id
+                    """, (list(unresolved), LINEUP_MAX_ATTEMPTS))
+                    retry_ids = {row['id'] for row in cursor.fetchall()}
+                    logger.warning(
+                        f"⚠️ {sum(unresolved.values())} appearances in {len(unresolved)} matches matched no squad player; "
+                        f"{len(retry_ids)} matches left for a retry, {len(unresolved) - len(retry_ids)} ingested without them"
+                    )
+                
+                formations = formations or {}
+                execute_values(cursor, """
+                    UPDATE matches m
+                    SET lineups_ingested_at = CURRENT_TIMESTAMP, status = 'finished', updated_at = CURRENT_TIMESTAMP,
+                        home_formation = COALESCE(v.home_formation, m.home_formation),
+                        away_formation = COALESCE(v.away_formation, m.away_formation)
+                    FROM (VALUES %s) AS v(match_id, home_formation, away_formation)
+                    WHERE m.id = v.match_id
+                """, [(
+                    match_id,
+                    formations.get(match_id, {}).get('home'),
+                    formations.get(match_id, {}).get('away')
+                ) for match_id in match_ids if match_id not in retry_ids], template="(%s::int, %s::varchar, %s::varchar)")
+                
+                inserted = [row for row in rows if row['kind'] == 'inserted']
+                changed_teams = {row['id'] for row in inserted}
+                self._refresh_player_features(cursor, changed_teams)
+                self._mark_teams_dirty(cursor, changed_teams)
+                conn.commit()
+                return sum(row['appearances'] for row in inserted)
+    
+    def update_player_season_stats(self, stats):
+        """Bulk-set players' season minutes and starts from per-club performance tables.
+
+        stats are dicts with team_id, transfermarkt_id, starts and minutes_played.
+        Rows are matched by (team_id, transfermarkt_id) and stamped as synced, and
+        teams whose numbers changed are marked dirty. Returns the number of players changed.
+        """
+        if not stats:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                changed = execute_values(cursor, """
+                    UPDATE players p
+                    SET games_started = v.starts,
+                        minutes_played = v.minutes_played,
+                        season_stats_synced_at = CURRENT_TIMESTAMP,
+                        updated_at = CASE
+                            WHEN p.games_started IS DISTINCT FROM v.starts
+                              OR p.minutes_played IS DISTINCT FROM v.minutes_played
+                            THEN CURRENT_TIMESTAMP ELSE p.updated_at END
+                    FROM (VALUES %s) AS v(team_id, transfermarkt_id, starts, minutes_played)
+                    WHERE p.team_id = v.team_id AND p.transfermarkt_id = v.transfermarkt_id
+                    RETURNING p.team_id, p.updated_at = CURRENT_TIMESTAMP AS changed
+                """, [(
+                    s['team_id'], str(s['transfermarkt_id']), s['starts'], s['minutes_played']
+                ) for s in stats if s.get('transfermarkt_id')],
+                    template="(%s::int, %s, %s::int, %s::int)", page_size=1000, fetch=True)
+                
+                changed_teams = {row['team_id'] for row in changed if row['changed']}
+                self._mark_teams_dirty(cursor, changed_teams)
+                conn.commit()
+                return sum(1 for row in changed if row['changed'])
+    
+    def _refresh_player_features(self, cursor, team_ids):
+        """Recompute the rolling feature rows of every player in the given teams"""
+        team_ids = [team_id for team_id in set(team_ids) if team_id]
+        if not team_ids:
+            return
+        cursor.execute("""
+            WITH team_matches AS (
+                SELECT m.id AS match_id, t.team_id,
+                       ROW_NUMBER() OVER (PARTITION BY t.team_id ORDER BY m.match_date DESC, m.id DESC) AS recency
+                FROM matches m
+                CROSS JOIN LATERAL (VALUES (m.home_team_id), (m.away_team_id)) AS t(team_id)
+                WHERE m.lineups_ingested_at IS NOT NULL AND t.team_id = ANY(%s)
+            ), window_matches AS (
+                SELECT match_id, team_id FROM team_matches WHERE recency <= 5
+            ), window_sizes AS (
+                SELECT team_id, COUNT(*) AS match_count FROM window_matches GROUP BY team_id
+            )
+            INSERT INTO player_features (player_id, team_id, starts_last5, minutes_last5, minutes_share_last5,
+                                         last_start_date, last_appearance_date, injury_return_date, updated_at)
+            SELECT p.id, p.team_id,
+                   COUNT(*) FILTER (WHERE pa.started AND wm.match_id IS NOT NULL),
+                   COALESCE(SUM(pa.minutes_played) FILTER (WHERE wm.match_id IS NOT NULL), 0),
+                   COALESCE(SUM(pa.minutes_played) FILTER (WHERE wm.match_id IS NOT NULL), 0) / GREATEST(90.0 * MAX(ws.match_count), 1),
+                   (MAX(m.match_date) FILTER (WHERE pa.started))::date,
+                   MAX(m.match_date)::date,
+                   (SELECT MAX(upper(av.unavailable)) FROM player_availability av
+                    WHERE av.player_id = p.id AND av.superseded_at IS NULL AND av.status_type IN ('injury', 'illness')),
+                   CURRENT_TIMESTAMP
+            FROM players p
+            LEFT JOIN player_appearances pa ON pa.player_id = p.id
+            LEFT JOIN matches m ON m.id = pa.match_id
+            LEFT JOIN window_matches wm ON wm.match_id = pa.match_id AND wm.team_id = p.team_id
+            LEFT JOIN window_sizes ws ON ws.team_id = p.team_id
+            WHERE p.team_id = ANY(%s)
+            GROUP BY p.id, p.team_id
+            ON CONFLICT (player_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                starts_last5 = EXCLUDED.starts_last5,
+                minutes_last5 = EXCLUDED.minutes_last5,
+                minutes_share_last5 = EXCLUDED.minutes_share_last5,
+                last_start_date = EXCLUDED.last_start_date,
+                last_appearance_date = EXCLUDED.last_appearance_date,
+                injury_return_date = EXCLUDED.injury_return_date,
+                updated_at = EXCLUDED.updated_at
+        """, (team_ids, team_ids))
+    
+    def rebuild_player_features(self, team_ids=None):
+        """Recompute the feature store for the given teams, or every team; returns the number of teams rebuilt"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if team_ids is None:
+                    cursor.execute("SELECT id FROM teams")
+                    team_ids = [row['id'] for row in cursor.fetchall()]
+                self._refresh_player_features(cursor, team_ids)
+                self._mark_teams_dirty(cursor, team_ids)
+                conn.commit()
+                return len(team_ids)
+    
+    def get_player_features(self, team_ids):
+        """Read the feature store for many teams as columns: {column: [values aligned by player]}"""
+        if not team_ids:
+            return {}
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT ARRAY_AGG(player_id ORDER BY player_id) AS player_id,
+                           ARRAY_AGG(starts_last5 ORDER BY player_id) AS starts_last5,
+                           ARRAY_AGG(minutes_share_last5 ORDER BY player_id) AS minutes_share_last5,
+                           ARRAY_AGG(last_start_date ORDER BY player_id) AS last_start_date,
+                           ARRAY_AGG(injury_return_date ORDER BY player_id) AS injury_return_date
+                    FROM player_features
+                    WHERE team_id = ANY(%s)
+                """, (list(team_ids),))
+                columns = cursor.fetchone()
+                return dict(columns) if columns and columns['player_id'] else {}
+    
+    def get_backtest_history(self, league_id):
+        """Load everything a season replay needs for one league in a few set-based queries.
+
+        Returns a dict of row lists: ingested matches (with fielded formations),
+        their appearances, the league's players and anyone who appeared in those
+        matches, every availability event (with when it was superseded) and news.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, home_team_id, away_team_id, match_date, matchday, home_formation, away_formation
+                    FROM matches
+                    WHERE league_id = %s AND lineups_ingested_at IS NOT NULL
+                    ORDER BY match_date, id
+                """, (league_id,))
+                matches = cursor.fetchall()
+                match_ids = [m['id'] for m in matches]
+                
+                cursor.execute("""
+                    SELECT match_id, player_id, team_id, started, minutes_played
+                    FROM player_appearances
+                    WHERE match_id = ANY(%s)
+                """, (match_ids,))
+                appearances = cursor.fetchall()
+                
+                # current squads, and players who appeared in the season but have since left the league
+                cursor.execute("""
+                    SELECT p.id, p.team_id, p.name, p.position, p.jersey_number, p.market_value
+                    FROM players p
+                    WHERE p.team_id IN (SELECT id FROM teams WHERE league_id = %s)
+                    OR p.id IN (SELECT player_id FROM player_appearances WHERE match_id = ANY(%s))
+                """, (league_id, match_ids))
+                players = cursor.fetchall()
+                player_ids = [p['id'] for p in players]
+                
+                cursor.execute("""
+                    SELECT player_id, status_type, description, severity, lower(unavailable) AS start_date,
+                           upper(unavailable) AS expected_return_date, recorded_at AS created_at, superseded_at
+                    FROM player_availability
+                    WHERE player_id = ANY(%s)
+                """, (player_ids,))
+                statuses = cursor.fetchall()
+                
+                cursor.execute("""
+                    SELECT nm.team_id, nm.player_id, nm.content, nm.sentiment, nm.relevance_score, nm.published_at
+                    FROM news_mentions nm
+                    JOIN teams t ON t.id = nm.team_id
+                    WHERE t.league_id = %s AND nm.published_at IS NOT NULL
+                """, (league_id,))
+                news = cursor.fetchall()
+                
+                return {
+                    'matches': matches,
+                    'appearances': appearances,
+                    'players': players,
+                    'statuses': statuses,
+                    'news': news
+                }
+    
     def get_upcoming_matches(self, league_id, matchday=None):
         """Get upcoming matches for a league, optionally filtered by matchday"""
         with self.get_connection() as conn:
@@ -337,39 +979,6 @@ class DatabaseManager:
                     """, (league_id,))
                 return cursor.fetchall()
     
-    def get_next_matchday_matches(self, league_id):
-        """Get matches from the next upcoming matchday"""
-        with self.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT MIN(matchday) as next_matchday
-                    FROM matches 
-                    WHERE league_id = %s 
-                    AND match_date > NOW()
-                    AND status = 'scheduled'
-                """, (league_id,))
-                result = cursor.fetchone()
-                
-                if result and result['next_matchday']:
-                    next_matchday = result['next_matchday']
-                    
-                    cursor.execute("""
-                        SELECT m.*, 
-                               ht.name as home_team_name, ht.logo_url as home_team_logo,
-                               at.name as away_team_name, at.logo_url as away_team_logo
-                        FROM matches m
-                        JOIN teams ht ON m.home_team_id = ht.id
-                        JOIN teams at ON m.away_team_id = at.id
-                        WHERE m.league_id = %s 
-                        AND m.matchday = %s
-                        AND m.match_date > NOW()
-                        AND m.status = 'scheduled'
-                        ORDER BY m.match_date ASC
-                    """, (league_id, next_matchday))
-                    return cursor.fetchall()
-                
-                return []
-    
     def get_league_teams_count(self, league_id):
         """Get number of teams in a league"""
         with self.get_connection() as conn:
@@ -381,84 +990,266 @@ class DatabaseManager:
                 return result['team_count'] if result else 0
     
     def insert_player(self, name, team_id, position, transfermarkt_id, jersey_number=None, market_value=None, age=None, nationality=None, contract_end_year=None):
-        """Insert a player into the database"""
+        """Insert a player, or update the existing squad entry if any attribute changed.
+
+        Marks the team's prediction inputs dirty only when the squad actually changed.
+        """
+        fields = {
+            'name': name, 'name_key': player_name_key(name), 'position': position, 'jersey_number': jersey_number,
+            'market_value': market_value, 'age': age, 'nationality': nationality,
+            'contract_end_year': contract_end_year
+        }
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO players (name, team_id, position, transfermarkt_id, jersey_number, market_value, age, nationality, contract_end_year)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT DO NOTHING
-                    RETURNING id
-                """, (name, team_id, position, transfermarkt_id, jersey_number, market_value, age, nationality, contract_end_year))
+                if transfermarkt_id:
+                    cursor.execute("""
+                        SELECT * FROM players WHERE team_id = %s AND transfermarkt_id = %s
+                        ORDER BY id LIMIT 1
+                    """, (team_id, transfermarkt_id))
+                else:
+                    cursor.execute("""
+                        SELECT * FROM players WHERE team_id = %s AND name = %s
+                        ORDER BY id LIMIT 1
+                    """, (team_id, name))
+                existing_player = cursor.fetchone()
+                
+                if existing_player:
+                    changed = {
+                        key: value for key, value in fields.items()
+                        if value is not None and existing_player[key] != value
+                    }
+                    if not changed:
+                        return existing_player['id']
+                    
+                    cursor.execute(f"""
+                        UPDATE players 
+                        SET {', '.join(f"{key} = %s" for key in changed)}, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = %s
+                        RETURNING id
+                    """, list(changed.values()) + [existing_player['id']])
+                else:
+                    cursor.execute("""
+                        INSERT INTO players (name, name_key, team_id, position, transfermarkt_id, jersey_number, market_value, age, nationality, contract_end_year)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        RETURNING id
+                    """, (name, fields['name_key'], team_id, position, transfermarkt_id, jersey_number, market_value, age, nationality, contract_end_year))
                 result = cursor.fetchone()
+                self._mark_teams_dirty(cursor, [team_id])
                 conn.commit()
                 return result['id'] if result else None
     
-    def insert_injury(self, player_id, injury_name, injury_start_date=None, expected_return_date=None, injury_type='injury', severity='moderate', source_url=None):
-        """Insert player injury information"""
+    def get_player_identities(self, team_ids):
+        """Identity rows (id, team, Transfermarkt id, name, name key, market value) for many teams in one query.
+
+        Players saved before name keys existed get theirs computed and stored here.
+        """
+        if not team_ids:
+            return []
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    UPDATE injuries SET is_active = FALSE 
-                    WHERE player_id = %s AND is_active = TRUE
-                """, (player_id,))
+                    SELECT id, team_id, transfermarkt_id, name, name_key, market_value
+                    FROM players
+                    WHERE team_id = ANY(%s)
+                """, (list(team_ids),))
+                players = cursor.fetchall()
                 
-                cursor.execute("""
-                    INSERT INTO injuries (player_id, injury_name, injury_start_date, expected_return_date, injury_type, severity, source_url)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (player_id, injury_name, injury_start_date, expected_return_date, injury_type, severity, source_url))
-                result = cursor.fetchone()
-                conn.commit()
-                return result['id'] if result else None
+                missing = [(player['id'], player_name_key(player['name'])) for player in players if not player['name_key']]
+                if missing:
+                    execute_values(cursor, """
+                        UPDATE players p SET name_key = v.name_key
+                        FROM (VALUES %s) AS v(id, name_key)
+                        WHERE p.id = v.id
+                    """, missing, page_size=1000)
+                    conn.commit()
+                    for player in players:
+                        player['name_key'] = player['name_key'] or player_name_key(player['name'])
+                return players
+    
+    def insert_injury(self, player_id, injury_name, injury_start_date=None, expected_return_date=None, injury_type='injury', severity='moderate', source_url=None):
+        """Record a player injury on the availability timeline"""
+        return self.update_player_status(player_id, injury_type, injury_name, start_date=injury_start_date,
+                                         expected_return_date=expected_return_date, severity=severity, source_url=source_url)
     
     def get_player_injuries(self, player_id):
-        """Get active injuries for a player"""
+        """Get a player's current availability events that have not ended yet"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT * FROM injuries 
-                    WHERE player_id = %s AND is_active = TRUE
-                    ORDER BY created_at DESC
+                    SELECT id, player_id, status_type, description, severity, lower(unavailable) AS start_date,
+                           upper(unavailable) AS expected_return_date, source, source_url, recorded_at
+                    FROM player_availability
+                    WHERE player_id = %s AND superseded_at IS NULL
+                    AND (upper_inf(unavailable) OR upper(unavailable) > CURRENT_DATE)
+                    ORDER BY recorded_at DESC
                 """, (player_id,))
                 return cursor.fetchall()
     
     def get_team_injured_players(self, team_id):
-        """Get all injured players for a team"""
+        """Get all players of a team who are unavailable today"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT p.*, i.injury_name, i.expected_return_date, i.injury_type, i.severity
+                    SELECT p.*, pa.status_type, pa.description, pa.severity, lower(pa.unavailable) AS start_date,
+                           upper(pa.unavailable) AS expected_return_date
                     FROM players p
-                    JOIN injuries i ON p.id = i.player_id
-                    WHERE p.team_id = %s 
-                    AND (i.expected_return_date IS NULL OR i.expected_return_date > CURRENT_DATE)
-                    AND i.actual_return_date IS NULL
-                    ORDER BY i.expected_return_date ASC
+                    JOIN player_availability pa ON p.id = pa.player_id
+                    WHERE p.team_id = %s AND pa.superseded_at IS NULL
+                    AND pa.unavailable @> CURRENT_DATE
+                    ORDER BY upper(pa.unavailable) ASC NULLS LAST
                 """, (team_id,))
                 return cursor.fetchall()
     
-    def update_player_status(self, player_id, status_type, description, start_date=None, expected_return_date=None, severity=None, source_url=None):
-        """Update player status (injury, suspension, etc.)"""
+    def _availability_bounds(self, start_date, expected_return_date):
+        """Normalise reported dates to the bounds stored in the unavailable range (see AVAILABILITY_RANGE_SQL)"""
+        start_date, expected_return_date = [
+            date.fromisoformat(value[:10]) if isinstance(value, str) else value
+            for value in (start_date, expected_return_date)
+        ]
+        if start_date is not None and expected_return_date is not None and start_date >= expected_return_date:
+            start_date = None
+        return start_date, expected_return_date
+    
+    def _record_availability(self, cursor, events, source, snapshot_team_ids=()):
+        """Append availability events, superseding the current event of the same player, type and source.
+
+        Re-reporting an unchanged event is a no-op. Should a key have several
+        current events, the older ones are superseded as well. For snapshot_team_ids the events
+        are the source's full list for those teams: current events from the same
+        source for players no longer listed are closed at today's date. Returns the
+        event id for each input event and the number of events recorded.
+        """
+        player_ids = sorted({event['player_id'] for event in events})
+        cursor.execute("""
+            SELECT pa.id, pa.player_id, p.team_id, pa.status_type, pa.description, pa.severity,
+                   lower(pa.unavailable) AS start_date, upper(pa.unavailable) AS expected_return_date, pa.source_url
+            FROM player_availability pa
+            JOIN players p ON p.id = pa.player_id
+            WHERE pa.superseded_at IS NULL AND pa.source IS NOT DISTINCT FROM %s
+            AND (pa.player_id = ANY(%s) OR p.team_id = ANY(%s))
+            ORDER BY pa.recorded_at, pa.id
+        """, (source, player_ids, list(snapshot_team_ids)))
+        current, superseded, changed_teams, injury_teams = {}, [], set(), set()
+        for row in cursor.fetchall():
+            key = (row['player_id'], row['status_type'])
+            if key in current:
+                superseded.append(current[key]['id'])
+                changed_teams.add(row['team_id'])
+                if row['status_type'] in INJURY_STATUS_TYPES:
+                    injury_teams.add(row['team_id'])
+            current[key] = row
+        
+        cursor.execute("SELECT id, team_id FROM players WHERE id = ANY(%s)", (player_ids,))
+        player_teams = {row['id']: row['team_id'] for row in cursor.fetchall()}
+        
+        event_ids, new_rows, new_positions = [None] * len(events), [], []
+        for position, event in enumerate(events):
+            key = (event['player_id'], event['status_type'])
+            start_date, expected_return_date = self._availability_bounds(event.get('start_date'), event.get('expected_return_date'))
+            previous = current.pop(key, None)
+            if previous and (previous['description'], previous['severity'], previous['start_date'], previous['expected_return_date']) == (
+                    event.get('description'), event.get('severity'), start_date, expected_return_date):
+                event_ids[position] = previous['id']
+                continue
+            if previous:
+                superseded.append(previous['id'])
+            new_positions.append(position)
+            new_rows.append((event['player_id'], event['status_type'], event.get('description'), event.get('severity'),
+                             start_date, expected_return_date, source, event.get('source_url')))
+            changed_teams.add(player_teams.get(event['player_id']))
+            if event['status_type'] in INJURY_STATUS_TYPES:
+                injury_teams.add(player_teams.get(event['player_id']))
+        
+        today = date.today()
+        for row in current.values():
+            if row['team_id'] not in snapshot_team_ids or (row['expected_return_date'] and row['expected_return_date'] <= today):
+                continue
+            start_date, expected_return_date = self._availability_bounds(row['start_date'], today)
+            superseded.append(row['id'])
+            new_rows.append((row['player_id'], row['status_type'], row['description'], row['severity'],
+                             start_date, expected_return_date, source, row['source_url']))
+            changed_teams.add(row['team_id'])
+            if row['status_type'] in INJURY_STATUS_TYPES:
+                injury_teams.add(row['team_id'])
+        
+        if superseded:
+            cursor.execute("""
+                UPDATE player_availability SET superseded_at = CURRENT_TIMESTAMP WHERE id = ANY(%s)
+            """, (superseded,))
+        if new_rows:
+            inserted = execute_values(cursor, """
+                INSERT INTO player_availability (player_id, status_type, description, severity, unavailable, source, source_url)
+                VALUES %s
+                RETURNING id
+            """, new_rows, template="(%s, %s, %s, %s, daterange(%s::date, %s::date, '[)'), %s, %s)", fetch=True)
+            for position, row in zip(new_positions, inserted):
+                event_ids[position] = row['id']
+        
+        self._refresh_player_features(cursor, injury_teams)
+        self._mark_teams_dirty(cursor, [team_id for team_id in changed_teams if team_id])
+        return event_ids, len(new_rows)
+    
+    def update_player_status(self, player_id, status_type, description, start_date=None, expected_return_date=None, severity=None, source_url=None, source='manual'):
+        """Record a player status (injury, suspension, etc.); re-reporting an unchanged status is a no-op"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE player_status 
-                    SET is_active = FALSE 
-                    WHERE player_id = %s AND status_type = %s AND is_active = TRUE
-                """, (player_id, status_type))
-                
-                cursor.execute("""
-                    INSERT INTO player_status (player_id, status_type, description, start_date, expected_return_date, severity, source_url)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (player_id, status_type, description, start_date, expected_return_date, severity, source_url))
-                result = cursor.fetchone()
+                event_ids, _ = self._record_availability(cursor, [{
+                    'player_id': player_id,
+                    'status_type': status_type,
+                    'description': description,
+                    'start_date': start_date,
+                    'expected_return_date': expected_return_date,
+                    'severity': severity,
+                    'source_url': source_url
+                }], source)
                 conn.commit()
-                return result['id'] if result else None
+                return event_ids[0]
+    
+    def sync_team_availability(self, team_id, events, source):
+        """Apply one source's full availability list for a team in a single transaction.
+
+        Changed events are recorded, unchanged ones left alone, and players the
+        source no longer lists get their open event closed at today's date.
+        Returns the number of events recorded, including closures.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                _, recorded = self._record_availability(cursor, events, source, snapshot_team_ids=(team_id,))
+                conn.commit()
+                return recorded
+    
+    def get_availability_at_kickoff(self, team_kickoffs):
+        """Availability events that matter for each team's kickoff, for a whole matchday in one range query.
+
+        team_kickoffs maps team_id to kickoff. An event counts when its unavailable
+        range overlaps the KICKOFF_LOOKBACK_DAYS before kickoff, so players due back
+        just before the match are still reported. Returns {player_id: [status, ...]}.
+        """
+        if not team_kickoffs:
+            return {}
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                rows = execute_values(cursor, f"""
+                    SELECT pa.player_id, pa.status_type, pa.description, pa.severity,
+                           lower(pa.unavailable) AS start_date, upper(pa.unavailable) AS expected_return_date
+                    FROM (VALUES %s) AS k(team_id, kickoff_date)
+                    JOIN players p ON p.team_id = k.team_id
+                    JOIN player_availability pa ON pa.player_id = p.id
+                    WHERE pa.superseded_at IS NULL
+                    AND pa.unavailable && daterange(k.kickoff_date - {KICKOFF_LOOKBACK_DAYS}, k.kickoff_date, '[]')
+                    ORDER BY pa.player_id, pa.recorded_at
+                """, [(team_id, kickoff) for team_id, kickoff in team_kickoffs.items()],
+                    template="(%s::int, %s::date)", fetch=True)
+                
+                statuses = {}
+                for row in rows:
+                    statuses.setdefault(row['player_id'], []).append(
+                        {key: value for key, value in row.items() if key != 'player_id'}
+                    )
+                return statuses
     
     def get_team_players(self, team_id):
-        """Get all players for a team"""
+        """Get all players for a team with the statuses keeping them out today"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
@@ -466,24 +1257,268 @@ class DatabaseManager:
                            COALESCE(
                                JSON_AGG(
                                    JSON_BUILD_OBJECT(
-                                       'status_type', ps.status_type,
-                                       'description', ps.description,
-                                       'severity', ps.severity,
-                                       'expected_return_date', ps.expected_return_date
+                                       'status_type', pa.status_type,
+                                       'description', pa.description,
+                                       'severity', pa.severity,
+                                       'start_date', lower(pa.unavailable),
+                                       'expected_return_date', upper(pa.unavailable)
                                    )
-                               ) FILTER (WHERE ps.is_active = TRUE), 
+                               ) FILTER (WHERE pa.id IS NOT NULL), 
                                '[]'
                            ) as current_status
                     FROM players p
-                    LEFT JOIN player_status ps ON p.id = ps.player_id AND ps.is_active = TRUE
+                    LEFT JOIN player_availability pa ON p.id = pa.player_id 
+                         AND pa.superseded_at IS NULL AND pa.unavailable @> CURRENT_DATE
                     WHERE p.team_id = %s
                     GROUP BY p.id
                     ORDER BY p.position, p.jersey_number
                 """, (team_id,))
                 return cursor.fetchall()
     
-    def save_lineup_prediction(self, match_id, team_id, formation, predicted_lineup, alternative_players=None, confidence_score=None, reasoning=None, sources=None):
-        """Save lineup prediction"""
+    def get_squads_for_teams(self, team_ids):
+        """Get players for many teams in one query; statuses come from get_availability_at_kickoff"""
+        if not team_ids:
+            return []
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT p.* FROM players p
+                    WHERE p.team_id = ANY(%s)
+                    ORDER BY p.team_id, p.position, p.jersey_number
+                """, (list(team_ids),))
+                return cursor.fetchall()
+    
+    def get_player_evidence(self, player_ids, days=7, limit=NEWS_EVIDENCE_LIMIT):
+        """Top recent news mentions about each player, for many players in one query.
+
+        A mention of the player's team is evidence when it is linked to the
+        player or its text matches the player's surname (full-text, any league
+        language). Each player gets at most limit mentions, ranked by text
+        relevance, direct link, relevance_score and age; rows carry
+        evidence_player_id and evidence_rank next to the mention's columns.
+        """
+        if not player_ids:
+            return []
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT e.*
+                    FROM players p
+                    CROSS JOIN LATERAL (
+                        SELECT CASE WHEN length(s.surname) >= 4 THEN {SURNAME_TSQUERY_SQL.format(surname='s.surname')} END AS query
+                        FROM (SELECT lower((regexp_match(p.name, '(\\S+)\\s*$'))[1]) AS surname) s
+                    ) q
+                    CROSS JOIN LATERAL (
+                        SELECT nm.id, nm.team_id, nm.player_id, nm.source_type, nm.source_url, nm.author, nm.content,
+                               nm.sentiment, nm.relevance_score, nm.published_at, p.id AS evidence_player_id,
+                               (COALESCE(ts_rank(nm.search_vector, q.query), 0) + CASE WHEN nm.player_id = p.id THEN 1 ELSE 0 END)
+                               * COALESCE(nm.relevance_score, 1)
+                               / (1 + EXTRACT(EPOCH FROM NOW() - nm.published_at) / 86400) AS evidence_rank
+                        FROM news_mentions nm
+                        WHERE nm.team_id = p.team_id
+                        AND nm.published_at >= NOW() - make_interval(days => %s)
+                        AND (nm.player_id = p.id OR nm.search_vector @@ q.query)
+                        ORDER BY evidence_rank DESC, nm.published_at DESC
+                        LIMIT %s
+                    ) e
+                    WHERE p.id = ANY(%s)
+                """, (days, limit, list(player_ids)))
+                return cursor.fetchall()
+    
+    def save_news_mentions(self, mentions):
+        """Insert routed news mentions in one statement, skipping stories a team already has.
+
+        mentions are dicts with team_id, player_id, source_type, source_url, author,
+        content, published_at and optionally the source's language code. A story is identified by the hash of its
+        normalised text and URL. Teams that got new mentions are marked dirty;
+        returns the number of rows inserted.
+        """
+        if not mentions:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                inserted = execute_values(cursor, f"""
+                    INSERT INTO news_mentions (team_id, player_id, source_type, source_url, author, content, published_at,
+                                               content_hash, search_config)
+                    SELECT DISTINCT ON (v.team_id, v.content_hash) v.*
+                    FROM (
+                        SELECT v.team_id, v.player_id, v.source_type, v.source_url, v.author, v.content, v.published_at,
+                               {NEWS_CONTENT_HASH_SQL.format(content='v.content', url='v.source_url')} AS content_hash,
+                               COALESCE(v.search_config, (
+                                   SELECT {LEAGUE_SEARCH_CONFIG_SQL.format(transfermarkt_id='l.transfermarkt_id')}
+                                   FROM teams t JOIN leagues l ON l.id = t.league_id
+                                   WHERE t.id = v.team_id
+                               ), 'simple')::regconfig AS search_config
+                        FROM (VALUES %s) AS v(team_id, player_id, source_type, source_url, author, content, published_at, search_config)
+                    ) v
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM news_mentions nm WHERE nm.team_id = v.team_id AND nm.content_hash = v.content_hash
+                    )
+                    ON CONFLICT (team_id, content_hash) DO NOTHING
+                    RETURNING team_id
+                """, [(
+                    m['team_id'], m.get('player_id'), m['source_type'], m['source_url'],
+                    m.get('author'), m['content'], m['published_at'],
+                    SEARCH_CONFIGS_BY_LANGUAGE.get((m.get('language') or '')[:2].lower())
+                ) for m in mentions],
+                    template="(%s::int, %s::int, %s, %s, %s, %s, %s::timestamp, %s)", page_size=1000, fetch=True)
+                
+                self._mark_teams_dirty(cursor, {row['team_id'] for row in inserted})
+                conn.commit()
+                return len(inserted)
+    
+    def get_unscored_news_mentions(self, limit):
+        """Oldest mentions without a sentiment yet, at most limit of them"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, content, search_config::text AS search_config
+                    FROM news_mentions
+                    WHERE sentiment IS NULL
+                    ORDER BY id
+                    LIMIT %s
+                """, (limit,))
+                return cursor.fetchall()
+    
+    def save_news_scores(self, scores):
+        """Write (mention_id, sentiment, relevance_score) rows back in one statement and mark their teams dirty"""
+        if not scores:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                updated = execute_values(cursor, """
+                    UPDATE news_mentions nm SET sentiment = v.sentiment, relevance_score = v.relevance_score
+                    FROM (VALUES %s) AS v(id, sentiment, relevance_score)
+                    WHERE nm.id = v.id
+                    RETURNING nm.team_id
+                """, scores, template="(%s::int, %s, %s::float)", page_size=1000, fetch=True)
+                
+                self._mark_teams_dirty(cursor, {row['team_id'] for row in updated if row['team_id']})
+                conn.commit()
+    
+    def compact_news_mentions(self):
+        """Hash legacy mentions, delete duplicate stories per team and enforce uniqueness from then on.
+
+        Of each duplicate group the row linked to a player is kept, else the
+        oldest. Teams that lost rows are marked dirty; returns the number of
+        rows deleted.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                deleted = self._compact_news_mentions(cursor)
+                conn.commit()
+                return deleted
+    
+    def _compact_news_mentions(self, cursor):
+        """Hash unhashed mentions, delete duplicates and create the unique story index; init_database runs
+        this once before any writer relies on the index, the daily job afterwards catches stragglers"""
+        # duplicates go first, ranked on the hash unhashed rows will get, so hashing never hits the unique index
+        cursor.execute(f"""
+            DELETE FROM news_mentions nm
+            USING (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY team_id, COALESCE(content_hash, {NEWS_CONTENT_HASH_SQL.format(content='content', url='source_url')})
+                    ORDER BY player_id IS NULL, id
+                ) AS rank
+                FROM news_mentions
+            ) ranked
+            WHERE nm.id = ranked.id AND ranked.rank > 1
+            RETURNING nm.team_id
+        """)
+        deleted = cursor.fetchall()
+        
+        cursor.execute(f"""
+            UPDATE news_mentions SET content_hash = {NEWS_CONTENT_HASH_SQL.format(content='content', url='source_url')}
+            WHERE content_hash IS NULL
+        """)
+        hashed = cursor.rowcount
+        
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_news_mentions_team_content 
+            ON news_mentions(team_id, content_hash)
+        """)
+        
+        self._mark_teams_dirty(cursor, {row['team_id'] for row in deleted if row['team_id']})
+        logger.info(f"🧹 News compaction: hashed {hashed} mentions, removed {len(deleted)} duplicates")
+        return len(deleted)
+    
+    def get_journalist_cursors(self, handles):
+        """Newest ingested post id per journalist handle (None for handles never polled)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT handle, since_id FROM journalist_cursors WHERE handle = ANY(%s)
+                """, (list(handles),))
+                known = {row['handle']: row['since_id'] for row in cursor.fetchall()}
+                return {handle: known.get(handle) for handle in handles}
+    
+    def save_journalist_cursors(self, cursors, posts):
+        """Store each handle's cursor after a poll, with the time of its newest ingested post"""
+        last_post_at = {}
+        for post in posts:
+            last_post_at[post['handle']] = max(post['created_at'], last_post_at.get(post['handle'], post['created_at']))
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                execute_values(cursor, """
+                    INSERT INTO journalist_cursors (handle, since_id, last_post_at, last_polled_at)
+                    VALUES %s
+                    ON CONFLICT (handle) DO UPDATE SET
+                        since_id = COALESCE(EXCLUDED.since_id, journalist_cursors.since_id),
+                        last_post_at = COALESCE(EXCLUDED.last_post_at, journalist_cursors.last_post_at),
+                        last_polled_at = EXCLUDED.last_polled_at
+                """, [(handle, since_id, last_post_at.get(handle)) for handle, since_id in cursors.items()],
+                    template="(%s, %s, %s::timestamp, CURRENT_TIMESTAMP)")
+                conn.commit()
+    
+    def save_lineup_predictions_bulk(self, predictions):
+        """Replace the predictions for many (match, team) pairs in one transaction"""
+        if not predictions:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                execute_values(cursor, """
+                    DELETE FROM lineup_predictions lp
+                    USING (VALUES %s) AS v(match_id, team_id)
+                    WHERE lp.match_id = v.match_id AND lp.team_id = v.team_id
+                """, [(p['match_id'], p['team_id']) for p in predictions])
+                
+                execute_values(cursor, """
+                    DELETE FROM prediction_failures pf
+                    USING (VALUES %s) AS v(match_id, team_id)
+                    WHERE pf.match_id = v.match_id AND pf.team_id = v.team_id
+                """, [(p['match_id'], p['team_id']) for p in predictions])
+                
+                execute_values(cursor, """
+                    INSERT INTO lineup_predictions (match_id, team_id, formation, predicted_lineup, alternative_players, 
+                                                    unavailable_players, confidence_score, reasoning, sources, input_version)
+                    VALUES %s
+                """, [(
+                    p['match_id'], p['team_id'], p['formation'],
+                    json.dumps(p['starting_xi']),
+                    json.dumps(p['alternatives']) if p.get('alternatives') else None,
+                    json.dumps(p['unavailable_players']) if p.get('unavailable_players') else None,
+                    p.get('confidence_score'), p.get('reasoning'),
+                    json.dumps(p['sources']) if p.get('sources') else None,
+                    p.get('input_version')
+                ) for p in predictions], page_size=500)
+                conn.commit()
+        self._predictions_saved([(p['match_id'], p['team_id']) for p in predictions])
+        return len(predictions)
+    
+    def _prediction_payload(self, row):
+        """Expose a stored prediction row under the keys the predictor returns"""
+        if not row:
+            return row
+        formation = row.get('formation')
+        if formation and formation.startswith('"'):
+            row['formation'] = json.loads(formation)
+        row['starting_xi'] = row.get('predicted_lineup') or []
+        row['alternatives'] = row.get('alternative_players') or []
+        row['unavailable_players'] = row.get('unavailable_players') or []
+        return row
+    
+    def save_lineup_prediction(self, match_id, team_id, formation, predicted_lineup, alternative_players=None, confidence_score=None, reasoning=None, sources=None, input_version=None):
+        """Save lineup prediction, recording the team input version it was built from (current version if not given)"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
@@ -492,15 +1527,18 @@ class DatabaseManager:
                 """, (match_id, team_id))
                 
                 cursor.execute("""
-                    INSERT INTO lineup_predictions (match_id, team_id, formation, predicted_lineup, alternative_players, confidence_score, reasoning, sources)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    INSERT INTO lineup_predictions (match_id, team_id, formation, predicted_lineup, alternative_players, confidence_score, reasoning, sources, input_version)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 
+                            COALESCE(%s, (SELECT version FROM team_input_versions WHERE team_id = %s), 0))
                     RETURNING id
                 """, (match_id, team_id, json.dumps(formation), json.dumps(predicted_lineup), 
                       json.dumps(alternative_players) if alternative_players else None,
-                      confidence_score, reasoning, json.dumps(sources) if sources else None))
+                      confidence_score, reasoning, json.dumps(sources) if sources else None,
+                      input_version, team_id))
                 result = cursor.fetchone()
                 conn.commit()
-                return result['id'] if result else None
+        self._predictions_saved([(match_id, team_id)])
+        return result['id'] if result else None
     
     def get_lineup_prediction(self, match_id, team_id):
         """Get lineup prediction for a match and team"""
@@ -512,8 +1550,133 @@ class DatabaseManager:
                     ORDER BY updated_at DESC
                     LIMIT 1
                 """, (match_id, team_id))
+                return self._prediction_payload(cursor.fetchone())
+    
+    def get_lineup_prediction_version(self, match_id, team_id):
+        """id, input_version and updated_at of the prediction get_lineup_prediction would return, or None"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, input_version, updated_at FROM lineup_predictions 
+                    WHERE match_id = %s AND team_id = %s
+                    ORDER BY updated_at DESC
+                    LIMIT 1
+                """, (match_id, team_id))
                 return cursor.fetchone()
     
+    def _mark_teams_dirty(self, cursor, team_ids):
+        """Bump the prediction input version of teams whose squad, status, news or fixtures changed"""
+        team_ids = [team_id for team_id in set(team_ids) if team_id]
+        if not team_ids:
+            return
+        cursor.execute("""
+            INSERT INTO team_input_versions (team_id)
+            SELECT UNNEST(%s::int[])
+            ON CONFLICT (team_id) DO UPDATE SET
+                version = team_input_versions.version + 1,
+                changed_at = CURRENT_TIMESTAMP
+        """, (team_ids,))
+    
+    def mark_teams_dirty(self, team_ids):
+        """Mark teams' prediction inputs as changed"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._mark_teams_dirty(cursor, team_ids)
+                conn.commit()
+    
+    def get_team_input_version(self, team_id):
+        """Get the current prediction input version for a team (0 if never changed)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT version FROM team_input_versions WHERE team_id = %s
+                """, (team_id,))
+                result = cursor.fetchone()
+                return result['version'] if result else 0
+    
+    def get_dirty_prediction_pairs(self, match_ids, include_current=False):
+        """Get (match, team) pairs whose prediction is missing or older than the team's inputs.
+
+        Pairs that could not be predicted from the team's current inputs (see
+        record_prediction_failures) wait for those inputs to change. With
+        include_current=True every pair is returned, still tagged with its input version.
+        """
+        if not match_ids:
+            return []
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT sides.match_id, sides.team_id, sides.match_date, COALESCE(v.version, 0) as input_version
+                    FROM (
+                        SELECT id as match_id, home_team_id as team_id, match_date FROM matches WHERE id = ANY(%s)
+                        UNION ALL
+                        SELECT id as match_id, away_team_id as team_id, match_date FROM matches WHERE id = ANY(%s)
+                    ) sides
+                    LEFT JOIN team_input_versions v ON v.team_id = sides.team_id
+                    LEFT JOIN LATERAL (
+                        SELECT input_version FROM lineup_predictions lp
+                        WHERE lp.match_id = sides.match_id AND lp.team_id = sides.team_id
+                        ORDER BY lp.updated_at DESC
+                        LIMIT 1
+                    ) lp ON TRUE
+                    LEFT JOIN prediction_failures pf ON pf.match_id = sides.match_id AND pf.team_id = sides.team_id
+                    WHERE %s OR (
+                        (lp.input_version IS NULL OR lp.input_version < COALESCE(v.version, 0))
+                        AND (pf.input_version IS NULL OR pf.input_version < COALESCE(v.version, 0))
+                    )
+                    ORDER BY sides.match_date, sides.match_id
+                """, (list(match_ids), list(match_ids), include_current))
+                return cursor.fetchall()
+    
+    def get_current_lineup_prediction(self, match_id, team_id):
+        """Get the lineup prediction for a match and team only if it was built from the team's current inputs"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT lp.* FROM lineup_predictions lp
+                    LEFT JOIN team_input_versions v ON v.team_id = lp.team_id
+                    WHERE lp.match_id = %s AND lp.team_id = %s
+                    AND lp.input_version >= COALESCE(v.version, 0)
+                    ORDER BY lp.updated_at DESC
+                    LIMIT 1
+                """, (match_id, team_id))
+                return self._prediction_payload(cursor.fetchone())
+    
+    def record_prediction_failures(self, pairs):
+        """Stamp pairs that yielded no prediction with their input version, so they are not rebuilt every cycle"""
+        if not pairs:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                execute_values(cursor, """
+                    INSERT INTO prediction_failures (match_id, team_id, input_version)
+                    VALUES %s
+                    ON CONFLICT (match_id, team_id) DO UPDATE SET
+                        input_version = EXCLUDED.input_version,
+                        failed_at = CURRENT_TIMESTAMP
+                """, [(p['match_id'], p['team_id'], p.get('input_version') or 0) for p in pairs])
+                conn.commit()
+        return len(pairs)
+    
+    def stamp_prediction_input_version(self, match_id, team_id, input_version):
+        """Record the input version a freshly computed prediction was built from"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE lineup_predictions SET input_version = %s
+                    WHERE match_id = %s AND team_id = %s
+                """, (input_version, match_id, team_id))
+                conn.commit()
+        self._predictions_saved([(match_id, team_id)])
+    
+    def _predictions_saved(self, pairs):
+        """Tell listeners (e.g. the bot's render cache) which predictions changed"""
+        for listener in self.prediction_listeners:
+            try:
+                listener(pairs)
+            except Exception as e:
+                logger.error(f"Error notifying prediction listener: {e}")
+    
     def update_user_session(self, telegram_user_id, **kwargs):
         """Update user session data"""
         with self.get_connection() as conn:
@@ -547,7 +1710,7 @@ class DatabaseManager:
                 return cursor.fetchone()
     
     def insert_player_status(self, player_id, status_type, description, expected_return=None, source_url=None):
-        """Insert player status for injury/suspension tracking"""
+        """Record a player status on the availability timeline"""
         return self.update_player_status(player_id, status_type, description, 
                                        expected_return_date=expected_return, source_url=source_url)
     
@@ -577,38 +1740,6 @@ class DatabaseManager:
                 """, (team_name,))
                 return cursor.fetchone()
     
-    def find_team_by_alias(self, alias, league_id=None):
-        """Find team by alias"""
-        with self.get_connection() as conn:
-            with conn.cursor() as cursor:
-                if league_id:
-                    cursor.execute("""
-                        SELECT t.* FROM teams t
-                        JOIN club_aliases ca ON t.id = ca.team_id
-                        WHERE LOWER(ca.alias_name) = LOWER(%s) AND t.league_id = %s
-                        LIMIT 1
-                    """, (alias, league_id))
-                else:
-                    cursor.execute("""
-                        SELECT t.* FROM teams t
-                        JOIN club_aliases ca ON t.id = ca.team_id
-                        WHERE LOWER(ca.alias_name) = LOWER(%s)
-                        LIMIT 1
-                    """, (alias,))
-                return cursor.fetchone()
-    
-    def get_player_injuries(self, player_id):
-        """Get current injuries for a player"""
-        with self.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT * FROM injuries 
-                    WHERE player_id = %s 
-                    AND (actual_return_date IS NULL OR actual_return_date > CURRENT_DATE)
-                    ORDER BY created_at DESC
-                """, (player_id,))
-                return cursor.fetchall()
-    
     def get_next_matchday_matches(self, league_id):
         """Get matches for the next matchday in a league"""
         with self.get_connection() as conn:
@@ -635,6 +1766,6 @@ class DatabaseManager:
                     JOIN teams at ON m.away_team_id = at.id
                     WHERE m.league_id = %s AND m.matchday = %s
                     AND m.match_date >= CURRENT_DATE
-                    ORDER BY m.match_date, m.match_time
+                    ORDER BY m.match_date, m.id
                 """, (league_id, next_matchday))
                 return cursor.fetchall()
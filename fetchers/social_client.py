@@ -0,0 +1,109 @@
+import requests
+import logging
+from datetime import datetime
+from config import TWITTER_API_BASE_URL, TWITTER_BEARER_TOKEN, SOCIAL_QUERY_MAX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = '/2/tweets/search/recent'
+PAGE_SIZE = 100
+MAX_PAGES = 10  # per batch and poll; a burst beyond this drops its oldest posts
+
+class JournalistTimelineClient:
+    """Pulls new posts of many accounts through the recent-search endpoint.
+
+    Accounts are packed into as few "from:a OR from:b" queries as the query
+    length limit allows, and each query starts at the oldest cursor of its
+    accounts, so a poll costs one request per batch and page of new posts
+    rather than one per account.
+    """
+    def __init__(self, base_url=None, bearer_token=None, max_query_length=SOCIAL_QUERY_MAX_LENGTH):
+        self.base_url = (base_url or TWITTER_API_BASE_URL).rstrip('/')
+        self.max_query_length = max_query_length
+        self.session = requests.Session()
+        self.bearer_token = bearer_token or TWITTER_BEARER_TOKEN
+        self.session.headers.update({'Authorization': f"Bearer {self.bearer_token}"})
+        self.requests_made = 0
+    
+    def batches(self, handles):
+        """Split handles into groups whose search query fits the length limit"""
+        batches, current = [], []
+        for handle in handles:
+            if current and len(self._query(current + [handle])) > self.max_query_length:
+                batches.append(current)
+                current = []
+            current.append(handle)
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _query(self, handles):
+        return f"({' OR '.join(f'from:{handle}' for handle in handles)}) -is:retweet"
+    
+    def fetch_new_posts(self, cursors):
+        """Fetch posts newer than each account's cursor.
+
+        cursors maps handle to the id of the newest post already ingested (None
+        for a first poll). Returns the new posts, deduplicated by id and oldest
+        first, as dicts with id, handle, text, url, language and created_at, plus the
+        advanced cursors. Every account of a batch moves to the newest id the
+        batch returned, so quiet accounts do not drag the next query back.
+        """
+        posts = {}
+        new_cursors = dict(cursors)
+        lowered = {handle.lower(): handle for handle in cursors}
+        for batch in self.batches(list(cursors)):
+            since_ids = [cursors[handle] for handle in batch]
+            params = {
+                'query': self._query(batch),
+                'max_results': PAGE_SIZE,
+                'tweet.fields': 'created_at,author_id,lang',
+                'expansions': 'author_id',
+                'user.fields': 'username'
+            }
+            if all(since_ids):
+                params['since_id'] = min(since_ids, key=int)
+            
+            batch_newest = None
+            for page in self._pages(params):
+                usernames = {user['id']: user['username'] for user in page.get('includes', {}).get('users', [])}
+                for post in page.get('data', []):
+                    batch_newest = max(int(post['id']), batch_newest or 0)
+                    handle = lowered.get(usernames.get(post.get('author_id'), '').lower())
+                    if handle is None or (cursors[handle] and int(post['id']) <= int(cursors[handle])):
+                        continue
+                    posts[post['id']] = {
+                        'id': post['id'],
+                        'handle': handle,
+                        'text': post.get('text', ''),
+                        'url': f"https://x.com/{handle}/status/{post['id']}",
+                        'language': post.get('lang'),
+                        'created_at': self._created_at(post.get('created_at'))
+                    }
+            
+            if batch_newest is not None:
+                for handle in batch:
+                    if not cursors[handle] or int(cursors[handle]) < batch_newest:
+                        new_cursors[handle] = str(batch_newest)
+        return sorted(posts.values(), key=lambda post: int(post['id'])), new_cursors
+    
+    def _pages(self, params):
+        """Follow next_token pagination of one search query"""
+        params = dict(params)
+        for _ in range(MAX_PAGES):
+            self.requests_made += 1
+            response = self.session.get(f"{self.base_url}{SEARCH_PATH}", params=params, timeout=15)
+            response.raise_for_status()
+            page = response.json()
+            yield page
+            next_token = page.get('meta', {}).get('next_token')
+            if not next_token:
+                return
+            params['next_token'] = next_token
+        logger.warning(f"⚠️ Search stopped after {MAX_PAGES} pages, older posts of this poll are skipped")
+    
+    def _created_at(self, value):
+        """API timestamp as a naive local datetime, like the rest of the database"""
+        if not value:
+            return datetime.now()
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone().replace(tzinfo=None)
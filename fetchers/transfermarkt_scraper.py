@@ -12,6 +12,28 @@ from selenium.webdriver.support import expected_conditions as EC
 
 logger = logging.getLogger(__name__)
 
+MATCH_LENGTH_MINUTES = 90
+EVENT_CLOCK_CELL_PX = 36  # match report event minutes are drawn from a 10-column sprite of 36px cells
+
+# Header titles identifying the columns read from squad and performance tables
+SQUAD_COLUMNS = {
+    'birth': ('date of birth', 'age'),
+    'nationality': ('nat',),
+    'contract': ('contract',),
+    'market_value': ('market value',)
+}
+PERFORMANCE_COLUMNS = {
+    'appearances': ('appearances',),
+    'substitutions_on': ('substitutions on', 'substituted on'),
+    'minutes_played': ('minutes played',)
+}
+INJURY_COLUMNS = {
+    'injury': ('injury',),
+    'since': ('since', 'from'),
+    'until': ('until', 'expected return')
+}
+INJURY_DATE_FORMATS = ('%b %d, %Y', '%d/%m/%Y', '%d.%m.%Y')  # '?' or 'unknown' means no date
+
 class TransfermarktScraper:
     def __init__(self):
         self.base_url = "https://www.transfermarkt.com"
@@ -460,9 +482,9 @@ class TransfermarktScraper:
             return []
 
     def scrape_team_squad(self, team_id):
-        """Scrape team squad information"""
+        """Scrape a team's squad from the detailed view, which carries age, nationality and contract per player"""
         try:
-            url = f"{self.base_url}/verein/kader/verein/{team_id}"
+            url = f"{self.base_url}/verein/kader/verein/{team_id}/plus/1"
             
             driver = self.get_driver()
             driver.get(url)
@@ -474,12 +496,17 @@ class TransfermarktScraper:
             soup = BeautifulSoup(driver.page_source, 'html.parser')
             driver.quit()
             
+            table = soup.find('table', class_='items')
+            if not table:
+                return []
+            
+            columns = self._column_offsets(table, SQUAD_COLUMNS)
             players = []
-            player_rows = soup.find_all('tr', class_=['odd', 'even'])
+            player_rows = (table.tbody or table).find_all('tr', class_=['odd', 'even'], recursive=False)
             
             for row in player_rows:
                 try:
-                    player_data = self._parse_player_row(row)
+                    player_data = self._parse_player_row(row, columns)
                     if player_data:
                         players.append(player_data)
                 except Exception as e:
@@ -492,9 +519,15 @@ class TransfermarktScraper:
             logger.error(f"Error scraping team squad: {e}")
             return []
     
-    def _parse_player_row(self, row):
-        """Parse a player row from the squad table"""
+    def _parse_player_row(self, row, columns):
+        """Parse a player row from the detailed squad table in a single pass over its cells"""
         try:
+            cells = row.find_all('td', recursive=False)
+            
+            def cell(column):
+                offset = columns.get(column)
+                return cells[len(cells) + offset] if offset is not None and len(cells) + offset >= 0 else None
+            
             number_cell = row.find('div', class_='rn_nummer')
             jersey_number = int(number_cell.get_text(strip=True)) if number_cell and number_cell.get_text(strip=True).isdigit() else None
             
@@ -509,10 +542,19 @@ class TransfermarktScraper:
             player_name = player_link.get_text(strip=True)
             player_id = self._extract_player_id(player_link.get('href', ''))
             
-            position_cell = row.find_all('td')[1] if len(row.find_all('td')) > 1 else None
-            position = position_cell.get_text(strip=True) if position_cell else 'Unknown'
+            inline_rows = row.select('table.inline-table tr')
+            position = inline_rows[1].get_text(strip=True) if len(inline_rows) > 1 else 'Unknown'
+            
+            birth_cell = cell('birth')
+            age = re.search(r'\((\d+)\)', birth_cell.get_text()) if birth_cell else None
             
-            market_value_cell = row.find('td', class_='rechts')
+            nationality_cell = cell('nationality')
+            flag = nationality_cell.find('img', title=True) if nationality_cell else None
+            
+            contract_cell = cell('contract')
+            contract_year = re.search(r'\b(\d{4})\b', contract_cell.get_text()) if contract_cell else None
+            
+            market_value_cell = cell('market_value')
             market_value = self._parse_market_value(market_value_cell.get_text(strip=True)) if market_value_cell else None
             
             return {
@@ -520,7 +562,10 @@ class TransfermarktScraper:
                 'transfermarkt_id': player_id,
                 'position': position,
                 'jersey_number': jersey_number,
-                'market_value': market_value
+                'market_value': market_value,
+                'age': int(age.group(1)) if age else None,
+                'nationality': flag['title'] if flag else None,
+                'contract_end_year': int(contract_year.group(1)) if contract_year else None
             }
             
         except Exception as e:
@@ -553,20 +598,110 @@ class TransfermarktScraper:
             logger.error(f"Error parsing market value: {e}")
             return None
     
+    def scrape_team_performance(self, team_id, competition_id, season="2025"):
+        """Scrape a club's season appearances, starts and minutes per player from its performance page.
+
+        One request covers the whole squad. Returns a list of dicts with
+        transfermarkt_id, name, appearances, starts and minutes_played.
+        """
+        try:
+            url = f"{self.base_url}/verein/leistungsdaten/verein/{team_id}/reldata/{competition_id}%26{season}/plus/1"
+            
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.content, 'html.parser')
+            
+            table = soup.find('table', class_='items')
+            if not table:
+                logger.warning(f"No performance table for team {team_id}")
+                return []
+            
+            columns = self._column_offsets(table, PERFORMANCE_COLUMNS)
+            stats = []
+            for row in (table.tbody or table).find_all('tr', recursive=False):
+                try:
+                    player_stats = self._parse_performance_row(row, columns)
+                    if player_stats:
+                        stats.append(player_stats)
+                except Exception as e:
+                    logger.error(f"Error parsing performance row: {e}")
+                    continue
+            
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error scraping team performance: {e}")
+            return []
+    
+    def _column_offsets(self, table, wanted):
+        """Map table columns to cell offsets from the right, matching header titles against wanted names.
+
+        Counting from the right keeps the data columns aligned even though the
+        player column's header spans more cells than the row's nested player table.
+        """
+        labels = []
+        for header in table.select('thead th'):
+            titled = header.find(attrs={'title': True})
+            label = (titled['title'] if titled else header.get_text(strip=True)).lower()
+            labels.extend([label] * int(header.get('colspan', 1)))
+        
+        return {
+            key: next((i - len(labels) for i, label in enumerate(labels) if any(name in label for name in names)), None)
+            for key, names in wanted.items()
+        }
+    
+    def _parse_performance_row(self, row, columns):
+        """Parse one player's season totals; players not used this season get zeros"""
+        name_cell = row.find('td', class_='hauptlink')
+        player_link = name_cell.find('a') if name_cell else None
+        if not player_link:
+            return None
+        
+        cells = row.find_all('td', recursive=False)
+        unused = any(int(cell.get('colspan', 1)) > 1 for cell in cells)
+        
+        def number(column):
+            offset = columns.get(column)
+            if unused or offset is None or len(cells) + offset < 0:
+                return 0
+            index = len(cells) + offset
+            digits = re.sub(r'\D', '', cells[index].get_text(strip=True))
+            return int(digits) if digits else 0
+        
+        appearances = number('appearances')
+        return {
+            'transfermarkt_id': self._extract_player_id(player_link.get('href', '')),
+            'name': player_link.get_text(strip=True),
+            'appearances': appearances,
+            'starts': max(0, appearances - number('substitutions_on')),
+            'minutes_played': number('minutes_played')
+        }
+    
     def scrape_player_injuries(self, team_id):
-        """Scrape injury information for team players"""
+        """Scrape a team's current injury list.
+
+        Returns one dict per injured player with player_name, player_transfermarkt_id,
+        injury_description, status_type and the parsed start_date and
+        expected_return_date (None when the page gives no date). Returns None when
+        the page could not be fetched, so callers never mistake a failure for an
+        empty injury list.
+        """
         try:
             url = f"{self.base_url}/verein/verletztenliste/verein/{team_id}"
             
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
-            injuries = []
-            injury_rows = soup.find_all('tr', class_=['odd', 'even'])
+            table = soup.find('table', class_='items')
+            if not table:
+                return []
             
-            for row in injury_rows:
+            columns = self._column_offsets(table, INJURY_COLUMNS)
+            injuries = []
+            for row in (table.tbody or table).find_all('tr', recursive=False):
                 try:
-                    injury_data = self._parse_injury_row(row)
+                    injury_data = self._parse_injury_row(row, columns)
                     if injury_data:
                         injuries.append(injury_data)
                 except Exception as e:
@@ -577,37 +712,173 @@ class TransfermarktScraper:
             
         except Exception as e:
             logger.error(f"Error scraping player injuries: {e}")
-            return []
+            return None
     
-    def _parse_injury_row(self, row):
+    def _parse_injury_row(self, row, columns):
         """Parse an injury row from the injuries table"""
+        name_cell = row.find('td', class_='hauptlink')
+        player_link = name_cell.find('a') if name_cell else None
+        if not player_link:
+            return None
+        
+        cells = row.find_all('td', recursive=False)
+        
+        def text(column):
+            offset = columns.get(column)
+            return cells[len(cells) + offset].get_text(strip=True) if offset is not None and len(cells) + offset >= 0 else ''
+        
+        return {
+            'player_name': player_link.get_text(strip=True),
+            'player_transfermarkt_id': self._extract_player_id(player_link.get('href', '')),
+            'injury_description': text('injury') or 'Injured',
+            'start_date': self._parse_injury_date(text('since')),
+            'expected_return_date': self._parse_injury_date(text('until')),
+            'status_type': 'injury'
+        }
+    
+    def _parse_injury_date(self, text):
+        """Parse an injury table date, or None when it is unknown"""
+        for date_format in INJURY_DATE_FORMATS:
+            try:
+                return datetime.strptime(text, date_format).date()
+            except ValueError:
+                continue
+        return None
+
+    def scrape_match_lineups(self, match_id):
+        """Scrape who played in a finished match and for how long.
+
+        Starting line-ups and formations come from the match report's line-up page,
+        substitutions and sendings-off from the report itself. Returns
+        {'home': [...], 'away': [...], 'formations': {'home': ..., 'away': ...}}
+        with one entry per player who took the field, or None if the report
+        has no line-ups yet.
+        """
         try:
-            name_cell = row.find('td', class_='hauptlink')
-            if not name_cell:
+            lineup_response = self.session.get(f"{self.base_url}/spielbericht/aufstellung/spielbericht/{match_id}", timeout=15)
+            lineup_response.raise_for_status()
+            lineup_page = BeautifulSoup(lineup_response.content, 'html.parser')
+            starters = self._parse_starting_lineups(lineup_page)
+            if not starters:
                 return None
-                
-            player_link = name_cell.find('a')
-            if not player_link:
-                return None
-                
-            player_name = player_link.get_text(strip=True)
-            player_id = self._extract_player_id(player_link.get('href', ''))
             
-            cells = row.find_all('td')
-            if len(cells) < 4:
-                return None
-                
-            injury_description = cells[2].get_text(strip=True)
-            expected_return = cells[3].get_text(strip=True)
+            report_response = self.session.get(f"{self.base_url}/spielbericht/index/spielbericht/{match_id}", timeout=15)
+            report_response.raise_for_status()
+            report = BeautifulSoup(report_response.content, 'html.parser')
             
-            return {
-                'player_name': player_name,
-                'player_transfermarkt_id': player_id,
-                'injury_description': injury_description,
-                'expected_return': expected_return,
-                'status_type': 'injury'
-            }
+            appearances = self._build_appearances(
+                starters,
+                self._parse_match_events(report, 'sb-wechsel'),
+                self._parse_match_events(report, 'sb-karten')
+            )
+            appearances['formations'] = self._parse_lineup_formations(lineup_page)
+            return appearances
             
         except Exception as e:
-            logger.error(f"Error parsing injury row: {e}")
+            logger.error(f"Error scraping lineups for match {match_id}: {e}")
+            return None
+    
+    def _starting_lineup_boxes(self, soup):
+        """Line-up page boxes headed 'Starting Line-up', home first"""
+        return [
+            box for box in soup.find_all('div', class_='box')
+            if box.find(class_='content-box-headline') and 'Starting Line-up' in box.find(class_='content-box-headline').get_text()
+        ]
+    
+    def _parse_lineup_formations(self, soup):
+        """Parse the home and away formations (e.g. '4-2-3-1') from the line-up box headlines"""
+        formations = {}
+        for side, box in zip(('home', 'away'), self._starting_lineup_boxes(soup)[:2]):
+            shape = re.search(r'\d(?:-\d)+', box.find(class_='content-box-headline').get_text())
+            formations[side] = shape.group() if shape else None
+        return formations
+    
+    def _parse_starting_lineups(self, soup):
+        """Parse the home and away starting XIs from a line-up page as [(transfermarkt_id, name), ...] lists"""
+        boxes = self._starting_lineup_boxes(soup)
+        if len(boxes) < 2:
             return None
+        
+        lineups = {}
+        for side, box in zip(('home', 'away'), boxes[:2]):
+            players, seen = [], set()
+            for link in box.select('td.hauptlink a[href*="/profil/spieler/"]'):
+                player_id = self._extract_player_id(link.get('href', ''))
+                if player_id and player_id not in seen:
+                    seen.add(player_id)
+                    players.append((player_id, link.get('title') or link.get_text(strip=True)))
+            lineups[side] = players
+        
+        return lineups if lineups['home'] and lineups['away'] else None
+    
+    def _parse_match_events(self, soup, section_id):
+        """Parse substitution or card events from a match report section"""
+        section = soup.find('div', id=section_id)
+        if not section:
+            return []
+        
+        events = []
+        for item in section.find_all('li'):
+            side = 'home' if 'sb-aktion-heim' in (item.get('class') or []) else 'away'
+            minute = self._parse_event_minute(item.find('span', class_='sb-sprite-uhr-klein'))
+            if minute is None:
+                continue
+            
+            if section_id == 'sb-wechsel':
+                player_in = item.select_one('.sb-aktion-wechsel-ein a[href*="/profil/spieler/"]')
+                player_out = item.select_one('.sb-aktion-wechsel-aus a[href*="/profil/spieler/"]')
+                if player_in and player_out:
+                    events.append({
+                        'side': side,
+                        'minute': minute,
+                        'player_in': (self._extract_player_id(player_in['href']), player_in.get('title') or player_in.get_text(strip=True)),
+                        'player_out': self._extract_player_id(player_out['href'])
+                    })
+            else:
+                card = item.find('span', class_=re.compile(r'sb-(rot|gelbrot)'))
+                player = item.select_one('.sb-aktion-aktion a[href*="/profil/spieler/"]')
+                if card and player:
+                    events.append({'side': side, 'minute': minute, 'player_out': self._extract_player_id(player['href'])})
+        
+        return events
+    
+    def _parse_event_minute(self, clock):
+        """Read an event minute from the report's clock sprite offset (falls back to the clock text)"""
+        if not clock:
+            return None
+        offsets = re.findall(r'-?(\d+)px', clock.get('style', ''))
+        if len(offsets) >= 2:
+            column, row = int(offsets[0]) // EVENT_CLOCK_CELL_PX, int(offsets[1]) // EVENT_CLOCK_CELL_PX
+            return min(MATCH_LENGTH_MINUTES, row * 10 + column + 1)
+        digits = re.match(r'\d+', clock.get_text(strip=True))
+        return min(MATCH_LENGTH_MINUTES, int(digits.group())) if digits else None
+    
+    def _build_appearances(self, starters, substitutions, sendings_off):
+        """Turn starting XIs and timed events into per-player appearance rows with minutes played"""
+        appearances = {}
+        for side, players in starters.items():
+            appearances[side] = {
+                player_id: {'transfermarkt_id': player_id, 'name': name, 'started': True, 'minute_on': 0, 'minute_off': MATCH_LENGTH_MINUTES}
+                for player_id, name in players
+            }
+        
+        for event in sorted(substitutions, key=lambda event: event['minute']):
+            side = appearances[event['side']]
+            if event['player_out'] in side:
+                side[event['player_out']]['minute_off'] = event['minute']
+            player_id, name = event['player_in']
+            if player_id and player_id not in side:
+                side[player_id] = {'transfermarkt_id': player_id, 'name': name, 'started': False, 'minute_on': event['minute'], 'minute_off': MATCH_LENGTH_MINUTES}
+        
+        for event in sendings_off:
+            player = appearances[event['side']].get(event['player_out'])
+            if player:
+                player['minute_off'] = min(player['minute_off'], event['minute'])
+        
+        return {
+            side: [
+                dict(player, minutes=max(0, player['minute_off'] - player['minute_on']))
+                for player in players.values()
+            ]
+            for side, players in appearances.items()
+        }
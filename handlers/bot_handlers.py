@@ -5,14 +5,24 @@ from telegram.ext import ContextTypes
 from database.models import DatabaseManager
 from analyzers.lineup_predictor import LineupPredictor
 from fetchers.logo_scraper import LogoScraper
+from handlers.edit_coalescer import EditCoalescer
+from handlers.callback_data import encode_callback, decode_callback, InvalidCallback
+from utils.prediction_dispatcher import PredictionDispatcher
+from utils.render_cache import RenderCache, prediction_version
 from config import LEAGUES
 
 logger = logging.getLogger(__name__)
 
+FORMAT_ERROR_TEXT = "Error formatting prediction. Please try again."
+
 class BotHandlers:
     def __init__(self, db_manager):
         self.db = db_manager
         self.predictor = LineupPredictor(db_manager)
+        self.dispatcher = PredictionDispatcher()
+        self.render_cache = RenderCache()
+        self.edits = EditCoalescer()
+        db_manager.prediction_listeners.append(self.render_cache.invalidate)
         self.logo_scraper = LogoScraper()
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -25,7 +35,7 @@ class BotHandlers:
             for league_key, league_info in LEAGUES.items():
                 keyboard.append([InlineKeyboardButton(
                     f"{league_info['emoji']} {league_info['name']}", 
-                    callback_data=f"league_{league_key}"
+                    callback_data=encode_callback('league', league_key)
                 )])
             
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -55,13 +65,11 @@ class BotHandlers:
             query = update.callback_query
             await query.answer()
             
-            user_id = update.effective_user.id
-            league_key = query.data.replace("league_", "")
-            
-            if league_key not in LEAGUES:
-                await query.edit_message_text("Invalid league selection. Please try again.")
+            callback = await self._callback(query)
+            if not callback:
                 return
             
+            league_key = callback.league_key
             league_info = LEAGUES[league_key]
             
             league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
@@ -74,15 +82,11 @@ class BotHandlers:
             else:
                 league_id = league_db['id']
             
-            self.db.update_user_session(
-                telegram_user_id=user_id,
-                current_league_id=league_id
-            )
-            
             matches = self.db.get_next_matchday_matches(league_id)
             
             if not matches:
-                await query.edit_message_text(
+                await self.edits.edit(
+                    query,
                     f"📅 No upcoming matches found for {league_info['name']}.\n"
                     "Match data might still be loading. Please try again in a few minutes."
                 )
@@ -97,20 +101,20 @@ class BotHandlers:
                 match_text = f"{home_logo} {match['home_team_name']} vs {match['away_team_name']} {away_logo}"
                 keyboard.append([InlineKeyboardButton(
                     match_text,
-                    callback_data=f"match_{match['id']}"
+                    callback_data=encode_callback('match', league_key, match['id'])
                 )])
             
-            keyboard.append([InlineKeyboardButton("🔙 Back to Leagues", callback_data="back_to_leagues")])
+            keyboard.append([InlineKeyboardButton("🔙 Back to Leagues", callback_data=encode_callback('leagues'))])
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
             message_text = f"🏆 {league_info['name']} - Matchday {matchday_num}\n\n📅 Matchday {matchday_num} Fixtures:\n\nSelect a match to view team lineups:"
             
-            await query.edit_message_text(message_text, reply_markup=reply_markup)
+            await self.edits.edit(query, message_text, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error in league selection: {e}")
-            await query.edit_message_text("Sorry, something went wrong. Please try again.")
+            await self.edits.edit(query, "Sorry, something went wrong. Please try again.")
     
     async def match_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle match selection"""
@@ -118,8 +122,11 @@ class BotHandlers:
             query = update.callback_query
             await query.answer()
             
-            user_id = update.effective_user.id
-            match_id = int(query.data.replace("match_", ""))
+            callback = await self._callback(query)
+            if not callback:
+                return
+            
+            league_key, match_id = callback.league_key, callback.match_id
             
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -137,14 +144,9 @@ class BotHandlers:
                     match = cursor.fetchone()
             
             if not match:
-                await query.edit_message_text("Match not found. Please try again.")
+                await self.edits.edit(query, "Match not found. Please try again.")
                 return
             
-            self.db.update_user_session(
-                telegram_user_id=user_id,
-                current_match_id=match_id
-            )
-            
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute("SELECT logo_url FROM teams WHERE id = %s", (match['home_team_id'],))
@@ -158,13 +160,13 @@ class BotHandlers:
             keyboard = [
                 [InlineKeyboardButton(
                     f"{home_logo} {match['home_team_name']}", 
-                    callback_data=f"team_{match['home_team_id']}"
+                    callback_data=encode_callback('team', league_key, match_id, match['home_team_id'])
                 )],
                 [InlineKeyboardButton(
                     f"{away_logo} {match['away_team_name']}", 
-                    callback_data=f"team_{match['away_team_id']}"
+                    callback_data=encode_callback('team', league_key, match_id, match['away_team_id'])
                 )],
-                [InlineKeyboardButton("🔙 Back to Matches", callback_data=f"league_{match['league_name']}")],
+                [InlineKeyboardButton("🔙 Back to Matches", callback_data=encode_callback('league', league_key))],
             ]
             
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -177,11 +179,11 @@ class BotHandlers:
                 "Select a team to view predicted lineup:"
             )
             
-            await query.edit_message_text(message_text, reply_markup=reply_markup)
+            await self.edits.edit(query, message_text, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error in match selection: {e}")
-            await query.edit_message_text("Sorry, something went wrong. Please try again.")
+            await self.edits.edit(query, "Sorry, something went wrong. Please try again.")
     
     async def team_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle team selection and show lineup prediction"""
@@ -189,56 +191,47 @@ class BotHandlers:
             query = update.callback_query
             await query.answer()
             
-            user_id = update.effective_user.id
-            team_id = int(query.data.replace("team_", ""))
-            
-            session = self.db.get_user_session(user_id)
-            if not session or not session['current_match_id']:
-                await query.edit_message_text("Session expired. Please start over with /start")
+            callback = await self._callback(query)
+            if not callback:
                 return
             
-            match_id = session['current_match_id']
-            
-            self.db.update_user_session(
-                telegram_user_id=user_id,
-                current_team_id=team_id
-            )
-            
-            await query.edit_message_text("🔄 Generating lineup prediction...")
+            league_key, match_id, team_id = callback.league_key, callback.match_id, callback.team_id
             
-            prediction = self.db.get_lineup_prediction(match_id, team_id)
+            # checked against the stored version, as predictions may also be saved by other processes
+            stored = self.db.get_lineup_prediction_version(match_id, team_id)
+            cached = self.render_cache.get(match_id, team_id, 'view', prediction_version(stored)) if stored else None
+            if cached:
+                message_text, reply_markup = cached
+                await self.edits.edit(query, message_text, reply_markup=reply_markup, parse_mode='HTML')
+                return
             
-            if not prediction:
-                prediction = self.predictor.predict_lineup(match_id, team_id)
+            prediction = await self.edits.edit_when_ready(
+                query, "🔄 Generating lineup prediction...",
+                self.dispatcher.run((match_id, team_id, False), self._load_prediction, match_id, team_id, False)
+            )
             
             if not prediction or prediction.get('error'):
                 error_msg = prediction.get('reasoning', 'Team data might still be loading.') if prediction else 'Team data might still be loading.'
-                await query.edit_message_text(
+                await self.edits.edit(
+                    query,
                     f"❌ Unable to generate lineup prediction.\n\n{error_msg}\n\nPlease try again later or select a different team."
                 )
                 return
             
             if not prediction.get('starting_xi'):
-                await query.edit_message_text(
+                await self.edits.edit(
+                    query,
                     f"❌ Squad data incomplete.\n\n{prediction.get('reasoning', 'Team squad is still being populated.')}\n\nPlease try again later."
                 )
                 return
             
-            message_text = await self._format_lineup_prediction(prediction, team_id, match_id)
-            
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh Prediction", callback_data=f"refresh_{team_id}")],
-                [InlineKeyboardButton("🔙 Back to Match", callback_data=f"match_{match_id}")],
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="back_to_leagues")]
-            ]
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            message_text, reply_markup = await self._render_lineup(prediction, league_key, match_id, team_id, 'view')
             
-            await query.edit_message_text(message_text, reply_markup=reply_markup, parse_mode='HTML')
+            await self.edits.edit(query, message_text, reply_markup=reply_markup, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error in team selection: {e}")
-            await query.edit_message_text("Sorry, something went wrong. Please try again.")
+            await self.edits.edit(query, "Sorry, something went wrong. Please try again.")
     
     async def refresh_prediction(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Refresh lineup prediction"""
@@ -246,41 +239,31 @@ class BotHandlers:
             query = update.callback_query
             await query.answer()
             
-            user_id = update.effective_user.id
-            team_id = int(query.data.replace("refresh_", ""))
-            
-            session = self.db.get_user_session(user_id)
-            if not session or not session['current_match_id']:
-                await query.edit_message_text("Session expired. Please start over with /start")
+            callback = await self._callback(query)
+            if not callback:
                 return
             
-            match_id = session['current_match_id']
-            
-            await query.edit_message_text("🔄 Refreshing lineup prediction...")
+            league_key, match_id, team_id = callback.league_key, callback.match_id, callback.team_id
             
-            prediction = self.predictor.predict_lineup(match_id, team_id)
+            prediction = await self.edits.edit_when_ready(
+                query, "🔄 Refreshing lineup prediction...",
+                self.dispatcher.run((match_id, team_id, True), self._load_prediction, match_id, team_id, True)
+            )
             
             if not prediction:
-                await query.edit_message_text(
+                await self.edits.edit(
+                    query,
                     "❌ Unable to refresh lineup prediction. Please try again later."
                 )
                 return
             
-            message_text = await self._format_lineup_prediction(prediction, team_id, match_id)
-            
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh Again", callback_data=f"refresh_{team_id}")],
-                [InlineKeyboardButton("🔙 Back to Match", callback_data=f"match_{match_id}")],
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="back_to_leagues")]
-            ]
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            message_text, reply_markup = await self._render_lineup(prediction, league_key, match_id, team_id, 'refresh')
             
-            await query.edit_message_text(message_text, reply_markup=reply_markup, parse_mode='HTML')
+            await self.edits.edit(query, message_text, reply_markup=reply_markup, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error refreshing prediction: {e}")
-            await query.edit_message_text("Sorry, something went wrong. Please try again.")
+            await self.edits.edit(query, "Sorry, something went wrong. Please try again.")
     
     async def back_to_leagues(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Go back to league selection"""
@@ -292,7 +275,7 @@ class BotHandlers:
             for league_key, league_info in LEAGUES.items():
                 keyboard.append([InlineKeyboardButton(
                     f"{league_info['emoji']} {league_info['name']}", 
-                    callback_data=f"league_{league_key}"
+                    callback_data=encode_callback('league', league_key)
                 )])
             
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -302,11 +285,65 @@ class BotHandlers:
                 "Please select a league:"
             )
             
-            await query.edit_message_text(welcome_message, reply_markup=reply_markup)
+            await self.edits.edit(query, welcome_message, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error going back to leagues: {e}")
-            await query.edit_message_text("Sorry, something went wrong. Please try again.")
+            await self.edits.edit(query, "Sorry, something went wrong. Please try again.")
+    
+    async def outdated_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Buttons from before the current callback format (or otherwise unrecognised)"""
+        query = update.callback_query
+        await query.answer()
+        await self._callback(query)
+    
+    async def _callback(self, query):
+        """Navigation context of a button press, or None after telling the user the menu is out of date"""
+        try:
+            return decode_callback(query.data)
+        except InvalidCallback as e:
+            logger.warning(f"Rejected callback: {e}")
+            await self.edits.edit(query, "This menu is out of date. Please start over with /start")
+            return None
+    
+    def _load_prediction(self, match_id, team_id, current):
+        """Stored prediction (only an up-to-date one if current is set), else a fresh one; runs on a dispatcher worker"""
+        if current:
+            prediction = self.db.get_current_lineup_prediction(match_id, team_id)
+        else:
+            prediction = self.db.get_lineup_prediction(match_id, team_id)
+        if prediction:
+            return prediction
+        
+        input_version = self.db.get_team_input_version(team_id)
+        prediction = self.predictor.predict_lineup(match_id, team_id)
+        if prediction and not prediction.get('error'):
+            self.db.stamp_prediction_input_version(match_id, team_id, input_version)
+        return prediction
+    
+    async def _render_lineup(self, prediction, league_key, match_id, team_id, view):
+        """Message text and keyboard of a lineup view ('view' or 'refresh'), from the render cache when possible"""
+        version = prediction_version(prediction)
+        cached = self.render_cache.get(match_id, team_id, view, version)
+        if cached:
+            return cached
+        
+        message_text = await self._format_lineup_prediction(prediction, team_id, match_id)
+        
+        keyboard = [
+            [InlineKeyboardButton(
+                "🔄 Refresh Again" if view == 'refresh' else "🔄 Refresh Prediction",
+                callback_data=encode_callback('refresh', league_key, match_id, team_id)
+            )],
+            [InlineKeyboardButton("🔙 Back to Match", callback_data=encode_callback('match', league_key, match_id))],
+            [InlineKeyboardButton("🏠 Main Menu", callback_data=encode_callback('leagues'))]
+        ]
+        
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        if prediction.get('id') and message_text != FORMAT_ERROR_TEXT:
+            self.render_cache.put(match_id, team_id, view, version, message_text, reply_markup)
+        return message_text, reply_markup
     
     async def _format_lineup_prediction(self, prediction, team_id, match_id):
         """Format lineup prediction for display"""
@@ -361,13 +398,14 @@ class BotHandlers:
                     if source.get('url'):
                         message_parts.append(f"• {source.get('type', 'Source').title()}")
             
-            message_parts.append(f"\n<i>Last updated: {datetime.now().strftime('%H:%M')}</i>")
+            updated_at = prediction.get('updated_at') or prediction.get('created_at') or datetime.now()
+            message_parts.append(f"\n<i>Last updated: {updated_at.strftime('%H:%M')}</i>")
             
             return "\n".join(message_parts)
             
         except Exception as e:
             logger.error(f"Error formatting lineup prediction: {e}")
-            return "Error formatting prediction. Please try again."
+            return FORMAT_ERROR_TEXT
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
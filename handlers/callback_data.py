@@ -0,0 +1,80 @@
+import hmac
+import base64
+import hashlib
+import re
+from collections import namedtuple
+from config import LEAGUES, CALLBACK_SECRET
+
+# Button payload: "<version>.<view>.<league>.<match>.<team>.<signature>" with ids in base 36. It carries the whole
+# navigation context, so handlers need no session, and is signed so a client cannot pair a match with any team.
+CALLBACK_VERSION = '1'
+MAX_CALLBACK_BYTES = 64  # Telegram's limit for callback_data
+VIEW_CODES = {'leagues': 'H', 'league': 'L', 'match': 'M', 'team': 'T', 'refresh': 'R'}
+VIEWS_BY_CODE = {code: view for view, code in VIEW_CODES.items()}
+REQUIRED_FIELDS = {
+    'leagues': (),
+    'league': ('league_key',),
+    'match': ('league_key', 'match_id'),
+    'team': ('league_key', 'match_id', 'team_id'),
+    'refresh': ('league_key', 'match_id', 'team_id')
+}
+SIGNATURE_BYTES = 6
+
+LEAGUES_BY_TRANSFERMARKT_ID = {league['transfermarkt_id']: league_key for league_key, league in LEAGUES.items()}
+
+Callback = namedtuple('Callback', ['view', 'league_key', 'match_id', 'team_id'])
+
+class InvalidCallback(ValueError):
+    """callback_data that is outdated, malformed or not signed by us"""
+
+def _base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while True:
+        number, digit = divmod(number, 36)
+        text = digits[digit] + text
+        if not number:
+            return text
+
+def _signature(body):
+    digest = hmac.new(CALLBACK_SECRET.encode(), body.encode(), hashlib.sha256).digest()[:SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).decode()
+
+def encode_callback(view, league_key=None, match_id=None, team_id=None):
+    """callback_data for a button opening view with the given context"""
+    body = '.'.join([
+        CALLBACK_VERSION,
+        VIEW_CODES[view],
+        LEAGUES[league_key]['transfermarkt_id'] if league_key else '',
+        _base36(match_id) if match_id is not None else '',
+        _base36(team_id) if team_id is not None else ''
+    ])
+    data = f"{body}.{_signature(body)}"
+    if len(data.encode()) > MAX_CALLBACK_BYTES:
+        raise ValueError(f"callback_data over {MAX_CALLBACK_BYTES} bytes: {data}")
+    return data
+
+def decode_callback(data):
+    """Callback(view, league_key, match_id, team_id) from callback_data, or InvalidCallback"""
+    parts = (data or '').split('.')
+    if len(parts) != 6 or parts[0] != CALLBACK_VERSION:
+        raise InvalidCallback(f"unsupported callback_data: {data!r}")
+    version, code, transfermarkt_id, match, team, signature = parts
+    if not hmac.compare_digest(signature, _signature('.'.join(parts[:5]))):
+        raise InvalidCallback(f"bad callback signature: {data!r}")
+    if code not in VIEWS_BY_CODE or (transfermarkt_id and transfermarkt_id not in LEAGUES_BY_TRANSFERMARKT_ID):
+        raise InvalidCallback(f"unknown view or league: {data!r}")
+    try:
+        callback = Callback(
+            VIEWS_BY_CODE[code], LEAGUES_BY_TRANSFERMARKT_ID.get(transfermarkt_id),
+            int(match, 36) if match else None, int(team, 36) if team else None
+        )
+    except ValueError:
+        raise InvalidCallback(f"bad ids in callback_data: {data!r}")
+    if any(getattr(callback, field) is None for field in REQUIRED_FIELDS[callback.view]):
+        raise InvalidCallback(f"incomplete context for {callback.view}: {data!r}")
+    return callback
+
+def callback_pattern(view):
+    """CallbackQueryHandler pattern for the current payload version of one view"""
+    return re.compile(rf"^{CALLBACK_VERSION}\.{VIEW_CODES[view]}\.")
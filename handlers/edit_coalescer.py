@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from telegram.error import BadRequest
+from config import EDIT_PLACEHOLDER_BUDGET_MS
+
+logger = logging.getLogger(__name__)
+
+TRACKED_EDITS = 10000  # taps and inline messages whose last edit is remembered
+REPORT_EVERY = 100  # edit requests between call-savings log lines
+
+class EditCoalescer:
+    """Sends only the message edits that change something.
+
+    An edit whose text and keyboard hash to what the message already shows is
+    dropped instead of earning a "message is not modified" error, and an
+    interim placeholder is skipped when the real result is ready within a
+    short budget. calls_made and calls_saved count Telegram calls.
+
+    What a message shows is taken from Telegram (the message a tap came with),
+    so edits made by other processes are seen, updated with the edits made
+    while handling that tap. Inline messages come without their content and
+    are compared with the last edit this process made.
+    """
+    def __init__(self, placeholder_budget=EDIT_PLACEHOLDER_BUDGET_MS / 1000):
+        self.placeholder_budget = placeholder_budget
+        self._shown = OrderedDict()
+        self.calls_made = 0
+        self.calls_saved = 0
+
+    def _edit_key(self, query):
+        if query.message is not None:
+            return ('tap', query.id)
+        return ('inline', query.inline_message_id)
+
+    def _digest(self, text, reply_markup, parse_mode):
+        markup = reply_markup.to_json() if reply_markup is not None else ''
+        return hashlib.sha1(f"{parse_mode}\x00{text}\x00{markup}".encode()).digest()
+
+    def _shown_digest(self, query, key, parse_mode):
+        """Digest of what the message shows now, or None if unknown"""
+        if key in self._shown:
+            return self._shown[key]
+        message = query.message
+        if message is None or not getattr(message, 'text', None):
+            return None
+        text = message.text_html if parse_mode == 'HTML' else message.text
+        return self._digest(text, message.reply_markup, parse_mode)
+
+    async def edit(self, query, text, reply_markup=None, parse_mode=None):
+        """edit_message_text unless the message already shows exactly this"""
+        key = self._edit_key(query)
+        digest = self._digest(text, reply_markup, parse_mode)
+        if self._shown_digest(query, key, parse_mode) == digest:
+            self._saved()
+            return
+
+        self.calls_made += 1
+        try:
+            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        except BadRequest as e:
+            if 'not modified' not in str(e).lower():
+                raise
+        self._shown[key] = digest
+        self._shown.move_to_end(key)
+        while len(self._shown) > TRACKED_EDITS:
+            self._shown.popitem(last=False)
+        self._report()
+
+    async def edit_when_ready(self, query, placeholder, work):
+        """Await work, showing placeholder only if it takes longer than the budget"""
+        task = asyncio.ensure_future(work)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), self.placeholder_budget)
+        except asyncio.TimeoutError:
+            await self.edit(query, placeholder)
+            return await task
+        self._saved()
+        return result
+
+    def _saved(self):
+        self.calls_saved += 1
+        self._report()
+
+    def _report(self):
+        requests = self.calls_made + self.calls_saved
+        if requests % REPORT_EVERY == 0:
+            logger.info(f"📉 Message edits: {self.calls_made} Telegram calls made, {self.calls_saved} saved ({self.calls_saved / requests:.0%})")
@@ -1,11 +1,15 @@
 import asyncio
 import logging
+from telegram import Update
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler
 from database.models import DatabaseManager
 from handlers.bot_handlers import BotHandlers
+from handlers.callback_data import callback_pattern
 from utils.scheduler import DataScheduler
+from utils.webhook_server import WebhookServer
+from utils.update_processor import PerUserUpdateProcessor, BackpressureQueue
 from utils.logging_config import setup_logging
-from config import TELEGRAM_BOT_TOKEN
+from config import TELEGRAM_BOT_TOKEN, WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_SECRET
 
 logger = setup_logging()
 
@@ -25,31 +29,38 @@ async def main():
         
         bot_handlers = BotHandlers(db_manager)
         
-        application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        application = (
+            Application.builder()
+            .token(TELEGRAM_BOT_TOKEN)
+            .update_queue(BackpressureQueue())
+            .concurrent_updates(PerUserUpdateProcessor())
+            .build()
+        )
         
         application.add_handler(CommandHandler("start", bot_handlers.start_command))
         application.add_handler(CommandHandler("help", bot_handlers.help_command))
         
         application.add_handler(CallbackQueryHandler(
             bot_handlers.league_selection, 
-            pattern="^league_"
+            pattern=callback_pattern('league')
         ))
         application.add_handler(CallbackQueryHandler(
             bot_handlers.match_selection, 
-            pattern="^match_"
+            pattern=callback_pattern('match')
         ))
         application.add_handler(CallbackQueryHandler(
             bot_handlers.team_selection, 
-            pattern="^team_"
+            pattern=callback_pattern('team')
         ))
         application.add_handler(CallbackQueryHandler(
             bot_handlers.refresh_prediction, 
-            pattern="^refresh_"
+            pattern=callback_pattern('refresh')
         ))
         application.add_handler(CallbackQueryHandler(
             bot_handlers.back_to_leagues, 
-            pattern="^back_to_leagues$"
+            pattern=callback_pattern('leagues')
         ))
+        application.add_handler(CallbackQueryHandler(bot_handlers.outdated_callback))
         
         application.add_error_handler(bot_handlers.error_handler)
         
@@ -60,7 +71,19 @@ async def main():
         logger.info("Starting bot...")
         await application.initialize()
         await application.start()
-        await application.updater.start_polling()
+        webhook_server = None
+        if WEBHOOK_URL:
+            webhook_server = WebhookServer(application.bot, application.update_queue)
+            await webhook_server.start()
+            await application.bot.set_webhook(
+                url=f"{WEBHOOK_URL}{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info(f"Receiving updates by webhook at {WEBHOOK_URL}{WEBHOOK_PATH}")
+        else:
+            await application.updater.start_polling()
+            logger.info("Receiving updates by long polling")
         
         logger.info("Bot is running! Press Ctrl+C to stop.")
         
@@ -71,9 +94,13 @@ async def main():
         finally:
             logger.info("Stopping bot...")
             scheduler.stop_scheduler()
-            await application.updater.stop()
+            if webhook_server:
+                await webhook_server.stop()
+            else:
+                await application.updater.stop()
             await application.stop()
             await application.shutdown()
+            bot_handlers.dispatcher.shutdown()
             logger.info("Bot stopped")
             
     except Exception as e:
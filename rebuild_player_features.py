@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.models import DatabaseManager
+import argparse
+import logging
+import time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild_player_features(team_ids=None):
+    """Recompute the player feature store from appearance and status history (all teams by default)"""
+    try:
+        db = DatabaseManager()
+        db.init_database()
+        
+        start_time = time.time()
+        logger.info("🔄 Rebuilding player features...")
+        
+        team_count = db.rebuild_player_features(team_ids)
+        
+        logger.info(f"✅ Rebuilt features for {team_count} teams in {time.time() - start_time:.1f}s")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Error rebuilding player features: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the player feature store")
+    parser.add_argument('--team', type=int, action='append', dest='team_ids', help="Only rebuild this team id (repeatable)")
+    args = parser.parse_args()
+    sys.exit(0 if rebuild_player_features(args.team_ids) else 1)
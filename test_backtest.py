@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime, timedelta
+from analyzers.backtest import SeasonHistory, replay_matchday, run_backtest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SQUAD_POSITIONS = (
+    ['Goalkeeper'] * 2 + ['Centre-Back'] * 4 + ['Left-Back', 'Right-Back'] +
+    ['Defensive Midfield', 'Central Midfield', 'Central Midfield', 'Attacking Midfield'] +
+    ['Left Winger', 'Right Winger', 'Centre-Forward', 'Centre-Forward']
+)
+REGULAR_XI = [0, 2, 3, 6, 7, 8, 9, 10, 12, 13, 14]  # squad indices of a 4-3-3
+
+def build_history(matchdays=6, teams=4):
+    """Synthetic season where every team fields the same 4-3-3 each week, and one starter gets injured"""
+    season_start = datetime(2025, 8, 16, 15, 0)
+    history = {'matches': [], 'appearances': [], 'players': [], 'statuses': [], 'news': []}
+
+    for team_id in range(1, teams + 1):
+        for i, position in enumerate(SQUAD_POSITIONS):
+            history['players'].append({
+                'id': team_id * 100 + i, 'team_id': team_id, 'name': f"Player T{team_id}N{i}",
+                'position': position, 'jersey_number': i + 1, 'market_value': 10000000
+            })
+
+    match_id = 0
+    for matchday in range(1, matchdays + 1):
+        kickoff = season_start + timedelta(days=7 * (matchday - 1))
+        for home, away in [(t, t + 1) for t in range(1, teams + 1, 2)]:
+            match_id += 1
+            history['matches'].append({
+                'id': match_id, 'home_team_id': home, 'away_team_id': away, 'match_date': kickoff,
+                'matchday': matchday, 'home_formation': '4-3-3', 'away_formation': '4-3-3'
+            })
+            for team_id in (home, away):
+                xi = list(REGULAR_XI)
+                if team_id == 1 and matchday >= 4:
+                    xi[xi.index(12)] = 11  # injured centre-forward replaced by the attacking midfielder
+                for index in xi:
+                    history['appearances'].append({
+                        'match_id': match_id, 'player_id': team_id * 100 + index, 'team_id': team_id,
+                        'started': True, 'minutes_played': 90
+                    })
+
+    history['statuses'].append({
+        'player_id': 112, 'status_type': 'injury', 'description': 'Hamstring', 'severity': 'moderate',
+        'start_date': (season_start + timedelta(days=18)).date(),
+        'expected_return_date': (season_start + timedelta(days=60)).date(),
+        'created_at': season_start + timedelta(days=18), 'superseded_at': None
+    })
+    return history
+
+def test_replay_uses_only_pre_kickoff_data():
+    """Counters and statuses are rebuilt as of each kickoff"""
+    season = SeasonHistory(build_history())
+    kickoff = season.matchday_matches(3)[0]['match_date']
+    squad, news, form_rows = season.inputs_before(1, kickoff)
+
+    regular = next(player for player in squad if player['id'] == 100)
+    assert regular['games_started'] == 2 and regular['minutes_played'] == 180
+    assert all(not player['current_status'] for player in squad)
+
+    later_squad, _, _ = season.inputs_before(1, season.matchday_matches(4)[0]['match_date'])
+    injured = next(player for player in later_squad if player['id'] == 112)
+    assert injured['current_status'][0]['status_type'] == 'injury'
+    logger.info("✅ Inputs rebuilt without look-ahead")
+
+def test_replay_drops_statuses_over_by_kickoff():
+    """Statuses that ended or were superseded before kickoff no longer keep a player out"""
+    history = build_history()
+    season_start = history['matches'][0]['match_date']
+    history['statuses'] += [{
+        'player_id': 100, 'status_type': 'injury', 'description': 'Knock', 'severity': 'minor',
+        'start_date': season_start.date(), 'expected_return_date': (season_start + timedelta(days=3)).date(),
+        'created_at': season_start, 'superseded_at': None
+    }, {
+        'player_id': 102, 'status_type': 'suspension', 'description': 'Red card', 'severity': None,
+        'start_date': season_start.date(), 'expected_return_date': None,
+        'created_at': season_start, 'superseded_at': season_start + timedelta(days=5)
+    }]
+    season = SeasonHistory(history)
+
+    squad, _, form_rows = season.inputs_before(1, season.matchday_matches(1)[0]['match_date'] + timedelta(hours=1))
+    assert {player['id'] for player in squad if player['current_status']} == {100, 102}
+
+    squad, _, form_rows = season.inputs_before(1, season.matchday_matches(2)[0]['match_date'])
+    assert {player['id'] for player in squad if player['current_status']} == set()
+    logger.info("✅ Resolved and superseded statuses dropped by kickoff")
+
+def test_squads_follow_transfers():
+    """Squads are rebuilt from who played for whom before kickoff, not from today's clubs"""
+    history = build_history()
+    players = {player['id']: player for player in history['players']}
+    players[214]['team_id'] = 1  # moved from team 2 to team 1 after matchday 3
+    players[113]['team_id'] = None  # left team 1 for another league after matchday 3
+    matchday_of = {match['id']: match['matchday'] for match in history['matches']}
+    for appearance in history['appearances']:
+        if matchday_of[appearance['match_id']] < 4:
+            continue
+        if appearance['player_id'] == 214:
+            appearance['player_id'] = 215
+        elif appearance['player_id'] == 113:
+            appearance.update(player_id=214)
+    season = SeasonHistory(history)
+
+    ids = lambda team_id, matchday: {player['id'] for player in season.inputs_before(team_id, season.matchday_matches(matchday)[0]['match_date'])[0]}
+    assert 113 in ids(1, 3) and 214 not in ids(1, 3) and 214 in ids(2, 3)
+    assert 214 in ids(1, 5) and 214 not in ids(2, 5)
+    assert all(player['team_id'] == 1 for player in season.inputs_before(1, season.matchday_matches(3)[0]['match_date'])[0])
+
+    result = replay_matchday(season, 3)
+    assert all(record['xi_overlap'] == 1.0 for record in result['records'])  # the departed starter is still a candidate
+    logger.info("✅ Squads rebuilt as of each kickoff")
+
+def test_replay_scores_against_actual_lineups():
+    """A settled XI is predicted exactly once there is history, and the injury is picked up"""
+    season = SeasonHistory(build_history())
+    result = replay_matchday(season, 5)
+
+    assert result['teams'] == 4 and len(result['records']) == 4
+    for record in result['records']:
+        assert record['xi_overlap'] == 1.0
+        assert record['formation_hit']
+    logger.info(f"✅ Matchday 5 replayed in {result['seconds'] * 1000:.0f} ms")
+
+def test_process_pool_matches_serial_run():
+    """The process pool gives the same accuracy figures as an in-process replay"""
+    history = build_history()
+    serial = run_backtest(history, max_workers=1)
+    parallel = run_backtest(history, max_workers=2)
+
+    for key in ('teams', 'predicted', 'xi_overlap', 'formation_hit_rate', 'brier_score'):
+        assert serial[key] == parallel[key], key
+    assert serial['predicted'] == 24
+    assert 0 <= serial['brier_score'] < 0.25
+    logger.info(f"✅ XI overlap {serial['xi_overlap']:.3f}, Brier {serial['brier_score']:.3f}, {parallel['teams_per_second']:.0f} teams/s")
+
+if __name__ == "__main__":
+    test_replay_uses_only_pre_kickoff_data()
+    test_replay_drops_statuses_over_by_kickoff()
+    test_squads_follow_transfers()
+    test_replay_scores_against_actual_lineups()
+    test_process_pool_matches_serial_run()
+    logger.info("🎉 All backtest tests passed!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from config import LEAGUES
+from handlers.callback_data import (
+    encode_callback, decode_callback, callback_pattern, Callback, InvalidCallback, MAX_CALLBACK_BYTES
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _rejected(data):
+    try:
+        decode_callback(data)
+    except InvalidCallback:
+        return True
+    return False
+
+def test_round_trip_within_telegram_limit():
+    """Every view decodes back to its context and fits in 64 bytes even with large ids"""
+    league_key = next(iter(LEAGUES))
+    big = 2 ** 63 - 1
+    cases = [
+        Callback('leagues', None, None, None),
+        Callback('league', league_key, None, None),
+        Callback('match', league_key, big, None),
+        Callback('team', league_key, big, big),
+        Callback('refresh', league_key, 12345, 0)
+    ]
+    for callback in cases:
+        data = encode_callback(callback.view, callback.league_key, callback.match_id, callback.team_id)
+        assert len(data.encode()) <= MAX_CALLBACK_BYTES, data
+        assert decode_callback(data) == callback
+        assert callback_pattern(callback.view).match(data)
+        assert not callback_pattern('leagues' if callback.view != 'leagues' else 'team').match(data)
+    logger.info(f"✅ {len(cases)} payloads round-trip within {MAX_CALLBACK_BYTES} bytes")
+
+def test_rejects_tampered_legacy_and_incomplete_payloads():
+    """Edited ids, old-format buttons, other versions and missing context raise InvalidCallback"""
+    league_key = next(iter(LEAGUES))
+    data = encode_callback('team', league_key, 100, 7)
+    body, signature = data.rsplit('.', 1)
+    tampered = body[:-1] + ('8' if body[-1] != '8' else '9') + '.' + signature
+
+    assert _rejected(tampered)
+    assert _rejected("team_12")
+    assert _rejected("back_to_leagues")
+    assert _rejected("2" + data[1:])
+    assert _rejected(None)
+
+    incomplete = encode_callback('match', league_key).replace('1.L.', '1.T.', 1)
+    assert _rejected(incomplete)  # signature no longer matches
+    try:
+        encode_callback('team', league_key, 100)
+        decode_callback(encode_callback('team', league_key, 100))
+        assert False, "team without a team id should not decode"
+    except InvalidCallback:
+        pass
+    logger.info("✅ Tampered, legacy and incomplete payloads rejected")
+
+if __name__ == "__main__":
+    test_round_trip_within_telegram_limit()
+    test_rejects_tampered_legacy_and_incomplete_payloads()
+    logger.info("🎉 All callback data tests passed!")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+import threading
+from database.models import DatabaseManager
+from config import DB_MAX_CONNECTIONS, DB_LOOP_CONNECTIONS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def count_leagues(db):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS leagues FROM leagues WHERE transfermarkt_id = 'SLOTS'")
+            return cursor.fetchone()['leagues']
+
+def insert_league(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("INSERT INTO leagues (name, transfermarkt_id, season) VALUES ('Slots', 'SLOTS', '2025')")
+
+def test_nested_calls_share_the_thread_connection():
+    """A nested get_connection on one thread reuses its connection and takes no extra slot"""
+    db = DatabaseManager()
+    with db.get_connection() as outer:
+        with db.get_connection() as inner:
+            with inner.cursor() as cursor:
+                cursor.execute("SELECT pg_backend_pid() AS pid")
+                inner_pid = cursor.fetchone()['pid']
+        assert not outer.closed
+        with outer.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid() AS pid")
+            assert cursor.fetchone()['pid'] == inner_pid
+    assert outer.closed
+
+    # every slot is free again: all of them can be held at once without blocking
+    worker_slots = DB_MAX_CONNECTIONS - DB_LOOP_CONNECTIONS
+    held = [db._connection_slots.acquire(blocking=False) for _ in range(worker_slots)]
+    assert all(held) and not db._connection_slots.acquire(blocking=False)
+    for _ in held:
+        db._connection_slots.release()
+    logger.info("✅ Nested calls share one connection and one slot")
+
+def test_nested_commit_leaves_the_transaction_to_the_caller():
+    """A nested commit does not commit the caller's work, and a nested error only undoes its own"""
+    db = DatabaseManager()
+    db.init_database()
+    try:
+        try:
+            with db.get_connection() as outer:
+                insert_league(outer)
+                with db.get_connection() as inner:
+                    insert_league(inner)
+                    inner.commit()
+                raise RuntimeError("caller fails after the nested commit")
+        except RuntimeError:
+            pass
+        assert count_leagues(db) == 0
+
+        with db.get_connection() as outer:
+            insert_league(outer)
+            try:
+                with db.get_connection() as inner:
+                    insert_league(inner)
+                    with inner.cursor() as cursor:
+                        cursor.execute("SELECT 1 / 0")
+            except Exception:
+                pass
+            outer.commit()
+        assert count_leagues(db) == 1
+    finally:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM leagues WHERE transfermarkt_id = 'SLOTS'")
+                conn.commit()
+    logger.info("✅ Nested scopes commit and fail inside savepoints")
+
+def test_event_loop_has_its_own_slots():
+    """Handlers on the event loop get a connection while every worker slot is taken"""
+    db = DatabaseManager()
+    worker_slots = DB_MAX_CONNECTIONS - DB_LOOP_CONNECTIONS
+    held = [db._connection_slots.acquire(blocking=False) for _ in range(worker_slots)]
+
+    async def handler():
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 AS one")
+                return cursor.fetchone()['one']
+
+    try:
+        assert all(held)
+        assert asyncio.run(asyncio.wait_for(handler(), 5)) == 1
+    finally:
+        for _ in held:
+            db._connection_slots.release()
+    logger.info("✅ Event loop served with the worker pool exhausted")
+
+def test_threads_get_their_own_connections():
+    """Connections are per thread: another thread never receives one already in use"""
+    db = DatabaseManager()
+    seen = {}
+
+    def worker(name):
+        with db.get_connection() as conn:
+            seen[name] = conn
+
+    with db.get_connection() as conn:
+        thread = threading.Thread(target=worker, args=('other',))
+        thread.start()
+        thread.join()
+        assert seen['other'] is not conn and not conn.closed
+    logger.info("✅ Threads get their own connections")
+
+if __name__ == "__main__":
+    test_nested_calls_share_the_thread_connection()
+    test_nested_commit_leaves_the_transaction_to_the_caller()
+    test_event_loop_has_its_own_slots()
+    test_threads_get_their_own_connections()
+    logger.info("🎉 All connection slot tests passed!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+from unittest.mock import Mock, AsyncMock
+from datetime import datetime
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Chat
+from telegram.error import BadRequest
+from handlers.edit_coalescer import EditCoalescer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def make_query(message_id=1):
+    query = Mock()
+    query.message.chat_id = 42
+    query.message.message_id = message_id
+    query.edit_message_text = AsyncMock()
+    return query
+
+async def check_unchanged_edits_are_dropped():
+    edits = EditCoalescer()
+    query = make_query()
+    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh Again", callback_data="refresh_10")]])
+
+    await edits.edit(query, "<b>XI</b>", reply_markup=keyboard, parse_mode='HTML')
+    await edits.edit(query, "<b>XI</b>", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh Again", callback_data="refresh_10")]]), parse_mode='HTML')
+    assert query.edit_message_text.await_count == 1
+
+    await edits.edit(query, "<b>XI</b>", parse_mode='HTML')  # keyboard removed: a real change
+    await edits.edit(make_query(message_id=2), "<b>XI</b>", parse_mode='HTML')  # another message
+    assert query.edit_message_text.await_count == 2
+    assert (edits.calls_made, edits.calls_saved) == (3, 1)
+
+    query.edit_message_text.side_effect = BadRequest("Message is not modified: specified new message content is the same")
+    await edits.edit(query, "changed elsewhere")
+    query.edit_message_text.side_effect = BadRequest("Message to edit not found")
+    try:
+        await edits.edit(query, "gone")
+        raise AssertionError("other Telegram errors must propagate")
+    except BadRequest:
+        pass
+
+async def check_placeholder_only_for_slow_results():
+    edits = EditCoalescer(placeholder_budget=0.05)
+    query = make_query()
+
+    async def prediction(seconds):
+        await asyncio.sleep(seconds)
+        return {'starting_xi': []}
+
+    assert await edits.edit_when_ready(query, "🔄 Generating...", prediction(0)) == {'starting_xi': []}
+    assert query.edit_message_text.await_count == 0 and edits.calls_saved == 1
+
+    assert await edits.edit_when_ready(query, "🔄 Generating...", prediction(0.2)) == {'starting_xi': []}
+    assert query.edit_message_text.await_args.args == ("🔄 Generating...",)
+
+def tap_on(text, reply_markup=None, query_id='1'):
+    """A tap whose message shows text, as Telegram reports it with the callback query"""
+    query = Mock()
+    query.id = query_id
+    query.message = Message.de_json({
+        'message_id': 1, 'date': 0, 'chat': {'id': 42, 'type': 'private'}, 'text': text,
+        'reply_markup': reply_markup.to_dict() if reply_markup else None
+    }, None)
+    query.edit_message_text = AsyncMock()
+    return query
+
+async def check_edits_by_other_writers_are_seen():
+    edits = EditCoalescer()
+    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh Again", callback_data="refresh_10")]])
+
+    first = tap_on("Select a team", query_id='1')
+    await edits.edit(first, "XI", reply_markup=keyboard)
+    assert first.edit_message_text.await_count == 1
+
+    # another replica has since shown something else: the same edit must be sent again
+    second = tap_on("Matches of the weekend", query_id='2')
+    await edits.edit(second, "XI", reply_markup=keyboard)
+    assert second.edit_message_text.await_count == 1
+
+    # Telegram reports the edit on screen: nothing to do
+    third = tap_on("XI", keyboard, query_id='3')
+    await edits.edit(third, "XI", reply_markup=keyboard)
+    assert third.edit_message_text.await_count == 0
+
+    # edits made while handling a tap count over the message it came with
+    fourth = tap_on("XI", keyboard, query_id='4')
+    await edits.edit(fourth, "🔄 Generating...")
+    await edits.edit(fourth, "XI", reply_markup=keyboard)
+    assert fourth.edit_message_text.await_count == 2
+
+    inline = Mock(message=None, inline_message_id='inline-1', edit_message_text=AsyncMock())
+    await edits.edit(inline, "XI")
+    await edits.edit(inline, "XI")
+    assert inline.edit_message_text.await_count == 1
+
+def test_edit_coalescer():
+    """No-op edits and placeholders for results that are already there cost no Telegram call"""
+    asyncio.run(check_unchanged_edits_are_dropped())
+    asyncio.run(check_placeholder_only_for_slow_results())
+    asyncio.run(check_edits_by_other_writers_are_seen())
+    logger.info("✅ Redundant message edits skipped")
+
+if __name__ == "__main__":
+    test_edit_coalescer()
+    logger.info("🎉 All edit coalescer tests passed!")
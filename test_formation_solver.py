@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from analyzers.formation_solver import solve_formations
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def test_centre_back_covers_missing_right_back():
+    """With no right-back available, a spare centre-back fills the RB slot"""
+    codes = ['GK', 'CB', 'CB', 'CB', 'LB', 'DM', 'CM', 'CM', 'LW', 'CF', 'RW']
+    scores = [1.0] * len(codes)
+    solution = solve_formations(codes, scores, {'4-3-3': ['GK', 'LB', 'CB', 'CB', 'RB', 'DM', 'CM', 'CM', 'LW', 'CF', 'RW']})
+
+    assert solution['formation'] == '4-3-3'
+    rb_player = solution['players'][solution['slots'].index('RB')]
+    assert codes[rb_player] == 'CB'
+    assert abs(solution['score'] - (11.0 - 0.30)) < 1e-9
+    logger.info("✅ Centre-back assigned to RB with penalty")
+
+def test_assignment_beats_greedy_pick():
+    """A strong spare DM covering CB beats a weak natural CB that a per-position pick would take"""
+    codes = ['GK', 'CB', 'CB', 'LB', 'RB', 'DM', 'CM', 'CM', 'CM', 'LW', 'CF', 'RW', 'DM']
+    scores = [1.0, 0.2, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.1, 1.0, 1.0, 1.0, 0.9]
+    solution = solve_formations(codes, scores, {'4-3-3': ['GK', 'LB', 'CB', 'CB', 'RB', 'DM', 'CM', 'CM', 'LW', 'CF', 'RW']})
+
+    chosen = set(solution['players'])
+    assert 1 not in chosen and 8 not in chosen
+    assert solution['slots'][solution['players'].index(12)] == 'CB'
+    assert abs(solution['score'] - (10.0 + 0.9 - 0.30)) < 1e-9
+    logger.info("✅ Optimal assignment found")
+
+def test_runner_up_formations_are_reported():
+    """All feasible templates are scored, best first; infeasible ones are dropped"""
+    codes = ['GK', 'CB', 'CB', 'CB', 'LB', 'RB', 'DM', 'CM', 'CM', 'LW', 'CF', 'RW', 'CF']
+    solution = solve_formations(codes, [1.0] * len(codes))
+
+    scores = [entry['score'] for entry in solution['formation_scores']]
+    assert scores == sorted(scores, reverse=True)
+    assert solution['formation_scores'][0]['formation'] == solution['formation']
+    assert solve_formations(['CB'] * 11, [1.0] * 11) is None
+    logger.info(f"✅ Formation ranking: {solution['formation_scores']}")
+
+if __name__ == "__main__":
+    test_centre_back_covers_missing_right_back()
+    test_assignment_beats_greedy_pick()
+    test_runner_up_formations_are_reported()
+    logger.info("🎉 All formation solver tests passed!")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import date
+from bs4 import BeautifulSoup
+from fetchers.transfermarkt_scraper import TransfermarktScraper, INJURY_COLUMNS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def injury_row(player_id, name, position, injury, since, until):
+    """One row of a club's injury list (verletztenliste)"""
+    return (
+        f'<tr class="odd"><td class="posrela"><table class="inline-table"><tbody>'
+        f'<tr><td rowspan="2"><img/></td><td class="hauptlink"><a href="/x/profil/spieler/{player_id}">{name}</a></td></tr>'
+        f'<tr><td>{position}</td></tr></tbody></table></td>'
+        f'<td class="hauptlink">{injury}</td>'
+        f'<td class="zentriert">{since}</td>'
+        f'<td class="zentriert">{until}</td>'
+        f'<td class="rechts">31 days</td><td class="zentriert">4</td>'
+        f'<td class="rechts hauptlink">€12.00m</td></tr>'
+    )
+
+INJURY_PAGE = f"""
+<table class="items">
+  <thead><tr>
+    <th colspan="2">Player</th><th>Injury</th><th>since</th><th>until</th><th>Days</th>
+    <th><span title="Games missed">Games</span></th><th>Market value</th>
+  </tr></thead>
+  <tbody>
+    {injury_row(2001, 'Long Term', 'Centre-Forward', 'Cruciate ligament tear', 'Sep 12, 2025', 'Mar 1, 2026')}
+    {injury_row(2002, 'Open Ended', 'Left-Back', 'Knock', 'Oct 3, 2025', '?')}
+  </tbody>
+</table>
+"""
+
+def test_injury_rows_carry_parsed_dates():
+    """Start and expected return come back as dates, and an unknown return as None"""
+    scraper = TransfermarktScraper()
+    table = BeautifulSoup(INJURY_PAGE, 'html.parser').find('table', class_='items')
+    columns = scraper._column_offsets(table, INJURY_COLUMNS)
+    injuries = [scraper._parse_injury_row(row, columns) for row in table.tbody.find_all('tr', recursive=False)]
+
+    assert injuries[0] == {
+        'player_name': 'Long Term', 'player_transfermarkt_id': '2001', 'injury_description': 'Cruciate ligament tear',
+        'start_date': date(2025, 9, 12), 'expected_return_date': date(2026, 3, 1), 'status_type': 'injury'
+    }
+    assert injuries[1]['start_date'] == date(2025, 10, 3) and injuries[1]['expected_return_date'] is None
+    logger.info(f"✅ Parsed {len(injuries)} injuries with dates")
+
+if __name__ == "__main__":
+    test_injury_rows_carry_parsed_dates()
+    logger.info("🎉 All injury scraper tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import re
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from fetchers.social_client import JournalistTimelineClient
+from config import TRUSTED_JOURNALISTS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STUB_PAGE_SIZE = 3
+
+class StubSocialApi(BaseHTTPRequestHandler):
+    """Minimal recent-search endpoint: from: queries, since_id, next_token paging and author expansions"""
+    posts = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path != '/2/tweets/search/recent':
+            self.send_error(404)
+            return
+
+        handles = {handle.lower() for handle in re.findall(r'from:(\w+)', params['query'])}
+        since_id = int(params.get('since_id', 0))
+        matching = sorted(
+            (post for post in self.posts if post['username'].lower() in handles and int(post['id']) > since_id),
+            key=lambda post: -int(post['id'])
+        )
+        offset = int(params.get('next_token', 0))
+        page = matching[offset:offset + STUB_PAGE_SIZE]
+        body = {
+            'data': [{'id': p['id'], 'text': p['text'], 'author_id': f"u{p['username']}", 'created_at': '2025-10-18T09:30:00.000Z'} for p in page],
+            'includes': {'users': [{'id': f"u{p['username']}", 'username': p['username']} for p in page]},
+            'meta': {'result_count': len(page)}
+        }
+        if offset + STUB_PAGE_SIZE < len(matching):
+            body['meta']['next_token'] = str(offset + STUB_PAGE_SIZE)
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSocialApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_batches_fit_query_limit():
+    """All trusted journalists fit one query; a tight limit splits them without exceeding it"""
+    client = JournalistTimelineClient(base_url='http://127.0.0.1', bearer_token='test')
+    assert len(client.batches(TRUSTED_JOURNALISTS)) == 1
+
+    tight = JournalistTimelineClient(base_url='http://127.0.0.1', bearer_token='test', max_query_length=120)
+    batches = tight.batches(TRUSTED_JOURNALISTS)
+    assert len(batches) > 1 and sum(batches, []) == TRUSTED_JOURNALISTS
+    assert all(len(tight._query(batch)) <= 120 for batch in batches)
+    logger.info(f"✅ {len(TRUSTED_JOURNALISTS)} journalists in {len(batches)} batches under a 120-char limit")
+
+def test_cursors_fetch_only_new_posts():
+    """Cost follows new posts: a quiet poll is one request, and each post is ingested once"""
+    StubSocialApi.posts = [
+        {'id': str(1000 + i), 'username': TRUSTED_JOURNALISTS[i % 4], 'text': f"Team news {i}"} for i in range(7)
+    ]
+    server = start_stub()
+    try:
+        client = JournalistTimelineClient(base_url=f"http://127.0.0.1:{server.server_port}", bearer_token='test')
+        cursors = {handle: None for handle in TRUSTED_JOURNALISTS}
+
+        first, cursors = client.fetch_new_posts(cursors)
+        assert [post['id'] for post in first] == [str(1000 + i) for i in range(7)]
+        assert client.requests_made == 3  # 7 posts in pages of 3
+        assert set(cursors.values()) == {'1006'}
+
+        client.requests_made = 0
+        assert client.fetch_new_posts(cursors) == ([], cursors)
+        assert client.requests_made == 1
+
+        StubSocialApi.posts.append({'id': '2000', 'username': TRUSTED_JOURNALISTS[5], 'text': 'Starting XI confirmed'})
+        cursors[TRUSTED_JOURNALISTS[0]] = '900'  # an account behind the others does not re-ingest their posts
+        new, cursors = client.fetch_new_posts(cursors)
+        assert [post['id'] for post in new] == ['1000', '1004', '2000']
+        assert new[-1]['url'] == f"https://x.com/{TRUSTED_JOURNALISTS[5]}/status/2000"
+        assert set(cursors.values()) == {'2000'}
+        logger.info("✅ Only posts newer than each cursor were fetched")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_batches_fit_query_limit()
+    test_cursors_fetch_only_new_posts()
+    logger.info("🎉 All journalist client tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from bs4 import BeautifulSoup
+from fetchers.transfermarkt_scraper import TransfermarktScraper
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def lineup_box(first_id):
+    """Starting line-up box with eleven linked players"""
+    rows = ''.join(
+        f'<tr><td class="hauptlink"><a href="/player-{i}/profil/spieler/{i}" title="Player {i}">Player {i}</a></td></tr>'
+        for i in range(first_id, first_id + 11)
+    )
+    return f'<div class="box"><h2 class="content-box-headline">Starting Line-up: 4-3-3</h2><table>{rows}</table></div>'
+
+LINEUP_PAGE = f"""
+<div class="box"><h2 class="content-box-headline">Formation</h2></div>
+{lineup_box(100)}
+{lineup_box(200)}
+<div class="box"><h2 class="content-box-headline">Substitutes</h2>
+  <table><tr><td class="hauptlink"><a href="/x/profil/spieler/300">Bench</a></td></tr></table></div>
+"""
+
+REPORT_PAGE = """
+<div id="sb-wechsel"><ul>
+  <li class="sb-aktion-heim"><div class="sb-aktion">
+    <span class="sb-sprite-uhr-klein" style="background-position: -72px -216px;"></span>
+    <span class="sb-aktion-wechsel-ein"><a href="/x/profil/spieler/111" title="Sub 111">Sub 111</a></span>
+    <span class="sb-aktion-wechsel-aus"><a href="/x/profil/spieler/110">Player 110</a></span>
+  </div></li>
+  <li class="sb-aktion-gast"><div class="sb-aktion">
+    <span class="sb-sprite-uhr-klein" style="background-position: -0px -288px;"></span>
+    <span class="sb-aktion-wechsel-ein"><a href="/x/profil/spieler/211" title="Sub 211">Sub 211</a></span>
+    <span class="sb-aktion-wechsel-aus"><a href="/x/profil/spieler/205">Player 205</a></span>
+  </div></li>
+</ul></div>
+<div id="sb-karten"><ul>
+  <li class="sb-aktion-heim"><div class="sb-aktion">
+    <span class="sb-sprite-uhr-klein" style="background-position: -288px -252px;"></span>
+    <span class="sb-sprite sb-gelb"></span>
+    <span class="sb-aktion-aktion"><a href="/x/profil/spieler/101">Player 101</a></span>
+  </div></li>
+  <li class="sb-aktion-gast"><div class="sb-aktion">
+    <span class="sb-sprite-uhr-klein" style="background-position: -144px -36px;"></span>
+    <span class="sb-sprite sb-rot"></span>
+    <span class="sb-aktion-aktion"><a href="/x/profil/spieler/201">Player 201</a></span>
+  </div></li>
+</ul></div>
+"""
+
+def test_event_minutes_from_clock_sprite():
+    """Clock sprite offsets map to minutes: 10 cells per row, 36px each"""
+    scraper = TransfermarktScraper()
+    soup = BeautifulSoup(REPORT_PAGE, 'html.parser')
+    substitutions = scraper._parse_match_events(soup, 'sb-wechsel')
+    sendings_off = scraper._parse_match_events(soup, 'sb-karten')
+
+    assert [(e['side'], e['minute'], e['player_out']) for e in substitutions] == [('home', 63, '110'), ('away', 81, '205')]
+    assert [(e['side'], e['minute'], e['player_out']) for e in sendings_off] == [('away', 15, '201')]
+    logger.info("✅ Substitution and red card minutes parsed")
+
+def test_appearances_combine_lineups_and_events():
+    """Starters play until replaced or sent off; substitutes from when they came on"""
+    scraper = TransfermarktScraper()
+    starters = scraper._parse_starting_lineups(BeautifulSoup(LINEUP_PAGE, 'html.parser'))
+    assert len(starters['home']) == 11 and len(starters['away']) == 11
+    assert '300' not in [player_id for player_id, _ in starters['home'] + starters['away']]
+    assert scraper._parse_lineup_formations(BeautifulSoup(LINEUP_PAGE, 'html.parser')) == {'home': '4-3-3', 'away': '4-3-3'}
+
+    soup = BeautifulSoup(REPORT_PAGE, 'html.parser')
+    appearances = scraper._build_appearances(
+        starters, scraper._parse_match_events(soup, 'sb-wechsel'), scraper._parse_match_events(soup, 'sb-karten')
+    )
+    home = {a['transfermarkt_id']: a for a in appearances['home']}
+    away = {a['transfermarkt_id']: a for a in appearances['away']}
+
+    assert len(home) == 12 and len(away) == 12
+    assert home['100']['started'] and home['100']['minutes'] == 90
+    assert home['110']['minutes'] == 63
+    assert not home['111']['started'] and home['111']['minutes'] == 27
+    assert away['201']['minutes'] == 15
+    assert away['211']['minutes'] == 9
+    assert home['101']['minutes'] == 90
+    logger.info(f"✅ {len(home) + len(away)} appearances built with minutes played")
+
+def test_missing_lineups_return_none():
+    """A report without published line-ups is left for a later run"""
+    scraper = TransfermarktScraper()
+    assert scraper._parse_starting_lineups(BeautifulSoup('<div class="box"></div>', 'html.parser')) is None
+    logger.info("✅ Unpublished line-ups skipped")
+
+if __name__ == "__main__":
+    test_event_minutes_from_clock_sprite()
+    test_appearances_combine_lineups_and_events()
+    test_missing_lineups_return_none()
+    logger.info("🎉 All line-up ingestion tests passed!")
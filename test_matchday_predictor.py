@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime, timedelta
+from analyzers.matchday_predictor import MatchdayPredictor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SQUAD_POSITIONS = (
+    ['Goalkeeper'] * 2 + ['Centre-Back'] * 4 + ['Left-Back', 'Right-Back'] +
+    ['Defensive Midfield', 'Central Midfield', 'Central Midfield', 'Attacking Midfield'] +
+    ['Left Winger', 'Right Winger', 'Centre-Forward', 'Centre-Forward']
+)
+
+def build_squad():
+    """Build a synthetic squad where lower ids are the regular starters"""
+    squad = []
+    for i, position in enumerate(SQUAD_POSITIONS, 1):
+        squad.append({
+            'id': i,
+            'name': f"Player {i}",
+            'position': position,
+            'jersey_number': i,
+            'market_value': (40 - i) * 1000000,
+            'minutes_played': (30 - i) * 90,
+            'games_started': 30 - i,
+            'current_status': []
+        })
+    return squad
+
+def test_predict_team_picks_full_xi():
+    """A complete squad yields an XI with exactly one goalkeeper"""
+    predictor = MatchdayPredictor(db_manager=None)
+    prediction = predictor.predict_team(build_squad(), [], datetime.now() + timedelta(days=2))
+
+    assert not prediction.get('error')
+    assert len(prediction['starting_xi']) == 11
+    goalkeepers = [p for p in prediction['starting_xi'] if p['position'] == 'Goalkeeper']
+    assert [p['player_id'] for p in goalkeepers] == [1]
+    logger.info(f"✅ Predicted {prediction['formation']} with confidence {prediction['confidence_score']}")
+
+def test_injured_player_is_excluded_until_return():
+    """A player injured past kickoff is left out; one back before kickoff is available"""
+    predictor = MatchdayPredictor(db_manager=None)
+    kickoff = datetime.now() + timedelta(days=2)
+
+    squad = build_squad()
+    squad[0]['current_status'] = [{'status_type': 'injury', 'expected_return_date': (kickoff + timedelta(days=10)).date().isoformat()}]
+    prediction = predictor.predict_team(squad, [], kickoff)
+    assert 1 not in [p['player_id'] for p in prediction['starting_xi']]
+    assert prediction['unavailable_players'][0]['player_id'] == 1
+
+    squad[0]['current_status'] = [{'status_type': 'injury', 'expected_return_date': (kickoff - timedelta(days=1)).date().isoformat()}]
+    prediction = predictor.predict_team(squad, [], kickoff)
+    assert 1 in [p['player_id'] for p in prediction['starting_xi']]
+    logger.info("✅ Availability respects expected return dates")
+
+def test_incomplete_squad_reports_error():
+    """Too few players with known positions returns an error payload"""
+    predictor = MatchdayPredictor(db_manager=None)
+    prediction = predictor.predict_team(build_squad()[:8], [], datetime.now())
+
+    assert prediction.get('error')
+    logger.info("✅ Incomplete squad reported")
+
+def test_recent_form_breaks_season_tie():
+    """With identical season numbers, the keeper with recent starts is preferred over one just back from injury"""
+    predictor = MatchdayPredictor(db_manager=None)
+    kickoff = datetime.now() + timedelta(days=2)
+    squad = build_squad()
+    squad[1].update({key: squad[0][key] for key in ('market_value', 'minutes_played', 'games_started')})
+
+    form = {
+        'player_id': [1, 2],
+        'starts_last5': [0, 5],
+        'minutes_share_last5': [0.0, 1.0],
+        'last_start_date': [None, (kickoff - timedelta(days=4)).date()],
+        'injury_return_date': [(kickoff - timedelta(days=5)).date(), None]
+    }
+    prediction = predictor.predict_team(squad, [], kickoff, form=form)
+    goalkeepers = [p['player_id'] for p in prediction['starting_xi'] if p['position'] == 'Goalkeeper']
+    assert goalkeepers == [2]
+
+    scores = predictor.score_matchday({7: squad}, {}, {7: kickoff}, form=form)[7]
+    assert scores[2] > scores[1]
+    logger.info("✅ Feature store form separates otherwise equal players")
+
+def test_vectorised_scores_match_row_by_row():
+    """score_matchday gives every player of every team the score _score_players gives them"""
+    predictor = MatchdayPredictor(db_manager=None)
+    kickoff = datetime.now() + timedelta(days=2)
+    squads, news, kickoffs, team_forms = {}, {}, {}, {}
+    for team_id in (7, 8, 9):
+        squad = build_squad()
+        for offset, player in enumerate(squad):
+            player.update(id=team_id * 100 + player['id'], name=f"Player Surname{team_id}{offset}")
+            player['market_value'] = None if offset % 5 == 0 else player['market_value'] * team_id
+            player['minutes_played'] = (player['minutes_played'] * (team_id + offset)) % 2700
+        squad[2]['current_status'] = [{'status_type': 'injury', 'expected_return_date': (kickoff + timedelta(days=team_id)).date().isoformat()}]
+        squad[3]['current_status'] = [{'status_type': 'suspension', 'expected_return_date': None}]
+        squads[team_id], kickoffs[team_id] = squad, kickoff + timedelta(days=team_id - 7)
+        news[team_id] = [
+            {'player_id': squad[4]['id'], 'content': "Ruled out", 'sentiment': 'negative', 'relevance_score': 0.8},
+            {'player_id': None, 'content': f"Surname{team_id}5 fit again, surname{team_id}6 too", 'sentiment': 'positive', 'relevance_score': 0.6},
+            {'player_id': None, 'content': f"Surname{team_id}7 doubt", 'sentiment': 'negative', 'relevance_score': None},
+            {'player_id': None, 'content': f"Surname{team_id}5 trains alone", 'sentiment': 'neutral', 'relevance_score': 0.9}
+        ]
+        team_forms[team_id] = {
+            'player_id': [player['id'] for player in squad[::2]],
+            'starts_last5': [index % 6 for index in range(len(squad[::2]))],
+            'minutes_share_last5': [index / 10 for index in range(len(squad[::2]))],
+            'last_start_date': [(kickoff - timedelta(days=3 + 20 * index)).date() if index % 3 else None for index in range(len(squad[::2]))],
+            'injury_return_date': [(kickoff - timedelta(days=5)).date() if index == 1 else None for index in range(len(squad[::2]))]
+        }
+    form = {column: [value for team_form in team_forms.values() for value in team_form[column]] for column in team_forms[7]}
+
+    vectorised = predictor.score_matchday(squads, news, kickoffs, form=form)
+    for team_id, players in squads.items():
+        kickoff_date = predictor._kickoff_date(kickoffs[team_id])
+        available_ids = {p['id'] for p in players if not predictor._unavailability_reason(p, kickoff_date)}
+        row_by_row = predictor._score_players(
+            players, predictor._news_signals(players, news[team_id]), available_ids,
+            predictor._form_scores(players, team_forms[team_id], kickoff_date)
+        )
+        assert set(vectorised[team_id]) == set(row_by_row)
+        for player_id, score in row_by_row.items():
+            assert abs(vectorised[team_id][player_id] - score) < 1e-9, (team_id, player_id, score, vectorised[team_id][player_id])
+    logger.info(f"✅ Vectorised scores match row by row for {sum(len(p) for p in squads.values())} players")
+
+if __name__ == "__main__":
+    test_predict_team_picks_full_xi()
+    test_injured_player_is_excluded_until_return()
+    test_incomplete_squad_reports_error()
+    test_recent_form_breaks_season_tie()
+    test_vectorised_scores_match_row_by_row()
+    logger.info("🎉 All matchday predictor tests passed!")
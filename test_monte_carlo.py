@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import time
+from datetime import date
+from analyzers.monte_carlo import availability_probability, assignment_quotas, formation_quotas, simulate_start_probabilities
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GROUPS = ['GK', 'GK'] + ['DEF'] * 6 + ['MID'] * 5 + ['FWD'] * 4
+
+def build_team(availability=None):
+    """Synthetic 4-3-3 squad where earlier players in each group score higher"""
+    scores = [1.0 - 0.05 * i for i in range(len(GROUPS))]
+    predicted = [i in (0, 2, 3, 4, 5, 8, 9, 10, 13, 14, 15) for i in range(len(GROUPS))]
+    return {
+        'formation': '4-3-3',
+        'scores': scores,
+        'availability': availability or [0.98] * len(GROUPS),
+        'groups': GROUPS,
+        'predicted': predicted
+    }
+
+def test_availability_probability():
+    """Suspensions and long injuries rule a player out; near returns are doubts"""
+    kickoff = date(2025, 3, 1)
+    assert availability_probability([], kickoff) == 0.98
+    assert availability_probability([{'status_type': 'suspension', 'expected_return_date': None}], kickoff) == 0.0
+    assert availability_probability([{'status_type': 'injury', 'expected_return_date': '2025-03-20'}], kickoff) == 0.02
+    assert availability_probability([{'status_type': 'injury', 'expected_return_date': '2025-02-28'}], kickoff) == 0.6
+    assert availability_probability([{'status_type': 'injury', 'expected_return_date': None, 'severity': 'minor'}], kickoff) == 0.35
+    logger.info("✅ Availability probabilities follow status rules")
+
+def test_simulation_fills_quotas_and_tracks_doubts():
+    """Expected starters per group match the formation; a doubtful starter loses starts"""
+    baseline, doubtful = simulate_start_probabilities([
+        build_team(),
+        build_team([0.98, 0.98, 0.3] + [0.98] * (len(GROUPS) - 3))
+    ])
+
+    probabilities = baseline['start_probability']
+    assert abs(probabilities[:2].sum() - 1.0) < 0.01
+    assert abs(probabilities[2:8].sum() - 4.0) < 0.01
+    assert probabilities[0] > 0.5 > probabilities[1]
+    assert doubtful['start_probability'][2] < 0.35
+    assert doubtful['start_probability'][6] > baseline['start_probability'][6]
+    assert doubtful['xi_confidence'] < baseline['xi_confidence'] <= 1.0
+    logger.info(f"✅ XI confidence {baseline['xi_confidence']:.3f} vs {doubtful['xi_confidence']:.3f} with a doubt")
+
+def test_quotas_follow_the_solver_assignment():
+    """Wingers fielded in wide midfield slots keep their starts instead of losing them to bench midfielders"""
+    groups = ['GK', 'GK'] + ['DEF'] * 6 + ['MID'] * 4 + ['FWD'] * 5
+    predicted = [i in (0, 2, 3, 4, 5, 8, 9, 12, 13, 14, 15) for i in range(len(groups))]  # 4-4-2 with two wingers wide
+    team = {
+        'formation': '4-4-2',
+        'scores': [1.0 if starts else 0.5 for starts in predicted],
+        'availability': [0.98] * len(groups),
+        'groups': groups,
+        'predicted': predicted
+    }
+    assert formation_quotas('4-4-2') == [1, 4, 4, 2]
+    assert assignment_quotas(groups, predicted) == [1, 4, 2, 4]
+
+    by_formation, by_assignment = simulate_start_probabilities([team, dict(team, quotas=assignment_quotas(groups, predicted))])
+    assert abs(by_assignment['start_probability'][12:].sum() - 4.0) < 0.01
+    assert by_assignment['start_probability'][14] > 0.5 > by_formation['start_probability'][14]
+    assert by_assignment['xi_confidence'] > 0.9 > by_formation['xi_confidence']
+    logger.info(f"✅ XI confidence {by_assignment['xi_confidence']:.3f} with assignment quotas vs {by_formation['xi_confidence']:.3f}")
+
+def test_matchday_simulation_is_fast():
+    """A six-league matchday (120 teams) simulates well under a second"""
+    teams = [build_team() for _ in range(120)]
+    start = time.perf_counter()
+    results = simulate_start_probabilities(teams)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 120
+    assert elapsed < 1.0
+    logger.info(f"✅ 120 teams x 2000 draws simulated in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    test_availability_probability()
+    test_simulation_fills_quotas_and_tracks_doubts()
+    test_quotas_follow_the_solver_assignment()
+    test_matchday_simulation_is_fast()
+    logger.info("🎉 All Monte Carlo tests passed!")
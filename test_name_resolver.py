@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import time
+import logging
+from utils.name_resolver import NameResolver
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'tu', 'ne', 'sa', 'vo', 'di', 'be', 'gor', 'ian', 'ez', 'ski', 'son', 'ini']
+
+def build_resolver():
+    """Two real-looking clubs with aliases and players"""
+    resolver = NameResolver()
+    resolver.add('team', 1, 'Manchester United', 1)
+    resolver.add('team', 1, 'Man Utd', 1)
+    resolver.add('team', 2, 'Paris Saint-Germain', 2)
+    resolver.add('team', 2, 'PSG', 2)
+    resolver.add('player', 10, 'Bruno Fernandes', 1)
+    resolver.add('player', 11, 'Lisandro Martínez', 1)
+    resolver.add('player', 20, 'Ousmane Dembélé', 2)
+    resolver.add('player', 21, 'Lucas Hernández', 2)
+    resolver.add('player', 22, 'Théo Hernández', 2)
+    return resolver
+
+def test_resolves_variants_with_confidence():
+    """Aliases, transliterations and typos resolve; ambiguous and unrelated names do not"""
+    resolver = build_resolver()
+
+    assert resolver.resolve('psg')['id'] == 2
+    assert resolver.resolve('Paris St Germain', kind='team')['id'] == 2
+    assert resolver.resolve('Manchester Utd', kind='team')['id'] == 1
+    assert resolver.resolve('Dembele')['confidence'] == 1.0
+    typo = resolver.resolve('Bruno Fernandez', kind='player', team_id=1)
+    assert typo['id'] == 10 and 0.6 <= typo['confidence'] < 1.0
+    assert resolver.resolve('Hernandez', team_id=2) is None
+    assert resolver.resolve('Martinez', team_id=2) is None
+    assert resolver.resolve('Completely Different') is None
+    logger.info("✅ Fuzzy names resolved with confidence")
+
+def test_resolves_thousands_per_second():
+    """A six-league sized index answers thousands of noisy lookups per second"""
+    rng = random.Random(3)
+    resolver = NameResolver()
+    players = []
+    for team_id in range(120):
+        for _ in range(30):
+            name = ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(n)).title() for n in (2, 3))
+            players.append((len(players), team_id, name))
+            resolver.add('player', len(players) - 1, name, team_id)
+
+    queries = [rng.choice(players) for _ in range(5000)]
+    start = time.perf_counter()
+    resolved = [resolver.resolve(name[:-1], kind='player', team_id=team_id) for _, team_id, name in queries]
+    rate = len(queries) / (time.perf_counter() - start)
+
+    correct = sum(result is not None and result['id'] == player_id for (player_id, _, _), result in zip(queries, resolved))
+    assert correct / len(queries) > 0.95
+    assert rate > 2000, rate
+    logger.info(f"✅ {rate:,.0f} lookups/s, {correct}/{len(queries)} correct")
+
+if __name__ == "__main__":
+    test_resolves_variants_with_confidence()
+    test_resolves_thousands_per_second()
+    logger.info("🎉 All name resolver tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime
+from database.models import DatabaseManager, NEWS_CONTENT_HASH_SQL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+URL = 'https://example.com/dedup-test'
+VARIANTS = [
+    "Saka a doubt for Saturday's derby",
+    "SAKA a doubt for saturday's derby!",
+    "  Saka -- a doubt for Saturday’s   derby. ",
+    "Saka a doubt\nfor Saturday's\tderby"
+]
+
+def setup_team(db):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM leagues WHERE transfermarkt_id = 'DEDUP'")
+            cursor.execute("INSERT INTO leagues (name, transfermarkt_id, season) VALUES ('Dedup', 'DEDUP', '2025') RETURNING id")
+            league_id = cursor.fetchone()['id']
+            cursor.execute("INSERT INTO teams (name, league_id, transfermarkt_id) VALUES ('Dedup FC', %s, 'dedup') RETURNING id", (league_id,))
+            team_id = cursor.fetchone()['id']
+            conn.commit()
+            return league_id, team_id
+
+def teardown(db, league_id, team_id):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM news_mentions WHERE team_id = %s", (team_id,))
+            cursor.execute("DELETE FROM team_input_versions WHERE team_id = %s", (team_id,))
+            cursor.execute("DELETE FROM teams WHERE id = %s", (team_id,))
+            cursor.execute("DELETE FROM leagues WHERE id = %s", (league_id,))
+            conn.commit()
+
+def test_story_hash_ignores_case_punctuation_and_whitespace():
+    """Variants of one story from one URL share a hash; another URL or story does not"""
+    db = DatabaseManager()
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            hashes = set()
+            for content in VARIANTS:
+                cursor.execute(f"SELECT {NEWS_CONTENT_HASH_SQL.format(content='%s', url='%s')} AS hash", (content, URL))
+                hashes.add(cursor.fetchone()['hash'])
+            assert len(hashes) == 1
+
+            cursor.execute(f"SELECT {NEWS_CONTENT_HASH_SQL.format(content='%s', url='%s')} AS hash", (VARIANTS[0], URL + '/other'))
+            assert cursor.fetchone()['hash'] not in hashes
+            cursor.execute(f"SELECT {NEWS_CONTENT_HASH_SQL.format(content='%s', url='%s')} AS hash", ("Saka fit for the derby", URL))
+            assert cursor.fetchone()['hash'] not in hashes
+    logger.info(f"✅ {len(VARIANTS)} variants hash to one story")
+
+def test_duplicate_stories_are_stored_once():
+    """Saves skip stories a team already has, and compaction removes legacy duplicates"""
+    db = DatabaseManager()
+    db.init_database()
+    league_id, team_id = setup_team(db)
+    try:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('idx_news_mentions_team_content') IS NOT NULL AS present")
+                assert cursor.fetchone()['present']
+
+        mention = {'team_id': team_id, 'player_id': None, 'source_type': 'news', 'source_url': URL,
+                   'author': 'test', 'published_at': datetime(2025, 10, 18, 9, 30)}
+        assert db.save_news_mentions([dict(mention, content=content) for content in VARIANTS]) == 1
+        assert db.save_news_mentions([dict(mention, content=VARIANTS[2])]) == 0
+        assert db.save_news_mentions([dict(mention, content="Saka fit for the derby")]) == 1
+
+        # rows written before hashing existed have no hash and may repeat a story
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO news_mentions (team_id, source_type, source_url, content, published_at)
+                    VALUES (%s, 'news', %s, %s, NOW()), (%s, 'news', %s, %s, NOW())
+                """, (team_id, URL, VARIANTS[1], team_id, URL, "Brand new story"))
+                conn.commit()
+        assert db.compact_news_mentions() == 1
+        assert db.compact_news_mentions() == 0
+
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS stories FROM news_mentions WHERE team_id = %s", (team_id,))
+                assert cursor.fetchone()['stories'] == 3
+    finally:
+        teardown(db, league_id, team_id)
+    logger.info("✅ Duplicate stories stored once")
+
+if __name__ == "__main__":
+    test_story_hash_ignores_case_punctuation_and_whitespace()
+    test_duplicate_stories_are_stored_once()
+    logger.info("🎉 All news dedup tests passed!")
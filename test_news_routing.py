@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime
+from fetchers.news_feeds import NewsFeedFetcher
+from utils.mention_router import MentionRouter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENTRIES = [
+    {'kind': 'team', 'id': 1, 'team_id': 1, 'name': 'Manchester United'},
+    {'kind': 'team', 'id': 1, 'team_id': 1, 'name': 'Man Utd'},
+    {'kind': 'team', 'id': 2, 'team_id': 2, 'name': 'Real Madrid'},
+    {'kind': 'team', 'id': 3, 'team_id': 3, 'name': 'AC Milan'},
+    {'kind': 'player', 'id': 10, 'team_id': 1, 'name': 'Bruno Fernandes'},
+    {'kind': 'player', 'id': 11, 'team_id': 1, 'name': 'Lisandro Martínez'},
+    {'kind': 'player', 'id': 20, 'team_id': 2, 'name': 'Kylian Mbappé'},
+    {'kind': 'player', 'id': 30, 'team_id': 3, 'name': 'Theo Hernández'},
+    {'kind': 'player', 'id': 21, 'team_id': 2, 'name': 'Alejandro Fernandes'},
+    {'kind': 'team', 'id': 4, 'team_id': 4, 'name': 'Everton'},
+    {'kind': 'player', 'id': 40, 'team_id': 4, 'name': 'Ashley Young'},
+    {'kind': 'player', 'id': 41, 'team_id': 4, 'name': 'Harrison Will'},
+    {'kind': 'player', 'id': 50, 'team_id': 5, 'name': 'Chris Wood'},
+    {'kind': 'player', 'id': 51, 'team_id': 5, 'name': 'Joshua King'}
+]
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>
+  <language>en-gb</language>
+  <item>
+    <title>Mbappe doubtful for the weekend</title>
+    <link>https://example.com/a</link>
+    <description>&lt;p&gt;The forward picked up a knock in training.&lt;/p&gt;</description>
+    <pubDate>Sat, 18 Oct 2025 09:30:00 +0000</pubDate>
+    <dc:creator>Reporter</dc:creator>
+  </item>
+  <item>
+    <title>Man Utd v AC Milan: Fernandes and Martinez start, Hernandez on the bench</title>
+    <link>https://example.com/b</link>
+    <category>Premier League</category>
+  </item>
+</channel></rss>"""
+
+def test_feed_items_are_parsed_once():
+    """RSS items come back as plain-text articles with a naive publish time"""
+    items = NewsFeedFetcher(feeds={}).parse_feed('example', RSS)
+
+    assert [item['url'] for item in items] == ['https://example.com/a', 'https://example.com/b']
+    assert items[0]['content'] == 'Mbappe doubtful for the weekend. The forward picked up a knock in training.'
+    assert items[0]['author'] == 'Reporter' and items[1]['author'] == 'example'
+    assert isinstance(items[0]['published_at'], datetime) and items[0]['published_at'].tzinfo is None
+    assert {item['language'] for item in items} == {'en-gb'}
+    logger.info(f"✅ Parsed {len(items)} feed items")
+
+def test_articles_route_to_every_named_team_and_player():
+    """One pass finds all teams and players; bare surnames need team context"""
+    router = MentionRouter.from_entries(ENTRIES)
+    items = NewsFeedFetcher(feeds={}).parse_feed('example', RSS)
+
+    assert router.route(items[0]['content']) == {}
+    assert router.route(items[0]['content'], team_ids={2}) == {2: 20}
+    assert router.route('Real Madrid: Mbappe doubtful') == {2: 20}
+    assert router.route(items[1]['content']) == {1: None, 3: 30}
+    assert router.route('Bruno Fernandes signs a new deal') == {1: 10}
+    assert router.route('Fernandes signs a new deal') == {}
+    assert router.route('Fernandes signs a new deal', team_ids={2}) == {2: 21}
+    assert router.route('A quiet week at the training ground') == {}
+    logger.info("✅ Articles routed to teams and players")
+
+def test_common_word_surnames_do_not_route():
+    """Surnames that are ordinary words need a capitalised word and the team in context"""
+    router = MentionRouter.from_entries(ENTRIES)
+
+    assert router.route('Young players shine as ticket prices rise at Wembley') == {}
+    assert router.route('Wood and King will be fit, the manager said') == {}
+    assert router.route('Everton: young players shine, the kids will start') == {4: None}
+    assert router.route('Everton boss praises Young') == {4: 40}
+    assert router.route('Young starts at right back', team_ids={4}) == {4: 40}
+    assert router.route('Ashley Young starts at right back') == {4: 40}
+    assert router.route('King out injured', team_ids={4}) == {4: None}
+    logger.info("✅ Common-word surnames ignored without team context")
+
+if __name__ == "__main__":
+    test_feed_items_are_parsed_once()
+    test_articles_route_to_every_named_team_and_player()
+    test_common_word_surnames_do_not_route()
+    logger.info("🎉 All news routing tests passed!")
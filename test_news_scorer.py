@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from analyzers.news_scorer import NewsScorer, NO_HIT_RELEVANCE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MENTIONS = [
+    ("Saka a doubt with a hamstring injury", 'english', 'negative'),
+    ("Mbappé vuelve tras su lesión", 'spanish', 'positive'),
+    ("Leão squalificato per la prossima giornata", 'italian', 'negative'),
+    ("Musiala fällt mit einer Muskelverletzung aus", 'german', 'negative'),
+    ("Dembélé de retour à l'entraînement", 'french', 'positive'),
+    ("Нападающий вернётся после травмы", 'russian', 'positive'),
+    ("Rabiot forfait, blessé à la cuisse", 'simple', 'negative'),
+    ("Transfer talk: club eyes new striker", 'english', 'neutral')
+]
+
+def test_scores_availability_terms_in_every_language():
+    """Injury, doubt and suspension terms read negative, returns positive, other news neutral"""
+    scores = NewsScorer().score([{'content': content, 'search_config': config} for content, config, _ in MENTIONS])
+
+    assert [sentiment for sentiment, _ in scores] == [expected for _, _, expected in MENTIONS]
+    assert scores[-1][1] == NO_HIT_RELEVANCE  # no terms: weaker, but never zero
+    assert scores[0][1] > scores[2][1] > 0  # two terms are more relevant than one
+    logger.info(f"✅ {len(MENTIONS)} mentions scored across languages")
+
+def test_language_scopes_the_vocabulary():
+    """A word is only a term in its mention's language; unknown configs use every language"""
+    scorer = NewsScorer()
+    assert scorer.score([{'content': 'Alta de Pedri', 'search_config': 'spanish'}]) == [('positive', 0.5)]
+    assert scorer.score([{'content': 'Alta de Pedri', 'search_config': 'english'}]) == [('neutral', NO_HIT_RELEVANCE)]
+    assert scorer.score([{'content': 'Pedri recibe el alta', 'search_config': None}]) == [('positive', 0.5)]
+    assert scorer.score([]) == []
+    logger.info("✅ Vocabulary follows the mention language")
+
+if __name__ == "__main__":
+    test_scores_availability_terms_in_every_language()
+    test_language_scopes_the_vocabulary()
+    logger.info("🎉 All news scorer tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from utils.player_identity import PlayerIdentityIndex, player_name_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PLAYERS = [
+    {'id': 1, 'team_id': 10, 'transfermarkt_id': '342229', 'name': 'Kylian Mbappé', 'market_value': 180000000},
+    {'id': 2, 'team_id': 10, 'transfermarkt_id': '8198', 'name': 'Martin Ødegaard', 'market_value': 100000000},
+    {'id': 3, 'team_id': 10, 'transfermarkt_id': '3333', 'name': "N'Golo Kanté", 'market_value': 5000000},
+    {'id': 4, 'team_id': 10, 'transfermarkt_id': '4444', 'name': 'Lucas Hernández', 'market_value': 40000000},
+    {'id': 5, 'team_id': 10, 'transfermarkt_id': '5555', 'name': 'Theo Hernández', 'market_value': 50000000},
+    {'id': 6, 'team_id': 20, 'transfermarkt_id': '6666', 'name': 'Kylian Mbappe', 'market_value': 1000000}
+]
+
+def test_folded_name_keys():
+    """Accents, case, apostrophes and token order do not change the key"""
+    assert player_name_key('Kylian Mbappé') == player_name_key('MBAPPE Kylian') == 'kylian mbappe'
+    assert player_name_key('Martin Ødegaard') == 'martin odegaard'
+    assert player_name_key("N'Golo Kanté") == player_name_key('Ngolo Kante')
+    assert player_name_key('Jean-Philippe Mateta') == 'jean mateta philippe'
+    logger.info("✅ Name keys fold accents and order")
+
+def test_index_matches_without_queries():
+    """Transfermarkt id wins, then folded names, abbreviations and unique surnames; ambiguous names never match"""
+    index = PlayerIdentityIndex(PLAYERS)
+    records = [
+        {'player_transfermarkt_id': '8198', 'player_name': 'Somebody Else'},
+        {'player_name': 'Kylian Mbappe'},
+        {'player_name': 'K. Mbappé'},
+        {'player_name': 'Kanté'},
+        {'player_name': 'Hernandez'},
+        {'player_name': 'T. Hernandez'},
+        {'player_name': 'Unknown Player'}
+    ]
+    matched = index.match(10, records)
+
+    assert [player_id for player_id, _ in matched] == [2, 1, 1, 3, 5]
+    assert index.resolve(20, name='Kylian Mbappé') == (6, 'full_name')
+    assert index.resolve(10, name='Hernandez') == (None, 'surname')
+
+    report = index.report("Test")
+    assert report['matched'] == {'transfermarkt_id': 1, 'full_name': 1, 'initial_surname': 2, 'surname': 1}
+    assert [name for _, name in report['unmatched']] == ['Hernandez', 'Unknown Player']
+    logger.info("✅ Identity index matched 5/7 references")
+
+if __name__ == "__main__":
+    test_folded_name_keys()
+    test_index_matches_without_queries()
+    logger.info("🎉 All player identity tests passed!")
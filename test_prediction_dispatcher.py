@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import time
+import logging
+from utils.prediction_dispatcher import PredictionDispatcher
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SlowPredictor:
+    """Blocking stand-in for predict_lineup that records how often and how concurrently it runs"""
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def predict(self, match_id, team_id):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.running -= 1
+        return {'match_id': match_id, 'team_id': team_id}
+
+async def check_concurrent_callers_share_one_computation():
+    """A crowd opening the same team costs one prediction, and the event loop keeps ticking meanwhile"""
+    dispatcher = PredictionDispatcher(max_workers=2)
+    predictor = SlowPredictor(seconds=0.2)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    results = await asyncio.gather(*[dispatcher.run((1, 10), predictor.predict, 1, 10) for _ in range(100)])
+    beat.cancel()
+
+    assert predictor.calls == 1
+    assert all(result == {'match_id': 1, 'team_id': 10} for result in results)
+    assert ticks >= 10, ticks  # a blocked loop would not have ticked at all
+    stats = dispatcher.stats()
+    assert stats['started'] == 1 and stats['coalesced'] == 99 and stats['in_flight'] == 0
+    dispatcher.shutdown()
+    logger.info(f"✅ 100 callers, 1 computation, {ticks} loop ticks meanwhile")
+
+async def check_workers_are_bounded_and_failures_release_the_key():
+    """Distinct teams queue behind a fixed number of workers; a failed flight is retried by the next caller"""
+    dispatcher = PredictionDispatcher(max_workers=3)
+    predictor = SlowPredictor()
+    await asyncio.gather(*[dispatcher.run((1, team_id), predictor.predict, 1, team_id) for team_id in range(12)])
+    assert predictor.calls == 12 and predictor.max_running == 3
+    stats = dispatcher.stats()
+    assert stats['queued'] == 0 and stats['running'] == 0 and stats['wait_ms_max'] >= 100
+
+    def broken(match_id, team_id):
+        raise RuntimeError('squad missing')
+
+    outcomes = await asyncio.gather(*[dispatcher.run((2, 20), broken, 2, 20) for _ in range(5)], return_exceptions=True)
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert dispatcher.stats()['failed'] == 1
+    assert await dispatcher.run((2, 20), predictor.predict, 2, 20) == {'match_id': 2, 'team_id': 20}
+    dispatcher.shutdown()
+    logger.info(f"✅ 12 teams on 3 workers, queue wait p95 {stats['wait_ms_p95']} ms")
+
+def test_prediction_dispatcher():
+    asyncio.run(check_concurrent_callers_share_one_computation())
+    asyncio.run(check_workers_are_bounded_and_failures_release_the_key())
+
+if __name__ == "__main__":
+    test_prediction_dispatcher()
+    logger.info("🎉 All prediction dispatcher tests passed!")
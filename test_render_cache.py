@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime
+from database.models import DatabaseManager
+from utils.render_cache import RenderCache, prediction_version
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PREDICTION = {'id': 7, 'match_id': 1, 'team_id': 10, 'input_version': 3, 'updated_at': datetime(2025, 10, 18, 9, 30)}
+
+def test_entries_follow_the_prediction_version():
+    """A hit needs the same prediction row; a re-stamped or re-saved prediction misses"""
+    cache = RenderCache()
+    cache.put(1, 10, 'view', prediction_version(PREDICTION), '<b>XI</b>', 'keyboard')
+
+    assert cache.get(1, 10, 'view') == ('<b>XI</b>', 'keyboard')
+    assert cache.get(1, 10, 'view', prediction_version(PREDICTION)) == ('<b>XI</b>', 'keyboard')
+    assert cache.get(1, 10, 'view', prediction_version(dict(PREDICTION, input_version=4))) is None
+    assert cache.get(1, 10, 'view', prediction_version(dict(PREDICTION, id=8))) is None
+    assert cache.get(1, 10, 'refresh') is None
+    assert (cache.hits, cache.misses) == (2, 3)
+    logger.info("✅ Rendered messages keyed by prediction version")
+
+def test_saving_a_prediction_invalidates_its_views():
+    """Saves reach the cache through the database listener hook; other pairs and old entries are bounded"""
+    db = DatabaseManager()
+    cache = RenderCache(max_entries=3)
+    db.prediction_listeners.append(cache.invalidate)
+    for view in ('view', 'refresh'):
+        cache.put(1, 10, view, prediction_version(PREDICTION), 'text', None)
+    cache.put(1, 11, 'view', None, 'other team', None)
+
+    db._predictions_saved([(1, 10)])
+    assert cache.get(1, 10, 'view') is None and cache.get(1, 10, 'refresh') is None
+    assert cache.get(1, 11, 'view') == ('other team', None)
+
+    for match_id in range(2, 6):
+        cache.put(match_id, 10, 'view', None, 'text', None)
+    assert cache.get(1, 11, 'view') is None and cache.get(5, 10, 'view') is not None
+    logger.info("✅ Saved predictions drop their rendered views")
+
+if __name__ == "__main__":
+    test_entries_follow_the_prediction_version()
+    test_saving_a_prediction_invalidates_its_views()
+    logger.info("🎉 All render cache tests passed!")
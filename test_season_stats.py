@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from bs4 import BeautifulSoup
+from fetchers.transfermarkt_scraper import TransfermarktScraper, PERFORMANCE_COLUMNS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def player_cell(player_id, name):
+    """Player column as Transfermarkt renders it: a nested inline table"""
+    return (
+        f'<td class="posrela"><table class="inline-table"><tbody><tr><td rowspan="2"><img/></td>'
+        f'<td class="hauptlink"><a href="/x/profil/spieler/{player_id}">{name}</a></td></tr>'
+        f'<tr><td>Centre-Back</td></tr></tbody></table></td>'
+    )
+
+PERFORMANCE_PAGE = f"""
+<table class="items">
+  <thead><tr>
+    <th>#</th><th colspan="2">Player</th><th>Age</th><th>Nat.</th>
+    <th><span title="In squad">In squad</span></th>
+    <th><span title="Appearances">Apps</span></th>
+    <th><span title="Goals">G</span></th>
+    <th><span title="Substitutions on">On</span></th>
+    <th><span title="Substitutions off">Off</span></th>
+    <th><span title="Minutes played">Min</span></th>
+  </tr></thead>
+  <tbody>
+    <tr><td>4</td>{player_cell(1001, 'Regular Starter')}<td>27</td><td></td><td>10</td><td>9</td><td>1</td><td>1</td><td>2</td><td>1.234'</td></tr>
+    <tr><td>14</td>{player_cell(1002, 'Impact Sub')}<td>22</td><td></td><td>10</td><td>6</td><td>-</td><td>5</td><td>-</td><td>187'</td></tr>
+    <tr><td>30</td>{player_cell(1003, 'Third Keeper')}<td>19</td><td></td><td colspan="6">Not used during this season</td></tr>
+  </tbody>
+</table>
+"""
+
+def test_performance_table_parsed_in_one_pass():
+    """Appearances, starts and minutes come from header-matched columns, counted from the right"""
+    scraper = TransfermarktScraper()
+    table = BeautifulSoup(PERFORMANCE_PAGE, 'html.parser').find('table', class_='items')
+    columns = scraper._column_offsets(table, PERFORMANCE_COLUMNS)
+    stats = {
+        row['transfermarkt_id']: row
+        for row in (scraper._parse_performance_row(tr, columns) for tr in table.tbody.find_all('tr', recursive=False))
+        if row
+    }
+
+    assert stats['1001'] == {'transfermarkt_id': '1001', 'name': 'Regular Starter', 'appearances': 9, 'starts': 8, 'minutes_played': 1234}
+    assert stats['1002']['starts'] == 1 and stats['1002']['minutes_played'] == 187
+    assert stats['1003']['appearances'] == 0 and stats['1003']['minutes_played'] == 0
+    logger.info(f"✅ Parsed season stats for {len(stats)} players")
+
+if __name__ == "__main__":
+    test_performance_table_parsed_in_one_pass()
+    logger.info("🎉 All season stats tests passed!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from bs4 import BeautifulSoup
+from fetchers.transfermarkt_scraper import TransfermarktScraper, SQUAD_COLUMNS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def squad_row(number, player_id, name, position, birth, nationality, contract, value):
+    """One row of the detailed squad view (kader/.../plus/1)"""
+    return (
+        f'<tr class="odd"><td class="zentriert rueckennummer"><div class="rn_nummer">{number}</div></td>'
+        f'<td class="posrela"><table class="inline-table"><tbody>'
+        f'<tr><td rowspan="2"><img/></td><td class="hauptlink"><a href="/x/profil/spieler/{player_id}">{name}</a></td></tr>'
+        f'<tr><td>{position}</td></tr></tbody></table></td>'
+        f'<td class="zentriert">{birth}</td>'
+        f'<td class="zentriert">{nationality}</td>'
+        f'<td class="zentriert">1,85m</td><td class="zentriert">right</td>'
+        f'<td class="zentriert">Jul 1, 2022</td><td class="zentriert"><a title="Previous Club"><img/></a></td>'
+        f'<td class="zentriert">{contract}</td>'
+        f'<td class="rechts hauptlink"><a href="/x/marktwertverlauf/spieler/{player_id}">{value}</a></td></tr>'
+    )
+
+SQUAD_PAGE = f"""
+<table class="items">
+  <thead><tr>
+    <th>#</th><th colspan="2">Player</th><th>Date of birth/Age</th><th>Nat.</th><th>Height</th><th>Foot</th>
+    <th>Joined</th><th>Signed from</th><th>Contract</th><th>Market value</th>
+  </tr></thead>
+  <tbody>
+    {squad_row(1, 1001, 'First Keeper', 'Goalkeeper', 'Feb 2, 1995 (30)',
+               '<img title="Brazil" class="flaggenrahmen"/><br/><img title="Portugal" class="flaggenrahmen"/>', 'Jun 30, 2027', '€25.00m')}
+    {squad_row(44, 1002, 'Academy Defender', 'Centre-Back', 'Mar 9, 2007 (18)', '<img title="England" class="flaggenrahmen"/>', '-', '€500k')}
+  </tbody>
+</table>
+"""
+
+def test_detailed_squad_row_carries_full_attributes():
+    """Age, nationality, contract and market value come from the same table as name and position"""
+    scraper = TransfermarktScraper()
+    table = BeautifulSoup(SQUAD_PAGE, 'html.parser').find('table', class_='items')
+    columns = scraper._column_offsets(table, SQUAD_COLUMNS)
+    players = [scraper._parse_player_row(row, columns) for row in table.tbody.find_all('tr', class_=['odd', 'even'], recursive=False)]
+
+    assert players[0] == {
+        'name': 'First Keeper', 'transfermarkt_id': '1001', 'position': 'Goalkeeper', 'jersey_number': 1,
+        'market_value': 25000000, 'age': 30, 'nationality': 'Brazil', 'contract_end_year': 2027
+    }
+    assert players[1]['age'] == 18 and players[1]['contract_end_year'] is None and players[1]['market_value'] == 500000
+    logger.info(f"✅ Parsed {len(players)} players with full attributes")
+
+if __name__ == "__main__":
+    test_detailed_squad_row_carries_full_attributes()
+    logger.info("🎉 All squad scraper tests passed!")
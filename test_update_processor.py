@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+from telegram import Update, CallbackQuery, User
+from utils.update_processor import PerUserUpdateProcessor, BackpressureQueue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def tap(update_id, user_id):
+    return Update(update_id, callback_query=CallbackQuery(str(update_id), User(user_id, 'User', False), 'chat', data='tap'))
+
+async def check_orders_per_user_and_bounds_workers():
+    """Each user's taps run one at a time in arrival order; different users overlap up to max_workers"""
+    processor = PerUserUpdateProcessor(max_workers=3, max_backlog=100)
+    running, peak, handled = set(), [0], {}
+
+    async def handle(update, delay):
+        user_id = update.effective_user.id
+        assert user_id not in running, "two updates of one user ran at once"
+        running.add(user_id)
+        peak[0] = max(peak[0], len(running))
+        await asyncio.sleep(delay)
+        handled.setdefault(user_id, []).append(update.update_id)
+        running.discard(user_id)
+
+    # user 1 taps three times, the first tap slow; users 2..6 tap once each
+    updates = [(tap(1, 1), 0.05), (tap(2, 1), 0.0), (tap(3, 1), 0.0)] + [(tap(10 + u, u), 0.01) for u in range(2, 7)]
+    await asyncio.gather(*[processor.process_update(update, handle(update, delay)) for update, delay in updates])
+
+    assert handled[1] == [1, 2, 3]
+    assert all(handled[u] == [10 + u] for u in range(2, 7))
+    assert peak[0] == 3
+    assert processor.counts == {'processed': 8, 'waited_for_user': 2}
+    assert processor.stats()['busy_users'] == 0
+    logger.info("✅ Per-user order kept with 3 users running at once")
+
+async def check_backpressure_holds_put():
+    """put waits while the backlog is full and resumes once an update is done"""
+    queue = BackpressureQueue(max_backlog=2)
+    await queue.put('a')
+    await queue.put('b')
+    blocked = asyncio.ensure_future(queue.put('c'))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and queue.throttled == 1
+
+    queue.get_nowait()
+    await asyncio.sleep(0.01)
+    assert not blocked.done()  # taken off the queue but still being processed
+
+    queue.task_done()
+    await asyncio.wait_for(blocked, 1)
+    assert queue.backlog == 2 and queue.qsize() == 2
+    logger.info("✅ Ingress held until an update finished")
+
+def test_orders_per_user_and_bounds_workers():
+    asyncio.run(check_orders_per_user_and_bounds_workers())
+
+def test_backpressure_holds_put():
+    asyncio.run(check_backpressure_holds_put())
+
+if __name__ == "__main__":
+    test_orders_per_user_and_bounds_workers()
+    test_backpressure_holds_put()
+    logger.info("🎉 All update processor tests passed!")
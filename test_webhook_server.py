@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+import httpx
+from telegram import Bot
+from utils.webhook_server import WebhookServer, SECRET_HEADER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SECRET = 'test-secret'
+
+# A button press as Telegram delivers it
+RECORDED_UPDATE = {
+    'update_id': 815300001,
+    'callback_query': {
+        'id': '4382010001',
+        'from': {'id': 1001, 'is_bot': False, 'first_name': 'Ana', 'language_code': 'en'},
+        'message': {
+            'message_id': 52,
+            'from': {'id': 999, 'is_bot': True, 'first_name': 'Lineup Bot', 'username': 'lineup_bot'},
+            'chat': {'id': 1001, 'type': 'private', 'first_name': 'Ana'},
+            'date': 1760860800,
+            'text': 'Please select a league:'
+        },
+        'chat_instance': '-7126312',
+        'data': '1.L.GB1...abcdefgh'
+    }
+}
+
+async def check_queues_recorded_updates():
+    """A recorded update POSTed with the secret is queued; wrong secrets, bad JSON and unknown paths are not"""
+    queue = asyncio.Queue()
+    server = WebhookServer(Bot('123456:TEST'), queue, listen='127.0.0.1', port=0, secret_token=SECRET)
+    await server.start()
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+            response = await client.post('/telegram', json=RECORDED_UPDATE, headers={SECRET_HEADER: SECRET})
+            assert response.status_code == 200 and response.json() == {'ok': True}
+            update = queue.get_nowait()
+            assert update.update_id == RECORDED_UPDATE['update_id']
+            assert update.callback_query.data == RECORDED_UPDATE['callback_query']['data']
+            assert update.effective_user.id == 1001
+
+            assert (await client.post('/telegram', json=RECORDED_UPDATE)).status_code == 403
+            assert (await client.post('/telegram', json=RECORDED_UPDATE, headers={SECRET_HEADER: 'guess'})).status_code == 403
+            assert (await client.post('/telegram', content=b'{not json', headers={SECRET_HEADER: SECRET})).status_code == 400
+            assert (await client.post('/elsewhere', json=RECORDED_UPDATE, headers={SECRET_HEADER: SECRET})).status_code == 404
+            assert (await client.get('/telegram')).status_code == 405
+            assert queue.empty()
+
+            health = await client.get('/healthz')
+            assert health.status_code == 200
+            assert health.json()['ok'] and health.json()['received'] == 1 and health.json()['rejected'] == 3
+    finally:
+        await server.stop()
+    logger.info("✅ Recorded update queued, bad requests rejected")
+
+async def check_keeps_connections_alive():
+    """Consecutive deliveries reuse one connection, as Telegram's do"""
+    queue = asyncio.Queue()
+    server = WebhookServer(Bot('123456:TEST'), queue, listen='127.0.0.1', port=0, secret_token=SECRET)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        for offset in range(3):
+            body = httpx.Request('POST', 'http://x', json={**RECORDED_UPDATE, 'update_id': 1 + offset}).read()
+            writer.write(
+                f"POST /telegram HTTP/1.1\r\nHost: bot\r\n{SECRET_HEADER}: {SECRET}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            assert (await reader.readline()).startswith(b'HTTP/1.1 200')
+            while (await reader.readline()) != b'\r\n':
+                pass
+            await reader.readexactly(len(b'{"ok": true}'))
+        writer.close()
+        assert [queue.get_nowait().update_id for _ in range(3)] == [1, 2, 3]
+    finally:
+        await server.stop()
+    logger.info("✅ Three updates delivered over one connection")
+
+def test_queues_recorded_updates():
+    asyncio.run(check_queues_recorded_updates())
+
+def test_keeps_connections_alive():
+    asyncio.run(check_keeps_connections_alive())
+
+if __name__ == "__main__":
+    test_queues_recorded_updates()
+    test_keeps_connections_alive()
+    logger.info("🎉 All webhook server tests passed!")
@@ -0,0 +1,109 @@
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import LEAGUES, PIPELINE_MAX_WORKERS, BROWSER_SLOTS, HTTP_SLOTS
+
+logger = logging.getLogger(__name__)
+
+class ResourceSlots:
+    """Named concurrency limits shared by every league worker (browser, http, ...)"""
+    def __init__(self, limits=None):
+        limits = limits or {'browser': BROWSER_SLOTS, 'http': HTTP_SLOTS}
+        self.limits = dict(limits)
+        self._semaphores = {name: threading.BoundedSemaphore(size) for name, size in self.limits.items()}
+        self._wait_lock = threading.Lock()
+        self._wait_seconds = {name: 0.0 for name in self.limits}
+
+    @contextmanager
+    def slot(self, resource):
+        """Hold one slot of a resource for the duration of the block"""
+        semaphore = self._semaphores[resource]
+        wait_start = time.time()
+        semaphore.acquire()
+        waited = time.time() - wait_start
+        with self._wait_lock:
+            self._wait_seconds[resource] += waited
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def take_wait_times(self):
+        """Return and reset the accumulated time workers spent waiting for each resource"""
+        with self._wait_lock:
+            wait_seconds = dict(self._wait_seconds)
+            self._wait_seconds = {name: 0.0 for name in self.limits}
+        return wait_seconds
+
+class LeaguePipeline:
+    """Fan per-league work out over a bounded thread pool"""
+    def __init__(self, resources=None, max_workers=PIPELINE_MAX_WORKERS):
+        self.resources = resources or ResourceSlots()
+        self.max_workers = max_workers
+
+    def run(self, stage_name, league_task, leagues=None):
+        """Run league_task(league_key, league_info) for every league and report timings.
+
+        A failing league is logged and recorded in the report; it never stops the
+        other leagues. Returns a dict with per-league results and the cycle's
+        wall time, serial time (sum of league durations) and critical path.
+        """
+        leagues = leagues or LEAGUES
+        self.resources.take_wait_times()
+        cycle_start = time.time()
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"league-{stage_name}") as executor:
+            futures = {
+                executor.submit(self._run_league, league_task, league_key, league_info): league_key
+                for league_key, league_info in leagues.items()
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        wall_time = time.time() - cycle_start
+        report = self._build_report(stage_name, results, wall_time)
+        self._log_report(report)
+        return report
+
+    def _run_league(self, league_task, league_key, league_info):
+        """Run one league's task, capturing its outcome and duration"""
+        start_time = time.time()
+        try:
+            result = league_task(league_key, league_info)
+            return {'ok': True, 'result': result, 'error': None, 'duration': time.time() - start_time}
+        except Exception as e:
+            logger.error(f"❌ {league_info['name']} failed: {e}")
+            return {'ok': False, 'result': None, 'error': str(e), 'duration': time.time() - start_time}
+
+    def _build_report(self, stage_name, results, wall_time):
+        """Summarise a cycle: slowest league, serial vs wall time, resource waits"""
+        serial_time = sum(r['duration'] for r in results.values())
+        critical_league = max(results, key=lambda key: results[key]['duration']) if results else None
+        return {
+            'stage': stage_name,
+            'results': results,
+            'wall_time': wall_time,
+            'serial_time': serial_time,
+            'critical_league': critical_league,
+            'critical_path': results[critical_league]['duration'] if critical_league else 0.0,
+            'failed': [key for key, r in results.items() if not r['ok']],
+            'resource_wait': self.resources.take_wait_times()
+        }
+
+    def _log_report(self, report):
+        """Log per-league durations and the cycle's critical path"""
+        for league_key, result in sorted(report['results'].items(), key=lambda item: -item[1]['duration']):
+            status = "✅" if result['ok'] else "❌"
+            logger.info(f"{status} [{report['stage']}] {league_key}: {result['duration']:.1f}s")
+
+        speedup = report['serial_time'] / report['wall_time'] if report['wall_time'] > 0 else 1.0
+        waits = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in report['resource_wait'].items())
+        logger.info(
+            f"⏱️ [{report['stage']}] wall {report['wall_time']:.1f}s, "
+            f"critical path {report['critical_path']:.1f}s ({report['critical_league']}), "
+            f"serial {report['serial_time']:.1f}s, speedup x{speedup:.1f}, "
+            f"slot waits: {waits}, failed: {len(report['failed'])}"
+        )
@@ -0,0 +1,133 @@
+import re
+import logging
+from collections import deque
+from utils.player_identity import name_tokens
+
+logger = logging.getLogger(__name__)
+
+MIN_SURNAME_LENGTH = 4  # shorter surnames are too often ordinary words to route on their own
+WORD_PATTERN = re.compile(r"[^\W_]+(?:['’`´][^\W_]+)*")  # words as written, before name_tokens folds them
+
+class MentionRouter:
+    """Routes free text to every team and player it names in one pass.
+
+    Team names, club aliases, player names and player surnames are compiled into
+    an Aho-Corasick automaton over folded word tokens, so matching costs one walk
+    over the text whatever the number of names, and never matches inside a word.
+    A bare surname only matches a capitalised word, and only counts for a team
+    the text is otherwise known to be about ("Young players..." is not Ashley Young).
+    """
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._names = [set()]
+        self._longest = [0]  # nearest node on the failure chain (itself included) that ends a name
+        self._built = False
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build a router from get_name_entries rows"""
+        router = cls()
+        for row in entries:
+            router.add(row['kind'], row['id'], row['name'], row['team_id'])
+        router.build()
+        return router
+
+    def add(self, kind, entity_id, name, team_id):
+        """Add a team or player name; players are also added under their surname"""
+        tokens = name_tokens(name)
+        if not tokens:
+            return
+        patterns = [(tokens, False)]
+        if kind == 'player' and len(tokens) > 1 and len(tokens[-1]) >= MIN_SURNAME_LENGTH:
+            patterns.append((tokens[-1:], True))
+        for pattern, surname_only in patterns:
+            node = 0
+            for token in pattern:
+                if token not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._names.append(set())
+                    self._longest.append(0)
+                    self._goto[node][token] = len(self._goto) - 1
+                node = self._goto[node][token]
+            self._names[node].add((kind, entity_id, team_id, surname_only))
+        self._built = False
+
+    def build(self):
+        """Compute failure and output links breadth-first"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            self._longest[node] = node if self._names[node] else self._longest[self._fail[node]]
+            for token, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                queue.append(child)
+        self._built = True
+
+    def _tokens(self, text):
+        """Folded tokens of text, each with whether the word it came from was capitalised"""
+        for word in WORD_PATTERN.findall(text or ''):
+            capitalised = word[0].isupper()
+            for token in name_tokens(word):
+                yield token, capitalised
+
+    def find(self, text):
+        """For each word of text that ends a name, the entities named by the longest such name.
+
+        Entities matched by surname alone are left out where that word is not capitalised.
+        """
+        if not self._built:
+            self.build()
+        occurrences = []
+        node = 0
+        for token, capitalised in self._tokens(text):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            if self._longest[node]:
+                names = self._names[self._longest[node]]
+                if not capitalised:
+                    names = {name for name in names if not name[3]}
+                if names:
+                    occurrences.append(names)
+        return occurrences
+
+    def route(self, text, team_ids=()):
+        """Teams a text concerns, mapped to the one player of that team it names (or None).
+
+        team_ids are teams known from elsewhere (e.g. resolved feed categories).
+        A bare surname only counts for a team the text is about, and a name
+        shared by several players only when exactly one of them plays for such
+        a team; a name shared by several teams is ignored, and a team with
+        several named players gets no player id.
+        """
+        occurrences = self.find(text)
+        teams = set(team_ids)
+        for names in occurrences:
+            named_teams = {entity_id for kind, entity_id, _, _ in names if kind == 'team'}
+            if len(named_teams) == 1:
+                teams |= named_teams
+
+        players = {}
+        for names in occurrences:
+            candidates = [
+                (entity_id, team_id) for kind, entity_id, team_id, surname_only in names
+                if kind == 'player' and (not surname_only or team_id in teams)
+            ]
+            if len(candidates) > 1:
+                candidates = [candidate for candidate in candidates if candidate[1] in teams]
+            if len(candidates) == 1:
+                player_id, team_id = candidates[0]
+                players.setdefault(team_id, set()).add(player_id)
+
+        routes = {team_id: None for team_id in teams}
+        for team_id, player_ids in players.items():
+            routes[team_id] = player_ids.pop() if len(player_ids) == 1 else None
+        return routes
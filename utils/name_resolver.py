@@ -0,0 +1,96 @@
+import logging
+from collections import Counter, defaultdict
+from utils.player_identity import name_tokens
+
+logger = logging.getLogger(__name__)
+
+MIN_CONFIDENCE = 0.6
+AMBIGUITY_MARGIN = 0.05  # a runner-up entity this close to the best one makes a name ambiguous
+MAX_CANDIDATES = 20  # blocked candidates scored exactly per lookup
+MIN_SURNAME_LENGTH = 4  # shorter surnames are not indexed on their own
+
+def trigrams(key):
+    """Character trigrams of a folded name, padded so word starts and ends count"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameResolver:
+    """In-memory fuzzy lookup of teams (by name and club alias) and players (by name and surname).
+
+    Names are folded like player identity keys and indexed by character trigram,
+    once overall and once per kind and team so filtered lookups stay small. A
+    lookup only scores the entries sharing the most trigrams with the query
+    (blocking), using the Dice coefficient of the trigram sets as confidence.
+    """
+    def __init__(self, min_confidence=MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self.entries = []
+        self._exact = defaultdict(list)
+        self._postings = defaultdict(list)
+
+    @classmethod
+    def load(cls, db, league_id=None, **kwargs):
+        """Build a resolver over one league's (or every) team, alias and player from one query"""
+        resolver = cls(**kwargs)
+        for row in db.get_name_entries(league_id):
+            resolver.add(row['kind'], row['id'], row['name'], row['team_id'])
+        return resolver
+
+    def add(self, kind, entity_id, name, team_id=None):
+        """Index one name of an entity; players are indexed under their surname too"""
+        tokens = name_tokens(name)
+        if not tokens:
+            return
+        keys = {' '.join(sorted(tokens))}
+        if kind == 'player' and len(tokens) > 1 and len(tokens[-1]) >= MIN_SURNAME_LENGTH:
+            keys.add(tokens[-1])
+        scopes = {(None, None), (kind, None), (None, team_id), (kind, team_id)}
+        for key in keys:
+            index = len(self.entries)
+            grams = trigrams(key)
+            self.entries.append((kind, entity_id, team_id, name, grams))
+            for scope in scopes:
+                self._exact[scope + (key,)].append(index)
+                for gram in grams:
+                    self._postings[scope + (gram,)].append(index)
+
+    def resolve(self, name, kind=None, team_id=None):
+        """Best matching entity for a name as {'kind', 'id', 'team_id', 'name', 'confidence'}, or None.
+
+        kind and team_id restrict the candidates. None is returned when no entity
+        reaches min_confidence or when two entities match about equally well.
+        """
+        tokens = name_tokens(name)
+        if not tokens:
+            return None
+        key = ' '.join(sorted(tokens))
+        scope = (kind, team_id)
+
+        exact = self._exact.get(scope + (key,))
+        if exact:
+            scored = [(1.0, index) for index in exact]
+        else:
+            grams = trigrams(key)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(scope + (gram,), ()))
+            candidates = [index for index, _ in shared.most_common(MAX_CANDIDATES)]
+            scored = [
+                (2 * len(grams & self.entries[index][4]) / (len(grams) + len(self.entries[index][4])), index)
+                for index in candidates
+            ]
+
+        best = {}
+        for score, index in scored:
+            entity = self.entries[index][:2]
+            if score > best.get(entity, (0.0, None))[0]:
+                best[entity] = (score, index)
+        ranked = sorted(best.values(), reverse=True)
+        if not ranked or ranked[0][0] < self.min_confidence:
+            return None
+        if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < AMBIGUITY_MARGIN:
+            return None
+
+        score, index = ranked[0]
+        entry_kind, entity_id, entry_team_id, entry_name, _ = self.entries[index]
+        return {'kind': entry_kind, 'id': entity_id, 'team_id': entry_team_id, 'name': entry_name, 'confidence': round(score, 3)}
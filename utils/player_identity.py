@@ -0,0 +1,97 @@
+import re
+import logging
+import unicodedata
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Letters NFKD does not decompose into a base letter plus accent
+TRANSLITERATIONS = str.maketrans({
+    'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th', 'æ': 'ae', 'œ': 'oe', 'ı': 'i'
+})
+APOSTROPHES = re.compile(r"['’`´]")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Lookup tiers, strongest first; a name is only tried against a weaker tier when the stronger one has no entry
+MATCH_TIERS = ('transfermarkt_id', 'full_name', 'initial_surname', 'surname')
+
+def name_tokens(name):
+    """ASCII lower-case tokens of a name: accents folded, apostrophes dropped, hyphens and dots split"""
+    text = unicodedata.normalize('NFKD', APOSTROPHES.sub('', name or '').casefold().translate(TRANSLITERATIONS))
+    return TOKEN_PATTERN.findall(''.join(ch for ch in text if not unicodedata.combining(ch)))
+
+def player_name_key(name):
+    """Order-independent folded name key, e.g. 'Mbappé Kylian' and 'Kylian MBAPPE' both give 'kylian mbappe'"""
+    return ' '.join(sorted(name_tokens(name))) or None
+
+def _name_keys(name, full_key=None):
+    """Keys of one name per tier: full token-sorted name, first initial plus surname, and surname alone"""
+    tokens = name_tokens(name)
+    if not tokens:
+        return {}
+    return {
+        'full_name': full_key or ' '.join(sorted(tokens)),
+        'initial_surname': f"{tokens[0][0]} {tokens[-1]}" if len(tokens) > 1 else None,
+        'surname': tokens[-1]
+    }
+
+class PlayerIdentityIndex:
+    """Maps scraped player references to player ids, per team, without touching the database.
+
+    Built once per update cycle from get_player_identities rows. Records are
+    matched by Transfermarkt id first, then by folded name keys; a key shared by
+    two players of the same team is ambiguous and never matches. Records that do
+    not match are kept in unmatched so the cycle can report them.
+    """
+    def __init__(self, players):
+        self.players = defaultdict(list)
+        self._keys = defaultdict(dict)
+        self.matched = Counter()
+        self.unmatched = []
+
+        for player in players:
+            self.players[player['team_id']].append(player)
+            keys = _name_keys(player['name'], player.get('name_key'))
+            keys['transfermarkt_id'] = str(player['transfermarkt_id']) if player.get('transfermarkt_id') else None
+            for tier, key in keys.items():
+                if key is None:
+                    continue
+                tier_keys = self._keys[(player['team_id'], tier)]
+                tier_keys[key] = player['id'] if tier_keys.get(key, player['id']) == player['id'] else None
+
+    @classmethod
+    def load(cls, db, team_ids):
+        """Build the index for many teams from one query"""
+        return cls(db.get_player_identities(team_ids))
+
+    def resolve(self, team_id, transfermarkt_id=None, name=None):
+        """Return (player_id, tier) for a reference within one team; player_id is None when nothing or several players match"""
+        keys = _name_keys(name) if name else {}
+        keys['transfermarkt_id'] = str(transfermarkt_id) if transfermarkt_id else None
+        for tier in MATCH_TIERS:
+            tier_keys = self._keys.get((team_id, tier), {})
+            if keys.get(tier) in tier_keys:
+                return tier_keys[keys[tier]], tier
+        return None, None
+
+    def match(self, team_id, records, id_field='player_transfermarkt_id', name_field='player_name'):
+        """Pair each record with its player id; unmatched records are recorded and left out"""
+        matched = []
+        for record in records:
+            player_id, tier = self.resolve(team_id, record.get(id_field), record.get(name_field))
+            if player_id is None:
+                self.unmatched.append((team_id, record.get(name_field) or record.get(id_field)))
+                continue
+            self.matched[tier] += 1
+            matched.append((player_id, record))
+        return matched
+
+    def report(self, label):
+        """Log match counts per tier and the references that could not be matched"""
+        total = sum(self.matched.values())
+        tiers = ', '.join(f"{tier} {self.matched[tier]}" for tier in MATCH_TIERS if self.matched[tier])
+        logger.info(f"🔗 {label}: matched {total}/{total + len(self.unmatched)} player references ({tiers or 'none'})")
+        if self.unmatched:
+            names = ', '.join(sorted({str(name) for _, name in self.unmatched})[:20])
+            logger.warning(f"⚠️ {label}: {len(self.unmatched)} unmatched player references: {names}")
+        return {'matched': dict(self.matched), 'unmatched': list(self.unmatched)}
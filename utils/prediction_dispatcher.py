@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import PREDICTION_WORKERS
+
+logger = logging.getLogger(__name__)
+
+WAIT_SAMPLES = 500  # recent queue waits kept for the stats percentiles
+SLOW_WAIT_SECONDS = 2.0
+STATS_LOG_EVERY = 50  # computations between stats log lines
+
+class PredictionDispatcher:
+    """Runs blocking prediction work off the event loop, one computation per key at a time.
+
+    Calls go to a bounded thread pool. A caller asking for a key that is
+    already being computed awaits the same future instead of starting its own
+    (single flight), so a crowd opening the same match costs one prediction.
+    """
+    def __init__(self, max_workers=PREDICTION_WORKERS):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prediction')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.counts = {'started': 0, 'coalesced': 0, 'finished': 0, 'failed': 0}
+
+    async def run(self, key, func, *args):
+        """Result of func(*args) on a worker, shared with every concurrent caller of the same key"""
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.counts['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        with self._lock:
+            self._queued += 1
+        self.counts['started'] += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self._call, key, time.perf_counter(), func, args)
+        self._in_flight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _call(self, key, queued_at, func, args):
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._waits.append(waited)
+        if waited > SLOW_WAIT_SECONDS:
+            logger.warning(f"⏳ Prediction {key} waited {waited:.1f}s for a worker ({self._queued} still queued)")
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _finish(self, key, future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        self.counts['finished'] += 1
+        if future.cancelled() or future.exception() is not None:
+            self.counts['failed'] += 1
+        if self.counts['finished'] % STATS_LOG_EVERY == 0:
+            logger.info(f"📊 Prediction dispatcher: {self.stats()}")
+
+    def stats(self):
+        """Queue depth, running and in-flight computations, counters and queue wait percentiles in ms"""
+        with self._lock:
+            waits = sorted(self._waits)
+            queued, running = self._queued, self._running
+        percentile = lambda p: round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 1) if waits else 0.0
+        return {
+            'queued': queued,
+            'running': running,
+            'in_flight': len(self._in_flight),
+            **self.counts,
+            'wait_ms_p50': percentile(0.5),
+            'wait_ms_p95': percentile(0.95),
+            'wait_ms_max': round(waits[-1] * 1000, 1) if waits else 0.0
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
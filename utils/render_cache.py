@@ -0,0 +1,51 @@
+import threading
+import logging
+from collections import OrderedDict
+from config import RENDER_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+def prediction_version(prediction):
+    """Identity of a stored prediction row: a new save gets a new id, a re-stamp a new input version"""
+    return (prediction.get('id'), prediction.get('input_version'), prediction.get('updated_at'))
+
+class RenderCache:
+    """Rendered lineup messages (text and keyboard) per (match, team, view), least recently used first out.
+
+    Each entry remembers the prediction version it was rendered from. Entries
+    are dropped as soon as this process saves a prediction for their match and
+    team (see DatabaseManager.prediction_listeners); saves by other processes
+    are only caught by asking for the stored version, so callers should.
+    """
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # saves, and so invalidations, come from scheduler threads
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, match_id, team_id, view, version=None):
+        """Cached (text, reply_markup), or None; with a version, only an entry rendered from that version"""
+        key = (match_id, team_id, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (version is not None and entry[0] != version):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, match_id, team_id, view, version, text, reply_markup):
+        with self._lock:
+            self._entries[(match_id, team_id, view)] = (version, text, reply_markup)
+            self._entries.move_to_end((match_id, team_id, view))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, pairs):
+        """Drop every view of the given (match_id, team_id) pairs"""
+        pairs = set(pairs)
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] in pairs]:
+                del self._entries[key]
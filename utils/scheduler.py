@@ -4,10 +4,17 @@ import threading
 import logging
 from datetime import datetime
 from fetchers.transfermarkt_scraper import TransfermarktScraper
-from fetchers.news_scraper import NewsScraper
+from fetchers.news_feeds import NewsFeedFetcher
+from fetchers.social_client import JournalistTimelineClient
 from database.models import DatabaseManager
 from analyzers.lineup_predictor import LineupPredictor
-from config import LEAGUES, UPDATE_INTERVAL_HOURS
+from analyzers.matchday_predictor import MatchdayPredictor
+from analyzers.news_scorer import NewsScorer
+from utils.league_pipeline import LeaguePipeline, ResourceSlots
+from utils.player_identity import PlayerIdentityIndex
+from utils.name_resolver import NameResolver
+from utils.mention_router import MentionRouter
+from config import UPDATE_INTERVAL_HOURS, LINEUP_INGEST_BATCH, TRUSTED_JOURNALISTS, JOURNALIST_POLL_MINUTES, NEWS_SCORING_BATCH
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +22,13 @@ class DataScheduler:
     def __init__(self, db_manager):
         self.db = db_manager
         self.transfermarkt_scraper = TransfermarktScraper()
-        self.news_scraper = NewsScraper()
+        self.news_fetcher = NewsFeedFetcher()
+        self.social_client = JournalistTimelineClient()
+        self.news_scorer = NewsScorer()
         self.predictor = LineupPredictor(db_manager)
+        self.matchday_predictor = MatchdayPredictor(db_manager)
+        self.resources = ResourceSlots()
+        self.pipeline = LeaguePipeline(self.resources)
         self.running = False
         self.scheduler_thread = None
     
@@ -29,8 +41,12 @@ class DataScheduler:
         self.running = True
         
         schedule.every(1).hours.do(self.update_matches_only)
+        schedule.every(3).hours.do(self.ingest_finished_lineups)
+        self._schedule_journalist_posts()
         schedule.every(UPDATE_INTERVAL_HOURS).hours.do(self.update_all_data)
+        schedule.every().day.at("04:00").do(self.compact_news)
         
+        self.compact_news()
         self.update_matches_only()
         self.update_all_data()
         
@@ -48,8 +64,11 @@ class DataScheduler:
         self.running = True
         
         schedule.every(1).hours.do(self.update_matches_only)
+        schedule.every(3).hours.do(self.ingest_finished_lineups)
+        self._schedule_journalist_posts()
         schedule.every(5).hours.do(self.update_all_lineup_predictions)
         schedule.every(UPDATE_INTERVAL_HOURS).hours.do(self.update_all_data)
+        schedule.every().day.at("04:00").do(self.compact_news)
         
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
@@ -58,6 +77,7 @@ class DataScheduler:
             time.sleep(30)
             try:
                 logger.info("🔄 Running delayed initial data update...")
+                self.compact_news()
                 self.update_matches_only()
                 self.generate_initial_predictions()
                 logger.info("✅ Delayed initial data update completed")
@@ -90,8 +110,9 @@ class DataScheduler:
         logger.info("🔄 Starting comprehensive data update...")
         
         try:
-            for league_key, league_info in LEAGUES.items():
-                self.update_league_data(league_key, league_info)
+            self.update_news()
+            
+            self.pipeline.run("full", self.update_league_data)
             
             current_date = datetime.now()
             season_start = datetime(2025, 8, 1)  # Approximate season start
@@ -103,6 +124,8 @@ class DataScheduler:
                 logger.info("⚽ Season active: Only updating injuries and suspensions")
                 self.update_injuries_and_suspensions()
             
+            self.update_season_stats()
+            
             logger.info("✅ Comprehensive data update completed successfully")
             
         except Exception as e:
@@ -113,108 +136,192 @@ class DataScheduler:
         try:
             logger.info("🏥 Updating injuries and suspensions...")
             
-            for league_key, league_info in LEAGUES.items():
+            self.pipeline.run("injuries", self._update_league_injuries)
+            
+            logger.info("✅ Injuries and suspensions update completed")
+            
+        except Exception as e:
+            logger.error(f"❌ Error updating injuries and suspensions: {e}")
+    
+    def _update_league_injuries(self, league_key, league_info):
+        """Update injuries and suspensions for every team of one league"""
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            return
+        
+        self._sync_league_injuries(league_db['id'], league_info['name'])
+    
+    def _sync_league_injuries(self, league_id, label):
+        """Scrape each team's injury list and sync it to the availability timeline.
+
+        Players are matched through one identity index loaded for the whole league,
+        so reconciliation issues no per-injury queries; unmatched names are reported.
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, transfermarkt_id, name 
+                    FROM teams 
+                    WHERE league_id = %s
+                """, (league_id,))
+                teams = cursor.fetchall()
+        
+        identities = PlayerIdentityIndex.load(self.db, [team['id'] for team in teams])
+        for team in teams:
+            if team.get('transfermarkt_id'):
                 try:
-                    league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
-                    if not league_db:
+                    with self.resources.slot('http'):
+                        injuries = self.transfermarkt_scraper.scrape_player_injuries(team['transfermarkt_id'])
+                    if injuries is None:
                         continue
                     
-                    with self.db.get_connection() as conn:
-                        with conn.cursor() as cursor:
-                            cursor.execute("""
-                                SELECT id, transfermarkt_id, name 
-                                FROM teams 
-                                WHERE league_id = %s
-                            """, (league_db['id'],))
-                            teams = cursor.fetchall()
+                    events = [
+                        self._injury_event(player_id, injury_data, team)
+                        for player_id, injury_data in identities.match(team['id'], injuries)
+                    ]
+                    recorded = self.db.sync_team_availability(team['id'], events, source='transfermarkt_injuries')
+                    logger.debug(f"Synced {len(events)}/{len(injuries)} injuries for {team['name']}, {recorded} timeline events recorded")
+                    time.sleep(1)  # Rate limiting
                     
-                    for team in teams:
-                        if team.get('transfermarkt_id'):
-                            try:
-                                injuries = self.transfermarkt_scraper.scrape_player_injuries(team['transfermarkt_id'])
-                                
-                                for injury_data in injuries:
-                                    with self.db.get_connection() as conn:
-                                        with conn.cursor() as cursor:
-                                            cursor.execute("""
-                                                SELECT id FROM players 
-                                                WHERE LOWER(name) = LOWER(%s) AND team_id = %s
-                                            """, (injury_data['player_name'], team['id']))
-                                            player = cursor.fetchone()
-                                    
-                                    if player:
-                                        self.db.update_player_status(
-                                            player_id=player['id'],
-                                            status_type=injury_data.get('injury_type', 'injury'),
-                                            description=injury_data.get('injury_description', 'Injured'),
-                                            expected_return_date=injury_data.get('return_date'),
-                                            source_url=f"https://www.transfermarkt.com/verein/verletztenliste/verein/{team['transfermarkt_id']}"
-                                        )
-                                
-                                logger.debug(f"Updated {len(injuries)} injuries for {team['name']}")
-                                time.sleep(1)  # Rate limiting
-                                
-                            except Exception as e:
-                                logger.error(f"Error updating injuries for {team['name']}: {e}")
-                                continue
-                                
                 except Exception as e:
-                    logger.error(f"Error updating injuries for league {league_info['name']}: {e}")
+                    logger.error(f"Error updating injuries for {team['name']}: {e}")
                     continue
+        
+        identities.report(f"{label} injuries")
+    
+    def _injury_event(self, player_id, injury_data, team):
+        """Availability event for one scraped injury row"""
+        return {
+            'player_id': player_id,
+            'status_type': injury_data.get('status_type', 'injury'),
+            'description': injury_data.get('injury_description', 'Injured'),
+            'start_date': injury_data.get('start_date'),
+            'expected_return_date': injury_data.get('expected_return_date'),
+            'source_url': f"https://www.transfermarkt.com/verein/verletztenliste/verein/{team['transfermarkt_id']}"
+        }
+    
+    def update_season_stats(self):
+        """Refresh every player's season minutes and starts with one performance-page request per team"""
+        try:
+            logger.info("📈 Updating season performance stats...")
             
-            logger.info("✅ Injuries and suspensions update completed")
+            report = self.pipeline.run("stats", self._update_league_stats)
+            changed = sum(r['result'] or 0 for r in report['results'].values())
+            
+            logger.info(f"✅ Season stats update completed, {changed} players changed")
             
         except Exception as e:
-            logger.error(f"❌ Error updating injuries and suspensions: {e}")
+            logger.error(f"❌ Error updating season stats: {e}")
+    
+    def _update_league_stats(self, league_key, league_info):
+        """Scrape each team's performance table and load the whole league with one bulk update"""
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            return 0
+        
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, transfermarkt_id, name 
+                    FROM teams 
+                    WHERE league_id = %s AND transfermarkt_id IS NOT NULL
+                """, (league_db['id'],))
+                teams = cursor.fetchall()
+        
+        stats = []
+        for team in teams:
+            with self.resources.slot('http'):
+                team_stats = self.transfermarkt_scraper.scrape_team_performance(
+                    team['transfermarkt_id'], league_info['transfermarkt_id'], league_info['season']
+                )
+            stats.extend(dict(player, team_id=team['id']) for player in team_stats)
+            time.sleep(1)  # Rate limiting
+        
+        changed = self.db.update_player_season_stats(stats)
+        logger.info(f"📈 {league_info['name']}: season stats for {len(stats)} players from {len(teams)} teams, {changed} changed")
+        return changed
     
     def update_matches_only(self):
         """Update only match data for all leagues (hourly) with improved error handling"""
         logger.info("Starting hourly match data update")
         
         try:
-            for league_key, league_info in LEAGUES.items():
-                try:
-                    league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
-                    if league_db:
-                        self.update_matches(league_db['id'], league_info)
-                except Exception as e:
-                    logger.error(f"❌ Failed to update matches for {league_info['name']}: {e}")
-                    continue
+            self.pipeline.run("matches", self._update_league_matches)
             
             logger.info("Hourly match data update completed successfully")
             
         except Exception as e:
             logger.error(f"❌ Critical error in hourly match data update: {e}")
     
-    def update_league_data(self, league_key, league_info):
-        """Update data for a specific league"""
+    def _update_league_matches(self, league_key, league_info):
+        """Update match data for one league if it exists in the database"""
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if league_db:
+            self.update_matches(league_db['id'], league_info)
+    
+    def ingest_finished_lineups(self):
+        """Fetch line-ups of newly finished matches once and add them to players' minutes and starts"""
+        logger.info("📋 Ingesting line-ups of finished matches...")
+        
         try:
-            logger.info(f"Updating data for {league_info['name']}")
-            
-            league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
-            if not league_db:
-                league_id = self.db.insert_league(
-                    name=league_info['name'],
-                    transfermarkt_id=league_info['transfermarkt_id'],
-                    season=league_info['season']
-                )
-            else:
-                league_id = league_db['id']
-            
-            self.update_matches(league_id, league_info)
-            
-            self.update_teams_and_players(league_id, league_info)
-            
-            self.update_player_status(league_id)
+            report = self.pipeline.run("lineups", self._ingest_league_lineups)
+            appearance_count = sum(r['result'] or 0 for r in report['results'].values())
             
-            self.update_news_data(league_id)
-            
-            self.update_lineup_predictions(league_id)
-            
-            logger.info(f"Data update completed for {league_info['name']}")
+            logger.info(f"✅ Line-up ingestion completed, {appearance_count} appearances recorded")
             
         except Exception as e:
-            logger.error(f"Error updating data for {league_info['name']}: {e}")
+            logger.error(f"❌ Error ingesting finished match line-ups: {e}")
+    
+    def _ingest_league_lineups(self, league_key, league_info):
+        """Ingest line-ups for one league's finished matches in a single bulk write, returning new appearance count"""
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            return 0
+        
+        matches = self.db.get_matches_awaiting_lineups(league_db['id'], limit=LINEUP_INGEST_BATCH)
+        ingested_ids, failed_ids, appearances, formations = [], [], [], {}
+        for match in matches:
+            with self.resources.slot('http'):
+                lineups = self.transfermarkt_scraper.scrape_match_lineups(match['transfermarkt_id'])
+            if not lineups:
+                logger.debug(f"No line-ups yet for match {match['id']}")
+                failed_ids.append(match['id'])
+                continue
+            
+            for side, team_id in (('home', match['home_team_id']), ('away', match['away_team_id'])):
+                appearances.extend(dict(player, match_id=match['id'], team_id=team_id) for player in lineups[side])
+            formations[match['id']] = lineups.get('formations', {})
+            ingested_ids.append(match['id'])
+            time.sleep(1)  # Rate limiting
+        
+        self.db.record_lineup_attempts(failed_ids)
+        recorded = self.db.save_match_appearances(ingested_ids, appearances, formations)
+        logger.info(f"📋 {league_info['name']}: {len(ingested_ids)}/{len(matches)} finished matches ingested, {recorded} appearances recorded")
+        return recorded
+    
+    def update_league_data(self, league_key, league_info):
+        """Update data for a specific league (raises so the pipeline can report the failure)"""
+        logger.info(f"Updating data for {league_info['name']}")
+        
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            league_id = self.db.insert_league(
+                name=league_info['name'],
+                transfermarkt_id=league_info['transfermarkt_id'],
+                season=league_info['season']
+            )
+        else:
+            league_id = league_db['id']
+        
+        self.update_matches(league_id, league_info)
+        
+        self.update_teams_and_players(league_id, league_info)
+        
+        self.update_player_status(league_id)
+        
+        self.update_lineup_predictions(league_id)
+        
+        logger.info(f"Data update completed for {league_info['name']}")
     
     def update_matches(self, league_id, league_info):
         """Update match data for a league with improved per-league error handling"""
@@ -222,10 +329,11 @@ class DataScheduler:
         try:
             logger.info(f"🏆 Updating matches for {league_info['name']}...")
             
-            matches = self.transfermarkt_scraper.scrape_league_matches(
-                league_info['transfermarkt_id'], 
-                league_info['season']
-            )
+            with self.resources.slot('browser'):
+                matches = self.transfermarkt_scraper.scrape_league_matches(
+                    league_info['transfermarkt_id'], 
+                    league_info['season']
+                )
             
             if not matches:
                 logger.warning(f"⚠️ No matches found for {league_info['name']} - scraper may have failed, but continuing with other leagues")
@@ -233,18 +341,21 @@ class DataScheduler:
             
             matches_processed = 0
             matches_updated = 0
+            known_teams = self._league_team_ids(league_id)
             for match_data in matches:
                 try:
                     home_team_id = self._get_or_create_team(
                         match_data['home_team_name'],
                         league_id,
-                        match_data['home_team_transfermarkt_id']
+                        match_data['home_team_transfermarkt_id'],
+                        known_teams
                     )
                     
                     away_team_id = self._get_or_create_team(
                         match_data['away_team_name'],
                         league_id,
-                        match_data['away_team_transfermarkt_id']
+                        match_data['away_team_transfermarkt_id'],
+                        known_teams
                     )
                     
                     if home_team_id and away_team_id:
@@ -284,7 +395,8 @@ class DataScheduler:
             
             for team in teams:
                 try:
-                    players = self.transfermarkt_scraper.scrape_team_squad(team['transfermarkt_id'])
+                    with self.resources.slot('browser'):
+                        players = self.transfermarkt_scraper.scrape_team_squad(team['transfermarkt_id'])
                     
                     for player_data in players:
                         self.db.insert_player(
@@ -293,7 +405,10 @@ class DataScheduler:
                             position=player_data['position'],
                             transfermarkt_id=player_data['transfermarkt_id'],
                             jersey_number=player_data.get('jersey_number'),
-                            market_value=player_data.get('market_value')
+                            market_value=player_data.get('market_value'),
+                            age=player_data.get('age'),
+                            nationality=player_data.get('nationality'),
+                            contract_end_year=player_data.get('contract_end_year')
                         )
                     
                     logger.info(f"Updated {len(players)} players for {team['name']}")
@@ -310,124 +425,138 @@ class DataScheduler:
     def update_player_status(self, league_id):
         """Update player injury and suspension status"""
         try:
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id, transfermarkt_id, name 
-                        FROM teams 
-                        WHERE league_id = %s
-                    """, (league_id,))
-                    teams = cursor.fetchall()
+            self._sync_league_injuries(league_id, f"League {league_id}")
             
-            for team in teams:
-                try:
-                    injuries = self.transfermarkt_scraper.scrape_player_injuries(team['transfermarkt_id'])
-                    
-                    for injury_data in injuries:
-                        with self.db.get_connection() as conn:
-                            with conn.cursor() as cursor:
-                                cursor.execute("""
-                                    SELECT id FROM players 
-                                    WHERE transfermarkt_id = %s AND team_id = %s
-                                """, (injury_data['player_transfermarkt_id'], team['id']))
-                                player = cursor.fetchone()
-                        
-                        if player:
-                            self.db.update_player_status(
-                                player_id=player['id'],
-                                status_type=injury_data['status_type'],
-                                description=injury_data['injury_description'],
-                                source_url=f"https://www.transfermarkt.com/verein/verletztenliste/verein/{team['transfermarkt_id']}"
-                            )
-                    
-                    logger.info(f"Updated {len(injuries)} injury statuses for {team['name']}")
-                    
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error updating player status for team {team['name']}: {e}")
+        except Exception as e:
+            logger.error(f"Error updating player status for league {league_id}: {e}")
+    
+    def update_news(self):
+        """Fetch every news feed once and route each article to all teams and players it names"""
+        start_time = time.time()
+        try:
+            logger.info("📰 Updating news...")
+            
+            items = []
+            for name, url in self.news_fetcher.feeds.items():
+                with self.resources.slot('http'):
+                    items.extend(self.news_fetcher.fetch_feed(name, url))
+            
+            entries = self.db.get_name_entries()
+            router = MentionRouter.from_entries(entries)
+            resolver = NameResolver()
+            for row in entries:
+                if row['kind'] == 'team':
+                    resolver.add(row['kind'], row['id'], row['name'], row['team_id'])
+            
+            mentions, unrouted = [], 0
+            for item in items:
+                if not item['url']:
                     continue
+                category_teams = {
+                    resolved['id'] for resolved in (resolver.resolve(category, kind='team') for category in item['categories'])
+                    if resolved
+                }
+                routes = router.route(item['content'], category_teams)
+                if not routes:
+                    unrouted += 1
+                mentions.extend({
+                    'team_id': team_id,
+                    'player_id': player_id,
+                    'source_type': 'news',
+                    'source_url': item['url'],
+                    'author': item['author'],
+                    'content': item['content'],
+                    'language': item['language'],
+                    'published_at': item['published_at']
+                } for team_id, player_id in routes.items())
+            
+            inserted = self.db.save_news_mentions(mentions)
+            teams = len({mention['team_id'] for mention in mentions})
+            logger.info(
+                f"✅ News: {len(items)} articles from {len(self.news_fetcher.feeds)} feeds routed to {teams} teams "
+                f"({sum(1 for m in mentions if m['player_id'])} player links, {unrouted} unrouted), "
+                f"{inserted} new mentions in {time.time() - start_time:.1f}s"
+            )
+            self.score_news()
             
         except Exception as e:
-            logger.error(f"Error updating player status for league {league_id}: {e}")
+            logger.error(f"❌ Error updating news: {e}")
     
-    def update_news_data(self, league_id):
-        """Update news and social media data"""
+    def score_news(self):
+        """Fill sentiment and relevance of every unscored news mention, a chunk at a time"""
+        start_time = time.time()
+        scored = 0
         try:
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id, name FROM teams WHERE league_id = %s
-                    """, (league_id,))
-                    teams = cursor.fetchall()
+            while True:
+                mentions = self.db.get_unscored_news_mentions(NEWS_SCORING_BATCH)
+                if not mentions:
+                    break
+                scores = self.news_scorer.score(mentions)
+                self.db.save_news_scores([
+                    (mention['id'], sentiment, relevance) for mention, (sentiment, relevance) in zip(mentions, scores)
+                ])
+                scored += len(mentions)
+                if len(mentions) < NEWS_SCORING_BATCH:
+                    break
+            if scored:
+                logger.info(f"🧮 Scored {scored} news mentions in {time.time() - start_time:.1f}s")
             
-            for team in teams[:5]:  # Limit to 5 teams per update to avoid rate limits
-                try:
-                    team_name = team['name']
-                    
-                    with self.db.get_connection() as conn:
-                        with conn.cursor() as cursor:
-                            cursor.execute("""
-                                SELECT name FROM players 
-                                WHERE team_id = %s 
-                                ORDER BY market_value DESC NULLS LAST
-                                LIMIT 10
-                            """, (team['id'],))
-                            players = cursor.fetchall()
-                    
-                    player_names = [p['name'] for p in players]
-                    
-                    bbc_news = self.news_scraper.scrape_bbc_football_news(team_name)
-                    
-                    twitter_mentions = self.news_scraper.scrape_twitter_mentions(team_name, player_names)
-                    
-                    all_mentions = bbc_news + twitter_mentions
-                    for mention in all_mentions:
-                        with self.db.get_connection() as conn:
-                            with conn.cursor() as cursor:
-                                cursor.execute("""
-                                    INSERT INTO news_mentions 
-                                    (team_id, source_type, source_url, author, content, published_at)
-                                    VALUES (%s, %s, %s, %s, %s, %s)
-                                    ON CONFLICT DO NOTHING
-                                """, (
-                                    team['id'],
-                                    mention.get('source', 'unknown'),
-                                    mention.get('url'),
-                                    mention.get('author'),
-                                    mention.get('content', mention.get('headline', '')),
-                                    mention.get('published_at', datetime.now())
-                                ))
-                                conn.commit()
-                    
-                    logger.info(f"Updated {len(all_mentions)} news mentions for {team_name}")
-                    
-                    time.sleep(3)
-                    
-                except Exception as e:
-                    logger.error(f"Error updating news data for team {team_name}: {e}")
-                    continue
+        except Exception as e:
+            logger.error(f"❌ Error scoring news mentions: {e}")
+    
+    def compact_news(self):
+        """Remove duplicate news mentions left by earlier cycles (daily)"""
+        try:
+            self.db.compact_news_mentions()
+        except Exception as e:
+            logger.error(f"❌ Error compacting news mentions: {e}")
+    
+    def _schedule_journalist_posts(self):
+        """Poll the trusted journalists only when there is a bearer token to do it with"""
+        if not self.social_client.bearer_token:
+            logger.info("🐦 TWITTER_BEARER_TOKEN not set - journalist posts will not be polled")
+            return
+        schedule.every(JOURNALIST_POLL_MINUTES).minutes.do(self.update_journalist_posts)
+    
+    def update_journalist_posts(self):
+        """Pull only the trusted journalists' posts newer than their cursors and route them to teams and players"""
+        if not self.social_client.bearer_token:
+            return
+        start_time = time.time()
+        try:
+            cursors = self.db.get_journalist_cursors(TRUSTED_JOURNALISTS)
+            requests_before = self.social_client.requests_made
+            with self.resources.slot('http'):
+                posts, cursors = self.social_client.fetch_new_posts(cursors)
+            
+            router = MentionRouter.from_entries(self.db.get_name_entries()) if posts else None
+            mentions = [{
+                'team_id': team_id,
+                'player_id': player_id,
+                'source_type': 'twitter',
+                'source_url': post['url'],
+                'author': post['handle'],
+                'content': post['text'],
+                'language': post['language'],
+                'published_at': post['created_at']
+            } for post in posts for team_id, player_id in router.route(post['text']).items()]
+            
+            inserted = self.db.save_news_mentions(mentions)
+            self.db.save_journalist_cursors(cursors, posts)
+            logger.info(
+                f"🐦 Journalists: {len(posts)} new posts from {len(cursors)} accounts in "
+                f"{self.social_client.requests_made - requests_before} requests, {inserted} mentions in {time.time() - start_time:.1f}s"
+            )
+            self.score_news()
             
         except Exception as e:
-            logger.error(f"Error updating news data for league {league_id}: {e}")
+            logger.error(f"❌ Error updating journalist posts: {e}")
     
     def update_lineup_predictions(self, league_id):
-        """Update lineup predictions for upcoming matches in a specific league"""
+        """Update lineup predictions for the next matchday of a specific league whose inputs changed"""
         try:
-            matches = self.db.get_upcoming_matches(league_id)
-            
-            for match in matches[:5]:  # Limit to 5 matches per update
-                try:
-                    for team_id in [match['home_team_id'], match['away_team_id']]:
-                        prediction = self.predictor.predict_lineup(match['id'], team_id)
-                        if prediction:
-                            logger.info(f"Updated lineup prediction for team {team_id} in match {match['id']}")
-                    
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error updating lineup predictions for match {match['id']}: {e}")
-                    continue
+            predictions = self.matchday_predictor.predict_matchday(league_id)
+            logger.info(f"Updated {len(predictions)} lineup predictions for league {league_id}")
             
         except Exception as e:
             logger.error(f"Error updating lineup predictions for league {league_id}: {e}")
@@ -437,49 +566,25 @@ class DataScheduler:
         logger.info("🔄 Starting background lineup prediction generation for all leagues...")
         
         try:
-            prediction_count = 0
-            
-            for league_key, league_info in LEAGUES.items():
-                try:
-                    league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
-                    if not league_db:
-                        logger.warning(f"League not found in database: {league_info['name']}")
-                        continue
-                    
-                    logger.info(f"Generating predictions for {league_info['name']}...")
-                    
-                    matches = self.db.get_next_matchday_matches(league_db['id'])
-                    
-                    for match in matches:
-                        try:
-                            for team_id in [match['home_team_id'], match['away_team_id']]:
-                                existing_prediction = self.db.get_lineup_prediction(match['id'], team_id)
-                                
-                                if not existing_prediction:
-                                    prediction = self.predictor.predict_lineup(match['id'], team_id)
-                                    if prediction:
-                                        prediction_count += 1
-                                        logger.info(f"✅ Generated prediction for team {team_id} in match {match['id']}")
-                                else:
-                                    logger.debug(f"Prediction already exists for team {team_id} in match {match['id']}")
-                            
-                            time.sleep(0.5)
-                            
-                        except Exception as e:
-                            logger.error(f"Error generating prediction for match {match['id']}: {e}")
-                            continue
-                    
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing league {league_info['name']}: {e}")
-                    continue
+            report = self.pipeline.run("predictions", self._generate_league_predictions)
+            prediction_count = sum(r['result'] or 0 for r in report['results'].values())
             
             logger.info(f"✅ Background prediction generation completed. Generated {prediction_count} new predictions.")
             
         except Exception as e:
             logger.error(f"❌ Critical error in background prediction generation: {e}")
     
+    def _generate_league_predictions(self, league_key, league_info):
+        """Regenerate missing or stale predictions for the next matchday of one league, returning how many were built"""
+        league_db = self.db.get_league_by_transfermarkt_id(league_info['transfermarkt_id'])
+        if not league_db:
+            logger.warning(f"League not found in database: {league_info['name']}")
+            return 0
+        
+        logger.info(f"Generating predictions for {league_info['name']}...")
+        
+        return len(self.matchday_predictor.predict_matchday(league_db['id']))
+    
     def generate_initial_predictions(self):
         """Generate initial predictions for all upcoming matches (run once at startup)"""
         logger.info("🚀 Generating initial lineup predictions for all upcoming matches...")
@@ -491,21 +596,24 @@ class DataScheduler:
         except Exception as e:
             logger.error(f"❌ Error in initial prediction generation: {e}")
     
-    def _get_or_create_team(self, team_name, league_id, transfermarkt_id):
-        """Get existing team or create new one"""
+    def _league_team_ids(self, league_id):
+        """Map Transfermarkt id to team id for every team of a league"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, transfermarkt_id FROM teams WHERE league_id = %s
+                """, (league_id,))
+                return {team['transfermarkt_id']: team['id'] for team in cursor.fetchall()}
+    
+    def _get_or_create_team(self, team_name, league_id, transfermarkt_id, known_teams=None):
+        """Get existing team or create new one; known_teams (from _league_team_ids) saves the lookup query"""
         try:
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id FROM teams 
-                        WHERE transfermarkt_id = %s AND league_id = %s
-                    """, (transfermarkt_id, league_id))
-                    team = cursor.fetchone()
+            if known_teams is None:
+                known_teams = self._league_team_ids(league_id)
             
-            if team:
-                return team['id']
-            else:
-                return self.db.insert_team(team_name, league_id, transfermarkt_id)
+            if transfermarkt_id not in known_teams:
+                known_teams[transfermarkt_id] = self.db.insert_team(team_name, league_id, transfermarkt_id)
+            return known_teams[transfermarkt_id]
                 
         except Exception as e:
             logger.error(f"Error getting or creating team {team_name}: {e}")
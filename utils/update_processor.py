@@ -0,0 +1,117 @@
+import asyncio
+import inspect
+import time
+import logging
+from collections import deque
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from config import UPDATE_WORKERS, UPDATE_BACKLOG
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 1000  # recent update latencies kept for the stats percentiles
+STATS_LOG_EVERY = 500  # processed updates between stats log lines
+
+class BackpressureQueue(asyncio.Queue):
+    """Update queue whose put waits while max_backlog updates are queued or still being processed.
+
+    The application calls task_done only once an update's handlers have
+    finished, so the backlog counts running updates too. A full backlog stalls
+    the updater's next getUpdates, or holds the webhook response, which is
+    how Telegram learns to slow down.
+    """
+    def __init__(self, max_backlog=UPDATE_BACKLOG):
+        super().__init__()
+        self.max_backlog = max_backlog
+        self.backlog = 0
+        self.throttled = 0
+        self._room = asyncio.Event()
+
+    async def put(self, item):
+        if self.backlog >= self.max_backlog:
+            self.throttled += 1
+            if self.throttled % 100 == 1:
+                logger.warning(f"🚦 Update backlog full ({self.backlog} updates), holding ingress ({self.throttled} times so far)")
+            while self.backlog >= self.max_backlog:
+                self._room.clear()
+                await self._room.wait()
+        self.put_nowait(item)
+
+    def put_nowait(self, item):
+        super().put_nowait(item)
+        self.backlog += 1
+
+    def task_done(self):
+        super().task_done()
+        self.backlog -= 1
+        self._room.set()
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """Handles updates from different users concurrently and each user's updates strictly in order.
+
+    Every update waits for the previous update of the same user (or chat,
+    for updates without one) to finish, so a double tap never races itself,
+    and at most max_workers updates run their handlers at once. PTB's own
+    limit is set to max_backlog so that updates waiting for their user's turn
+    never hold a worker; pair with a BackpressureQueue of the same size.
+    """
+    def __init__(self, max_workers=UPDATE_WORKERS, max_backlog=UPDATE_BACKLOG):
+        super().__init__(max_backlog)
+        self.max_workers = max_workers
+        self._workers = asyncio.Semaphore(max_workers)
+        self._tails = {}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.counts = {'processed': 0, 'waited_for_user': 0}
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _ordering_key(self, update):
+        if isinstance(update, Update):
+            if update.effective_user:
+                return ('user', update.effective_user.id)
+            if update.effective_chat:
+                return ('chat', update.effective_chat.id)
+        return None
+
+    async def do_process_update(self, update, coroutine):
+        started = time.perf_counter()
+        key = self._ordering_key(update)
+        previous = self._tails.get(key) if key else None
+        turn = asyncio.get_running_loop().create_future()
+        if key:
+            self._tails[key] = turn  # claimed before the first await, so turns follow arrival order
+        try:
+            if previous is not None:
+                self.counts['waited_for_user'] += 1
+                await asyncio.wait([previous])  # unlike awaiting it, never cancels the previous turn
+            async with self._workers:
+                await coroutine
+        finally:
+            if inspect.iscoroutine(coroutine) and inspect.getcoroutinestate(coroutine) == inspect.CORO_CREATED:
+                coroutine.close()  # cancelled before its turn came
+            turn.set_result(None)
+            if key and self._tails.get(key) is turn:
+                del self._tails[key]
+            self._finish(time.perf_counter() - started)
+
+    def _finish(self, latency):
+        self._latencies.append(latency)
+        self.counts['processed'] += 1
+        if self.counts['processed'] % STATS_LOG_EVERY == 0:
+            logger.info(f"📊 Update processor: {self.stats()}")
+
+    def stats(self):
+        """Updates in progress (running or awaiting their turn), users with updates in progress, counters and latency percentiles in ms"""
+        latencies = sorted(self._latencies)
+        percentile = lambda p: round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1) if latencies else 0.0
+        return {
+            'in_progress': self.current_concurrent_updates,
+            'busy_users': len(self._tails),
+            **self.counts,
+            'latency_ms_p50': percentile(0.5),
+            'latency_ms_p99': percentile(0.99)
+        }
@@ -0,0 +1,150 @@
+import asyncio
+import hmac
+import json
+import time
+import logging
+from telegram import Update
+from config import WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_HEALTH_PATH, WEBHOOK_SECRET
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'x-telegram-bot-api-secret-token'
+MAX_BODY_BYTES = 1024 * 1024  # updates are a few KB; anything this large is not from Telegram
+MAX_HEADER_LINES = 100
+IDLE_TIMEOUT = 75  # seconds a kept-alive connection may sit idle
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+class BadRequest(Exception):
+    pass
+
+class WebhookServer:
+    """Receives Telegram updates over HTTP and feeds them to the application's update queue.
+
+    A small HTTP/1.1 server on asyncio streams (no web framework needed):
+    POST on the webhook path with the secret token header queues the update,
+    GET on the health path reports liveness and queue depth. Connections are
+    kept alive, as Telegram reuses them for consecutive deliveries.
+    """
+    def __init__(self, bot, update_queue, listen=WEBHOOK_LISTEN, port=WEBHOOK_PORT, path=WEBHOOK_PATH,
+                 health_path=WEBHOOK_HEALTH_PATH, secret_token=WEBHOOK_SECRET):
+        self.bot = bot
+        self.update_queue = update_queue
+        self.listen = listen
+        self.port = port
+        self.path = path
+        self.health_path = health_path
+        self.secret_token = secret_token
+        self._server = None
+        self._connections = set()
+        self.started_at = None
+        self.counts = {'received': 0, 'rejected': 0}
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_connection, self.listen, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # resolves port 0 to the bound one
+        self.started_at = time.monotonic()
+        logger.info(f"🌐 Webhook server listening on {self.listen}:{self.port}{self.path}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()  # idle kept-alive connections would otherwise hold wait_closed
+            await self._server.wait_closed()
+            self._server = None
+        logger.info(f"🌐 Webhook server stopped: {self.counts['received']} updates received, {self.counts['rejected']} rejected")
+
+    async def _serve_connection(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT)
+                except BadRequest as e:
+                    await self._respond(writer, 400, {'ok': False, 'description': str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, headers, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Error serving webhook connection: {e}")
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """(method, path, headers, body) of the next request, or None when the client closed the connection"""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise BadRequest("malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise BadRequest("too many headers")
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise BadRequest("bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise BadRequest("request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    async def _route(self, method, path, headers, body):
+        if path == self.health_path:
+            if method != 'GET':
+                return 405, {'ok': False}
+            return 200, {
+                'ok': True,
+                'uptime_seconds': round(time.monotonic() - self.started_at, 1),
+                'queued_updates': self.update_queue.qsize(),
+                **self.counts
+            }
+        if path != self.path:
+            return 404, {'ok': False}
+        if method != 'POST':
+            return 405, {'ok': False}
+
+        if not hmac.compare_digest(headers.get(SECRET_HEADER, '').encode(), self.secret_token.encode()):
+            self.counts['rejected'] += 1
+            logger.warning("Rejected webhook request with a missing or wrong secret token")
+            return 403, {'ok': False}
+        try:
+            update = Update.de_json(json.loads(body), self.bot)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            self.counts['rejected'] += 1
+            logger.warning(f"Rejected malformed webhook update: {e}")
+            return 400, {'ok': False}
+
+        self.counts['received'] += 1
+        await self.update_queue.put(update)
+        return 200, {'ok': True}
+
+    async def _respond(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()